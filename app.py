@@ -12,7 +12,8 @@ from st_pages import (
     data_verification_page,
     quality_analysis_page,
     download_data_page,
-    settings_page
+    settings_page,
+    profiling_sidebar
 )
 
 def main():
@@ -53,6 +54,9 @@ def main():
     elif menu == "Setting":
         settings_page()
 
+    # 단계별 실행 시간 패널 (이번 실행의 기록까지 표시하도록 페이지 다음에 그림)
+    profiling_sidebar()
+
     # 사이트바에 세션 초기화 버튼 추가
     #if st.sidebar.button("Initialize the session"):
     #    for key in list(st.session_state.keys()):
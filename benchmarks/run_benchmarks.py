@@ -0,0 +1,264 @@
+"""
+변환 / 분석 함수 벤치마크
+
+가상 측정 파일을 규모별로 생성한 뒤 주요 함수의 실행 시간을 측정하고 JSON으로 저장한다.
+실행마다 결과 파일이 쌓이므로 변경 전후 결과를 비교할 수 있다.
+
+사용 예:
+    python -m benchmarks.run_benchmarks --scales small medium --repeat 3
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/a.json benchmarks/results/b.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from modules.excel_reader import available_engines
+from .workbook_generator import generate_workbook_pair
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "benchmarks", "results")
+
+# 규모별 가상 측정 파일 설정 (generate_data_sheet 인자)
+SCALES = {
+    "small": dict(n_points=20, rows_per_point=3, n_dates=60, n_ctq=10),
+    "medium": dict(n_points=100, rows_per_point=5, n_dates=180, n_ctq=40),
+    "large": dict(n_points=300, rows_per_point=5, n_dates=365, n_ctq=100)
+}
+
+
+def _time_call(func: Callable, repeat: int) -> Dict[str, float]:
+    """func를 repeat회 실행한 시간(s) 통계"""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+    return {
+        "min_s": round(min(times), 6),
+        "median_s": round(float(np.median(times)), 6),
+        "max_s": round(max(times), 6),
+        "repeat": repeat
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def environment_info() -> Dict[str, Optional[str]]:
+    """결과 비교 시 참고할 실행 환경"""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "excel_engines": ",".join(available_engines()),
+        "git_revision": _git_revision()
+    }
+
+
+def bench_scale(scale: str, work_dir: str, repeat: int = 3) -> List[Dict]:
+    """
+    한 규모의 가상 파일로 변환 / 검증 / 분석 함수 시간을 측정
+
+    Returns:
+        list: 함수별 결과 (scale, name, 입력 크기, 시간 통계)
+    """
+    # Streamlit 세션을 쓰는 함수(verify_data)도 bare mode에서 실행 가능
+    import streamlit as st
+    from modules.data_transformer import transform_data
+    from modules.data_utils import verify_data
+    from modules.control_chart import create_imr_chart, create_xbar_r_chart, imr_summary_by_group
+    from modules.capability_analysis import process_capability_histogram, capability_report
+    from modules.master_index import SpecIndex
+    from modules.boxplot_trend import trend_analysis
+    from modules.run_rules import nelson_rules_by_group
+
+    params = SCALES[scale]
+    input_path, master_path = generate_workbook_pair(work_dir, name=scale, **params)
+    results = []
+
+    def record(name: str, func: Callable, **size) -> None:
+        entry = {"scale": scale, "name": name, **size, **_time_call(func, repeat)}
+        results.append(entry)
+        print(f"  {scale:<7} {name:<30} median {entry['median_s']:.4f}s")
+
+    # 변환 (결과 캐시를 끄고 매번 새로 변환)
+    transformed_df, master_df = transform_data(input_path, master_path, use_cache=False, return_master=True)
+    n_cells = params["n_points"] * params["rows_per_point"] * params["n_dates"]
+    record("transform_data", lambda: transform_data(input_path, master_path, use_cache=False),
+           cells=n_cells, rows_out=len(transformed_df))
+
+    st.session_state.transformed_data = transformed_df
+    st.session_state.master_data = master_df
+    # 검증 결과 캐시를 지운 뒤 측정 (cached는 같은 데이터 버전으로 다시 호출한 경우)
+    record("verify_data", lambda: (st.session_state.pop("_spec_verification", None), verify_data()),
+           rows=len(transformed_df))
+    record("verify_data[cached]", lambda: verify_data(with_merged=False), rows=len(transformed_df))
+    record("nelson_rules_by_group", lambda: nelson_rules_by_group(transformed_df), rows=len(transformed_df))
+    record("imr_summary_by_group", lambda: imr_summary_by_group(transformed_df), rows=len(transformed_df))
+    spec_index = SpecIndex(master_df)
+    record("capability_report", lambda: capability_report(transformed_df, spec_index), rows=len(transformed_df))
+
+    # 실시간 모니터: 전체 측정값을 1000건 micro-batch로 입력
+    from modules.stream_monitor import ImrMonitor
+    stream_codes = transformed_df["관리번호"].to_numpy()
+    stream_values = transformed_df["측정값"].to_numpy(dtype=float)
+
+    def stream_all():
+        monitor = ImrMonitor()
+        for start in range(0, len(stream_values), 1000):
+            monitor.update(stream_codes[start:start + 1000], stream_values[start:start + 1000])
+    record("ImrMonitor.update[batch=1000]", stream_all, rows=len(transformed_df))
+
+    # 분석 함수는 데이터가 가장 많은 관리번호 1개 기준
+    top_code = transformed_df["관리번호"].value_counts().idxmax()
+    series_df = transformed_df[transformed_df["관리번호"] == top_code].reset_index(drop=True)
+    values = series_df["측정값"].dropna().to_numpy()
+    dates = series_df.loc[series_df["측정값"].notna(), "측정일자"].tolist()
+    spec = master_df[master_df["관리번호"] == top_code].iloc[0]
+
+    record("create_imr_chart", lambda: create_imr_chart(values, x=dates, return_summary=True, show_outliers=True),
+           points=len(values))
+
+    group_size = 5
+    num_groups = len(values) // group_size
+    grouped = values[:num_groups * group_size].reshape(num_groups, group_size)
+    record("create_xbar_r_chart",
+           lambda: create_xbar_r_chart(grouped, group_size, x=list(range(num_groups)), return_summary=True,
+                                       show_outliers=True),
+           points=int(grouped.size))
+
+    # 긴 이력(전체 관리번호 측정값을 이어 붙인 시계열) 렌더링: 모드별 figure 생성 + JSON 직렬화 시간과 크기
+    from modules.chart_render import figure_payload_size
+    history = transformed_df["측정값"].dropna().to_numpy()[:200_000]
+    history_dates = list(range(len(history)))
+    for mode in ("standard", "fast"):
+        fig = create_imr_chart(history, x=history_dates, show_outliers=True, render_mode=mode)
+        record(f"create_imr_chart[{mode}]",
+               lambda: figure_payload_size(create_imr_chart(history, x=history_dates, show_outliers=True,
+                                                            render_mode=mode)),
+               points=len(history), points_drawn=fig.layout.meta["points_drawn"],
+               payload_kb=round(figure_payload_size(fig) / 1024, 1))
+
+    record("process_capability_histogram", lambda: process_capability_histogram(values, spec["USL"], spec["LSL"]),
+           points=len(values))
+
+    record("trend_analysis", lambda: trend_analysis(series_df.copy(), "측정일자", ["측정값"]), points=len(series_df))
+    return results
+
+
+def bench_readers(scale: str, work_dir: str, repeat: int = 3) -> List[Dict]:
+    """
+    설치된 엑셀 읽기 엔진별 시트 읽기 / 변환 시간 측정
+
+    Returns:
+        list: 엔진별 결과 (name은 "read_excel[엔진]", "transform_data[엔진/읽기 방식]")
+    """
+    from modules.data_transformer import transform_data
+    from modules.excel_reader import available_engines, read_excel_sheet, ENGINE_PREFERENCE
+
+    params = SCALES[scale]
+    input_path, master_path = generate_workbook_pair(work_dir, name=scale, **params)
+    with open(input_path, "rb") as f:
+        input_bytes = f.read()
+    engines = [e for e in available_engines() if e in ENGINE_PREFERENCE["xlsx"]]
+    results = []
+
+    def record(name: str, func: Callable, engine: str) -> None:
+        entry = {"scale": scale, "name": name, "engine": engine, **_time_call(func, repeat)}
+        results.append(entry)
+        print(f"  {scale:<7} {name:<30} median {entry['median_s']:.4f}s")
+
+    for engine in engines:
+        record(f"read_excel[{engine}]", lambda: read_excel_sheet(input_bytes, "Data", engine, header=None), engine)
+        for reader in ("streaming", "dataframe"):
+            record(f"transform_data[{engine}/{reader}]",
+                   lambda: transform_data(input_path, master_path, use_cache=False, reader=reader, engine=engine),
+                   engine)
+
+    # 기준 엔진(openpyxl) 대비 속도 향상 배수
+    baseline = {r["name"].replace(r["engine"], ""): r["median_s"] for r in results if r["engine"] == "openpyxl"}
+    for r in results:
+        base = baseline.get(r["name"].replace(r["engine"], ""))
+        r["speedup_vs_openpyxl"] = round(base / r["median_s"], 2) if base and r["median_s"] else None
+    return results
+
+
+def run(scales: List[str], repeat: int = 3, output: Optional[str] = None, readers: bool = True) -> str:
+    """
+    벤치마크를 실행하고 JSON 결과 파일 경로를 반환
+
+    Args:
+        scales (list): SCALES 키 목록
+        repeat (int): 함수별 반복 횟수
+        output (str, optional): 결과 파일 경로 (기본값: benchmarks/results/bench_<시각>.json)
+        readers (bool): 엑셀 읽기 엔진별 비교 포함 여부
+    """
+    started = datetime.now()
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for scale in scales:
+            results.extend(bench_scale(scale, work_dir, repeat))
+            if readers:
+                results.extend(bench_readers(scale, work_dir, repeat))
+
+    report = {
+        "timestamp": started.isoformat(timespec="seconds"),
+        "environment": environment_info(),
+        "scales": {scale: SCALES[scale] for scale in scales},
+        "results": results
+    }
+    output = output or os.path.join(RESULTS_DIR, f"bench_{started:%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return output
+
+
+def compare(baseline_path: str, current_path: str) -> pd.DataFrame:
+    """두 결과 파일의 median 시간 비교 (ratio < 1이면 빨라진 것)"""
+    def load(path):
+        with open(path, encoding="utf-8") as f:
+            return pd.DataFrame(json.load(f)["results"]).set_index(["scale", "name"])["median_s"]
+
+    table = pd.concat([load(baseline_path).rename("baseline_s"), load(current_path).rename("current_s")], axis=1)
+    table["ratio"] = (table["current_s"] / table["baseline_s"]).round(3)
+    return table
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="CTQ 변환 / 분석 함수 벤치마크")
+    parser.add_argument("--scales", nargs="+", default=["small", "medium"], choices=list(SCALES))
+    parser.add_argument("--repeat", type=int, default=3, help="함수별 반복 횟수")
+    parser.add_argument("--output", default=None, help="결과 JSON 파일 경로")
+    parser.add_argument("--no-readers", action="store_true", help="엑셀 읽기 엔진별 비교 제외")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), help="두 결과 JSON 비교")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        print(compare(*args.compare).to_string())
+        return 0
+
+    output = run(args.scales, args.repeat, args.output, readers=not args.no_readers)
+    print(f"results -> {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
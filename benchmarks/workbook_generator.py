@@ -0,0 +1,240 @@
+"""
+벤치마크용 가상 CTQ 측정 파일 / Master 파일 생성
+
+업체 측정 파일 구조를 흉내 낸다.
+    - Information 시트: Contents / Value (1차 업체명 ... Data_sheet)
+    - Data 시트: 제목 행, 날짜 헤더 행(날짜형/문자열 혼합), 측정 조건 행(문자열), POINT 블록(POINT 표시 + CTQ 명 + 측정 행)
+    - Master 시트: 관리번호, 매핑 키, USL/LSL/Target/UCL/LCL (일부 값에 공백/특수문자 포함)
+
+사용 예:
+    python -m benchmarks.workbook_generator ./bench_data --points 100 --rows 5 --dates 180
+"""
+import argparse
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from modules.data_transformer import detect_date_header
+
+DEFAULT_INFO = {
+    "1차 업체명": "A사",
+    "지역명": "KR",
+    "2차업체명": "B사",
+    "모델명": "M1",
+    "측정자": "홍길동",
+    "측정장비": "CMM",
+    "부품명": "BRACKET",
+    "Part No": "ABC-123",
+    "Data_sheet": "Data"
+}
+
+# 날짜 영역 앞쪽 설명 열 수 (POINT 표시는 2열, CTQ 명은 3열)
+N_LEAD_COLUMNS = 11
+POINT_COL = 2
+# 날짜 헤더 행 위치
+HEADER_ROW = 1
+
+# 날짜 헤더 아래 측정 조건 행 (항목명, 날짜 열 값) - 모두 문자열이라 날짜로 판정되지 않음
+# 날짜 시작 열 판정(detect_date_header)은 앞쪽 10행을 보므로, 측정값(10.073 등 날짜 정규식과 일치)이
+# 그 안에 들어가지 않도록 POINT 블록을 10행 이후에 둔다.
+CONDITION_ROWS = [
+    ("측정자", "홍길동"),
+    ("측정장비", "CMM"),
+    ("온도", "23℃"),
+    ("습도", "45%"),
+    ("판정", "OK"),
+    ("승인", "QA"),
+    ("비고", "정상")
+]
+
+
+def ctq_names(n_ctq: int) -> List[str]:
+    """POINT 블록에 쓰일 CTQ 명 (Master 매핑 후 이름과 같음)"""
+    return [f"CTQ {k:03d} 치수" for k in range(n_ctq)]
+
+
+def generate_data_sheet(
+        n_points: int = 20,
+        rows_per_point: int = 3,
+        n_dates: int = 60,
+        n_ctq: Optional[int] = None,
+        start_date: str = "2025-01-01",
+        noise: float = 0.05,
+        blank_ratio: float = 0.15,
+        text_ratio: float = 0.03,
+        seed: int = 0
+) -> pd.DataFrame:
+    """
+    Data 시트 내용(header 없는 DataFrame) 생성
+
+    Args:
+        n_points (int): POINT 블록 수
+        rows_per_point (int): 블록당 측정 행 수
+        n_dates (int): 날짜 열 수 (하루 간격)
+        n_ctq (int, optional): CTQ 종류 수 (기본값: n_points, 블록마다 CTQ 명을 순환 사용)
+        start_date (str): 첫 측정일
+        noise (float): 측정값 표준편차 (Target 10 기준)
+        blank_ratio (float): 빈 셀 비율
+        text_ratio (float): 숫자가 아닌 셀 비율 (공백/특수공백이 붙은 숫자 문자열, "N/A", "-" 등)
+        seed (int): 난수 시드
+
+    Returns:
+        pd.DataFrame: pd.read_excel(header=None)로 읽은 것과 같은 형태
+    """
+    rng = np.random.default_rng(seed)
+    names = ctq_names(n_ctq or n_points)
+    n_cols = N_LEAD_COLUMNS + n_dates
+    dates = pd.date_range(start_date, periods=n_dates, freq="D")
+
+    title = np.full(n_cols, None, dtype=object)
+    title[0] = "CTQ 측정 DATA"
+    header = np.full(n_cols, None, dtype=object)
+    header[1] = "항목"
+    header[POINT_COL] = "측정위치"
+    header[POINT_COL + 1] = "관리항목"
+    # 날짜 헤더는 날짜형과 문자열이 섞여 있는 경우가 많음
+    header[N_LEAD_COLUMNS:] = [d if k % 4 else d.strftime("%Y-%m-%d") for k, d in enumerate(dates)]
+
+    n_rows = n_points * rows_per_point
+    values = np.round(10 + rng.normal(0, noise, (n_rows, n_dates)), 3).astype(object)
+
+    # 빈 셀 / 숫자가 아닌 셀 주입
+    u = rng.random((n_rows, n_dates))
+    values[u < blank_ratio] = None
+    text_cells = (u >= blank_ratio) & (u < blank_ratio + text_ratio)
+    text_choices = np.array(["N/A", "-", "측정불가", "#DIV/0!"], dtype=object)
+    for r, c in zip(*np.nonzero(text_cells)):
+        v = values[r, c]
+        values[r, c] = f" {v}\xa0" if rng.random() < 0.5 else text_choices[rng.integers(len(text_choices))]
+
+    body = np.full((n_rows, n_cols), None, dtype=object)
+    body[:, N_LEAD_COLUMNS:] = values
+    block_starts = np.arange(n_points) * rows_per_point
+    body[block_starts, POINT_COL] = [f"Point {p + 1}" for p in range(n_points)]
+    # 일부 CTQ 명은 '-' 구분자나 뒤 공백이 남아 있음 (변환 시 정리됨)
+    body[block_starts, POINT_COL + 1] = [
+        names[p % len(names)].replace(" ", "-", 1) + " " if p % 5 == 0 else names[p % len(names)]
+        for p in range(n_points)
+    ]
+    body[:, 0] = np.arange(1, n_rows + 1)
+
+    conditions = np.full((len(CONDITION_ROWS), n_cols), None, dtype=object)
+    for k, (label, value) in enumerate(CONDITION_ROWS):
+        conditions[k, 1] = label
+        conditions[k, N_LEAD_COLUMNS:] = value
+
+    footer = np.full(n_cols, None, dtype=object)
+    footer[0] = "비고"
+    rows = np.vstack([title, header, conditions, np.full(n_cols, None, dtype=object), body,
+                      np.full(n_cols, None, dtype=object), footer])
+    data_df = pd.DataFrame(rows)
+
+    # 변환기가 생성한 날짜 헤더 위치를 그대로 찾아야 모든 날짜 열이 변환됨
+    detected = detect_date_header(data_df)
+    assert detected == (HEADER_ROW, N_LEAD_COLUMNS), \
+        f"date header detected at {detected}, expected {(HEADER_ROW, N_LEAD_COLUMNS)}"
+    return data_df
+
+
+def generate_master(n_ctq: int, info: Dict[str, str] = DEFAULT_INFO, extra_rows: int = 0,
+                    seed: int = 0) -> pd.DataFrame:
+    """
+    측정 파일의 CTQ와 매핑되는 Master 시트 생성
+
+    Args:
+        n_ctq (int): 측정 파일의 CTQ 종류 수
+        info (dict): 측정 파일 Information 값 (매핑 키)
+        extra_rows (int): 다른 업체/부품의 행 수 (Master 크기 조절용)
+        seed (int): 난수 시드
+    """
+    rng = np.random.default_rng(seed)
+    names = ctq_names(n_ctq) + [f"OTHER {k:05d}" for k in range(extra_rows)]
+    n = len(names)
+    usl = np.round(10 + rng.uniform(0.1, 0.3, n), 3)
+    lsl = np.round(10 - rng.uniform(0.1, 0.3, n), 3)
+
+    master = pd.DataFrame({
+        "관리번호": [f"K{k:06d}" for k in range(n)],
+        "1차 업체명": info["1차 업체명"],
+        "지역명": info["지역명"],
+        "2차 업체명": [info["2차업체명"]] * n_ctq + ["C사"] * extra_rows,
+        "부품": info["부품명"],
+        "공정CTQ/CTP 관리 항목명": names,
+        "모델명": info["모델명"],
+        "Part No": info["Part No"],
+        "USL": usl.astype(object),
+        "LSL": lsl.astype(object),
+        "Target": 10.0,
+        "UCL": np.round(10 + (usl - 10) * 0.7, 3),
+        "LCL": np.round(10 - (10 - lsl) * 0.7, 3)
+    })
+    # 실제 Master처럼 일부 스펙 값 끝에 공백이 붙어 문자열로 저장된 경우
+    master.loc[::7, "USL"] = [f"{v} " for v in master.loc[::7, "USL"]]
+    master.loc[3::11, "LSL"] = [f"{v}\xa0" for v in master.loc[3::11, "LSL"]]
+    return master
+
+
+def write_workbook(path: str, data_df: pd.DataFrame, info: Dict[str, str] = DEFAULT_INFO) -> None:
+    """Information / Data 시트로 측정 파일 저장"""
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        pd.DataFrame({"Contents": list(info), "Value": list(info.values())}).to_excel(
+            writer, sheet_name="Information", index=False)
+        data_df.to_excel(writer, sheet_name=info["Data_sheet"], header=False, index=False)
+
+
+def write_master(path: str, master_df: pd.DataFrame) -> None:
+    """Master 시트로 Master 파일 저장"""
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        master_df.to_excel(writer, sheet_name="Master", index=False)
+
+
+def generate_workbook_pair(out_dir: str, name: str = "synthetic", master_extra_rows: int = 0,
+                           **sheet_kwargs) -> Tuple[str, str]:
+    """
+    측정 파일과 Master 파일을 함께 생성
+
+    Args:
+        out_dir (str): 저장 디렉토리
+        name (str): 파일명 앞부분
+        master_extra_rows (int): Master의 추가 행 수
+        **sheet_kwargs: generate_data_sheet 인자
+
+    Returns:
+        (측정 파일 경로, Master 파일 경로)
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    n_ctq = sheet_kwargs.get("n_ctq") or sheet_kwargs.get("n_points", 20)
+    input_path = os.path.join(out_dir, f"{name}.xlsx")
+    master_path = os.path.join(out_dir, f"{name}_master.xlsx")
+    write_workbook(input_path, generate_data_sheet(**sheet_kwargs))
+    write_master(master_path, generate_master(n_ctq, extra_rows=master_extra_rows, seed=sheet_kwargs.get("seed", 0)))
+    return input_path, master_path
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="가상 CTQ 측정 파일 / Master 파일 생성")
+    parser.add_argument("out_dir", help="저장 디렉토리")
+    parser.add_argument("--name", default="synthetic")
+    parser.add_argument("--points", type=int, default=20, help="POINT 블록 수")
+    parser.add_argument("--rows", type=int, default=3, help="블록당 측정 행 수")
+    parser.add_argument("--dates", type=int, default=60, help="날짜 열 수")
+    parser.add_argument("--ctq", type=int, default=None, help="CTQ 종류 수 (기본값: POINT 블록 수)")
+    parser.add_argument("--noise", type=float, default=0.05)
+    parser.add_argument("--blank-ratio", type=float, default=0.15)
+    parser.add_argument("--text-ratio", type=float, default=0.03)
+    parser.add_argument("--master-extra-rows", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    paths = generate_workbook_pair(
+        args.out_dir, args.name, args.master_extra_rows,
+        n_points=args.points, rows_per_point=args.rows, n_dates=args.dates, n_ctq=args.ctq,
+        noise=args.noise, blank_ratio=args.blank_ratio, text_ratio=args.text_ratio, seed=args.seed
+    )
+    print("\n".join(paths))
+
+
+if __name__ == "__main__":
+    main()
@@ -16,13 +16,65 @@ QUALITY_SETTINGS = {
 ANALYSIS_OPTIONS = {
     'control_chart_types': ['i-MR', 'Xbar-R', 'Xbar-S'],
     'capability_indices': ['Cp', 'Cpk', 'Pp', 'Ppk'],
+    # 공정능력 등급: Cpk 하한 (위에서부터 처음 만족하는 등급, 마지막 등급(None)은 미달)
+    'capability_grades': {'A': 1.67, 'B': 1.33, 'C': 1.0, 'D': None},
 }
 
 # 데이터 변환 설정
 DATA_TRANSFORM_CONFIG = {
     'decimal_places': 3,
-    'allowed_extensions': ['.xlsx', '.xls', '.csv'],
-    'max_file_size_mb': 50
+    'allowed_extensions': ['.xlsx', '.xls', '.csv', '.parquet'],  # .csv/.parquet: 장비 출력 long-form 파일
+    'max_file_size_mb': 50,
+    'data_sheet_reader': 'streaming',  # 'streaming' (행 단위 읽기) 또는 'dataframe' (pd.read_excel 전체 읽기)
+    'excel_engine': 'auto'  # 'auto' (calamine > openpyxl/xlrd 중 설치된 엔진), 'calamine', 'openpyxl', 'xlrd'
+}
+
+# 변환 결과 캐시 설정 (동일 파일/기간 재변환 시 재사용)
+TRANSFORM_CACHE_CONFIG = {
+    'max_entries': 8,
+    'max_size_mb': 512
+}
+
+# 증분 변환 설정 (같은 측정 파일 재업로드 시 새로 추가/변경된 날짜 열만 변환)
+# 열별 변경 확인을 위해 Data 시트는 매번 전체를 읽으므로 절약되는 것은 추출 / 관리번호 매핑 시간뿐
+INCREMENTAL_CONFIG = {
+    'enabled': False,
+    'state_dir': 'data/ingest_state',
+    'max_memory_entries': 16
+}
+
+# 측정 데이터 누적 저장소 설정 (관리번호 / 월 단위 Parquet 파티션)
+MEASUREMENT_STORE_CONFIG = {
+    'enabled': True,
+    'store_dir': 'data/measurement_store'
+}
+
+# 백그라운드 변환 작업 설정 (업로드 페이지)
+BACKGROUND_JOB_CONFIG = {
+    'max_workers': 2,
+    'max_finished_jobs': 16,
+    'poll_interval_s': 0.5       # 진행률 표시 갱신 간격
+}
+
+# 실시간 I-MR 모니터 설정 (modules/stream_monitor.py)
+STREAM_MONITOR_CONFIG = {
+    'min_points': 20,            # 관리번호별 점이 이 수만큼 쌓인 뒤부터 판정
+    'checkpoint_path': 'data/stream_monitor/imr_state.pkl'
+}
+
+# 단계별 실행 시간 측정 설정 (사이드바 Profiling 패널에서 켜고 끌 수 있음)
+PROFILE_CONFIG = {
+    'enabled': False,            # 서버 프로세스 전체에 적용 (켜면 모든 세션의 단계 기록이 사이드바에 표시됨)
+    'track_memory': False,       # tracemalloc으로 단계별 최대 메모리 증가량 측정 (모든 할당을 추적하므로 변환이 수 배 느려짐, peak는 프로세스 전체 값)
+    'max_records': 1000,
+    'log_file': None             # 지정 시 단계 기록을 JSON lines로 추가 저장
+}
+
+# 관리도 렌더링 설정 (긴 시계열은 WebGL + LTTB downsampling)
+CHART_RENDER_CONFIG = {
+    'mode': 'auto',              # 'auto' (점 수가 fast_min_points 이상이면 fast), 'fast' (WebGL + LTTB), 'standard' (SVG, 전체 점)
+    'fast_min_points': 2000,
+    'max_points': 4000           # fast 모드에서 그릴 최대 점 수 (이상치는 항상 포함)
 }
 
 # 통계 분석 기본 설정
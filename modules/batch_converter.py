@@ -0,0 +1,145 @@
+"""
+여러 업체 측정 파일을 한 번에 변환하는 배치 변환 모듈 (Streamlit 없이 실행)
+
+사용 예:
+    python -m modules.batch_converter ./weekly_files --master Master.xlsx \
+        --start 2025-06-01 --end 2025-06-07 --output combined.xlsx --log convert_log.csv
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .data_transformer import transform_data, compact_dtypes
+from .master_index import get_master_index
+from .measurement_store import measurement_store
+
+# 작업 프로세스마다 한 번만 전달받는 master 파일 내용
+_worker_master_bytes: Optional[bytes] = None
+
+
+def _init_worker(master_bytes: bytes) -> None:
+    global _worker_master_bytes
+    _worker_master_bytes = master_bytes
+
+
+def _convert_one(path: str, start_date: Optional[str], end_date: Optional[str],
+                 search_cols: List[int], incremental: bool = False) -> Tuple[Dict, Optional[pd.DataFrame]]:
+    """파일 1개 변환. 실패해도 예외를 올리지 않고 로그 정보에 오류 내용을 담아 반환"""
+    started = time.perf_counter()
+    log = {'파일명': os.path.basename(path), '상태': 'OK', '행 수': 0, '관리번호 미매칭 행 수': 0, '소요시간(s)': 0.0, '오류': ''}
+    try:
+        df = transform_data(path, _worker_master_bytes, start_date, end_date, search_cols, use_cache=False,
+                            incremental=incremental)
+        log['행 수'] = len(df)
+        log['관리번호 미매칭 행 수'] = int(df['관리번호'].isna().sum()) if '관리번호' in df.columns else len(df)
+    except Exception as e:
+        df = None
+        log['상태'] = 'FAIL'
+        log['오류'] = f"{type(e).__name__}: {e}"
+    log['소요시간(s)'] = round(time.perf_counter() - started, 3)
+    return log, df
+
+
+def list_workbooks(input_dir: str, extensions: Tuple[str, ...] = ('.xlsx', '.xls', '.csv', '.parquet')) -> List[str]:
+    """디렉토리 안의 측정 파일 목록 (엑셀 / long-form CSV·Parquet, 엑셀 임시파일 ~$ 제외)"""
+    return sorted(
+        os.path.join(input_dir, name) for name in os.listdir(input_dir)
+        if name.lower().endswith(extensions) and not name.startswith('~$')
+    )
+
+
+def convert_directory(
+        input_dir: str,
+        master_file: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        search_cols: List[int] = list(range(0, 11)),
+        workers: Optional[int] = None,
+        incremental: bool = False
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    디렉토리의 모든 측정 파일을 프로세스 풀에서 병렬로 변환
+
+    Args:
+        input_dir (str): 측정 파일(엑셀 / long-form CSV·Parquet)이 있는 디렉토리
+        master_file (str): Master 엑셀 파일 경로
+        start_date, end_date (str, optional): 변환 기간
+        search_cols (list): POINT 표시를 찾을 열 인덱스
+        workers (int, optional): 프로세스 수 (기본값: CPU 코어 수)
+        incremental (bool): 이전 변환 상태가 있으면 새로 추가/변경된 날짜 열만 변환
+
+    Returns:
+        (합쳐진 변환 결과, 파일별 성공/실패 로그)
+    """
+    paths = list_workbooks(input_dir)
+    with open(master_file, 'rb') as f:
+        master_bytes = f.read()
+
+    logs, frames = [], []
+    if paths:
+        workers = min(workers or os.cpu_count() or 1, len(paths))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(master_bytes,)) as pool:
+            futures = [pool.submit(_convert_one, path, start_date, end_date, search_cols, incremental) for path in paths]
+            for future in futures:
+                log, df = future.result()
+                logs.append(log)
+                if df is not None and not df.empty:
+                    frames.append(df)
+
+    # 파일마다 카테고리가 달라 concat 후 object로 바뀌므로 다시 category로 변환
+    combined = compact_dtypes(pd.concat(frames, ignore_index=True)) if frames else pd.DataFrame()
+    return combined, pd.DataFrame(logs)
+
+
+def write_table(df: pd.DataFrame, path: str, sheet_name: str = "toLGE") -> None:
+    """확장자(.xlsx / .csv / .parquet)에 맞춰 결과 저장"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+    elif ext == '.parquet':
+        df.to_parquet(path, index=False)
+    else:
+        with pd.ExcelWriter(path, engine='xlsxwriter') as writer:
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="CTQ 측정 파일 일괄 변환")
+    parser.add_argument("input_dir", help="측정 파일 디렉토리 (.xlsx/.xls/.csv/.parquet)")
+    parser.add_argument("--master", required=True, help="Master 엑셀 파일")
+    parser.add_argument("--start", default=None, help="시작일 (YYYY-MM-DD)")
+    parser.add_argument("--end", default=None, help="종료일 (YYYY-MM-DD)")
+    parser.add_argument("--output", default="converted_data.xlsx", help="합쳐진 결과 파일 (.xlsx/.csv/.parquet)")
+    parser.add_argument("--log", default="convert_log.csv", help="파일별 성공/실패 로그 파일")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본값: CPU 코어 수)")
+    parser.add_argument("--incremental", action="store_true", help="이전 변환 상태를 이용해 추가/변경된 날짜 열만 변환")
+    parser.add_argument("--store", action="store_true", help="변환 결과를 측정 데이터 누적 저장소에도 저장")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    combined, log_df = convert_directory(args.input_dir, args.master, args.start, args.end, workers=args.workers,
+                                         incremental=args.incremental)
+
+    write_table(combined, args.output)
+    write_table(log_df, args.log, sheet_name="log")
+
+    if args.store and not combined.empty:
+        with open(args.master, 'rb') as f:
+            master_df = get_master_index(f.read()).master_df
+        store_summary = measurement_store.append(combined, master_df)
+        print(f"measurement store: {store_summary['rows_written']} rows written, "
+              f"{store_summary['rows_replaced']} replaced -> {measurement_store.store_dir}")
+
+    n_fail = int((log_df['상태'] == 'FAIL').sum()) if not log_df.empty else 0
+    print(f"{len(log_df)} files, {n_fail} failed, {len(combined)} rows -> {args.output} "
+          f"({time.perf_counter() - started:.1f}s)")
+    return 1 if n_fail else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,8 +3,10 @@ import numpy as np
 import plotly.graph_objs as go
 import plotly.express as px
 import scipy.stats as stats
+from .profiler import profiled
 
 
+@profiled()
 def create_boxplot(data: pd.DataFrame, columns: list = None):
     """
     주어진 데이터프레임의 지정된 열에 대해 박스 플롯을 생성합니다.
@@ -82,6 +84,7 @@ def detect_outliers_iqr(data: pd.DataFrame, columns: list = None):
     return outliers_dict
 
 
+@profiled()
 def trend_analysis(data: pd.DataFrame, time_column: str, value_columns: list = None):
     """
     시계열 데이터의 추세를 분석하고 시각화합니다.
@@ -1,30 +1,124 @@
 import numpy as np
+import pandas as pd
 import plotly.graph_objs as go
 from scipy.stats import norm
+from .profiler import profiled
+from config import ANALYSIS_OPTIONS
+
+# 개별값 군내 표준편차 추정 (MR-bar / d2, n=2)
+_D2_MR = 1.128
+
+
+# 측정값 배열에서 결측 값 제외 (관리번호별 표 capability_report와 같은 기준)
+def _drop_missing(data) -> np.ndarray:
+    data = np.asarray(data, dtype=float)
+    return data[~np.isnan(data)]
+
+
+def capability_indices(mean, sigma, usl, lsl):
+    """
+    공정능력지수 (배열 / 스칼라 모두 가능, 한쪽 규격 지원)
+
+    Args:
+        mean, sigma: 평균, 표준편차 (군내 sigma이면 Cp/Cpk, 전체 sigma이면 Pp/Ppk)
+        usl, lsl: 규격 상한 / 하한 (없으면 None 또는 NaN)
+
+    Returns:
+        (양쪽 지수, 한쪽 지수): Cp = (USL - LSL) / 6σ (양쪽 규격일 때만),
+        Cpk = min((USL - μ) / 3σ, (μ - LSL) / 3σ) (한쪽 규격이면 있는 쪽 값), sigma가 0 이하이면 NaN
+    """
+    usl = np.asarray(np.nan if usl is None else usl, dtype=float)
+    lsl = np.asarray(np.nan if lsl is None else lsl, dtype=float)
+    sigma = np.where(np.asarray(sigma, dtype=float) > 0, sigma, np.nan)
+    cp = (usl - lsl) / (6 * sigma)
+    # fmin은 NaN(없는 규격)을 무시하고 있는 쪽 값을 사용
+    cpk = np.fmin((usl - mean) / (3 * sigma), (mean - lsl) / (3 * sigma))
+    return cp, cpk
 
 
 def calculate_capability_indices(data: np.ndarray, usl: float, lsl: float):
     """
-    공정능력지수 계산 (Cp, Cpk)
+    공정능력지수 계산 (Cp, Cpk: 군내 sigma = MR-bar / d2, Pp, Ppk: 전체 표준편차)
+    결측 측정값은 제외하고 이동범위를 계산한다 (capability_report와 같은 값).
     """
+    data = _drop_missing(data)
     mean = np.mean(data)
     std = np.std(data, ddof=1)
+    sigma_within = np.mean(np.abs(np.diff(data))) / _D2_MR
 
-    Cp = (usl - lsl) / (6 * std)
-    Cpk = min((usl - mean) / (3 * std), (mean - lsl) / (3 * std))
+    Cp, Cpk = capability_indices(mean, sigma_within, usl, lsl)
+    Pp, Ppk = capability_indices(mean, std, usl, lsl)
 
     return {
         'mean': mean,
         'std': std,
-        'Cp': Cp,
-        'Cpk': Cpk
+        'sigma_within': sigma_within,
+        'Cp': float(Cp),
+        'Cpk': float(Cpk),
+        'Pp': float(Pp),
+        'Ppk': float(Ppk)
     }
 
 
+# Cpk 기준 등급 (ANALYSIS_OPTIONS['capability_grades'] 하한 이상인 첫 등급, 미달이면 마지막 등급)
+def capability_grade(cpk) -> np.ndarray:
+    grades = ANALYSIS_OPTIONS['capability_grades']
+    cpk = np.asarray(cpk, dtype=float)
+    labels = list(grades)
+    conditions = [cpk >= limit for limit in grades.values() if limit is not None]
+    graded = np.select(conditions, labels[:len(conditions)], default=labels[-1])
+    return np.where(np.isnan(cpk), '', graded)
+
+
+@profiled()
+def capability_report(df: pd.DataFrame, spec_index, value_col: str = '측정값', group_col: str = '관리번호') -> pd.DataFrame:
+    """
+    모든 관리번호의 공정능력지수 표 (한 번의 groupby)
+
+    Args:
+        df (pd.DataFrame): 측정 데이터 (관리번호, 측정값 - 데이터 순서로 이동범위 계산)
+        spec_index (SpecIndex): Master 스펙 인덱스 (USL / LSL / Target)
+        value_col, group_col (str): 측정값 / 관리번호 컬럼
+
+    Returns:
+        pd.DataFrame: 관리번호, n, Mean, USL, LSL, Target, Sigma (within), Sigma (overall),
+        ANALYSIS_OPTIONS['capability_indices'] 지수, Grade (Cpk 기준) - Cpk 낮은 순
+        (규격이 없는 관리번호는 지수가 NaN, 한쪽 규격이면 Cp / Pp는 NaN이고 Cpk / Ppk는 있는 쪽 값)
+    """
+    data = df.loc[df[value_col].notna() & df[group_col].notna(), [group_col, value_col]]
+    grouped = data.groupby(group_col, sort=True)
+    moving_range = grouped[value_col].diff().abs()
+
+    report = pd.DataFrame({
+        'n': grouped[value_col].count(),
+        'Mean': grouped[value_col].mean(),
+        'Sigma (within)': moving_range.groupby(data[group_col], sort=True).mean() / _D2_MR,
+        'Sigma (overall)': grouped[value_col].std(ddof=1)
+    }).rename_axis(group_col).reset_index()
+
+    positions = spec_index.positions(report[group_col])
+    for col in ('USL', 'LSL', 'Target'):
+        values = spec_index.column_values(col, positions)
+        report[col] = values if values is not None else np.nan
+
+    indices = {}
+    indices['Cp'], indices['Cpk'] = capability_indices(report['Mean'], report['Sigma (within)'], report['USL'], report['LSL'])
+    indices['Pp'], indices['Ppk'] = capability_indices(report['Mean'], report['Sigma (overall)'], report['USL'], report['LSL'])
+    for name in ANALYSIS_OPTIONS['capability_indices']:
+        report[name] = indices[name]
+    report['Grade'] = capability_grade(indices['Cpk'])
+
+    columns = [group_col, 'n', 'Mean', 'USL', 'LSL', 'Target', 'Sigma (within)', 'Sigma (overall)'] \
+        + list(ANALYSIS_OPTIONS['capability_indices']) + ['Grade']
+    return report[columns].iloc[np.argsort(indices['Cpk'], kind='stable')].reset_index(drop=True)
+
+
+@profiled()
 def process_capability_histogram(data: np.ndarray, usl: float, lsl: float):
     """
     공정능력 히스토그램 + 정규분포 곡선 시각화
     """
+    data = _drop_missing(data)
     stats = calculate_capability_indices(data, usl, lsl)
     mean, std = stats['mean'], stats['std']
 
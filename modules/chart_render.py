@@ -0,0 +1,136 @@
+"""
+긴 관리도 시계열 렌더링 (WebGL + LTTB downsampling)
+
+수년치 측정 이력을 SVG로 모든 점을 그리면 브라우저가 멈추고 websocket으로 보내는 figure JSON이 수 MB가 된다.
+fast 모드에서는
+    - 점 trace를 Scattergl(WebGL)로 그리고
+    - 점 수가 max_points를 넘으면 LTTB(Largest-Triangle-Three-Buckets)로 모양을 유지하는 점만 남기되
+      이상치(관리 한계 밖 점)는 항상 포함한다.
+중심선 / 관리 한계는 모드와 관계없이 양 끝 두 점짜리 선으로 그린다.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+import plotly.graph_objs as go
+import plotly.io as pio
+
+from config import CHART_RENDER_CONFIG
+
+RENDER_MODES = ("auto", "fast", "standard")
+
+
+def resolve_render_mode(n_points: int, mode: Optional[str] = None) -> str:
+    """
+    렌더링 모드 결정
+
+    Args:
+        n_points (int): 시계열 점 수
+        mode (str, optional): 'auto', 'fast', 'standard' (None이면 CHART_RENDER_CONFIG['mode'])
+
+    Returns:
+        str: 'fast' 또는 'standard' ('auto'는 점 수가 fast_min_points 이상이면 'fast')
+    """
+    mode = mode or CHART_RENDER_CONFIG.get('mode', 'auto')
+    if mode not in RENDER_MODES:
+        raise ValueError(f"Unknown chart render mode: {mode} (supported: {', '.join(RENDER_MODES)})")
+    if mode == "auto":
+        return "fast" if n_points >= CHART_RENDER_CONFIG.get('fast_min_points', 2000) else "standard"
+    return mode
+
+
+def lttb_indices(y, n_out: int) -> np.ndarray:
+    """
+    LTTB downsampling으로 남길 점의 위치
+
+    x는 등간격(점 순서)으로 보고, 첫 점과 마지막 점은 항상 포함한다.
+    중간 점들을 n_out - 2개 bucket으로 나누고, bucket마다 직전에 선택한 점과
+    다음 bucket 평균점이 이루는 삼각형 넓이가 가장 큰 점을 고른다.
+
+    Returns:
+        np.ndarray: 오름차순 점 위치 (len(y) <= n_out이면 전체)
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    # 결측 값은 bucket 평균 / 넓이 계산에서 평균값으로 취급
+    if np.isnan(y).any():
+        y = np.where(np.isnan(y), np.nanmean(y) if np.isfinite(y).any() else 0.0, y)
+
+    # bucket 경계 (마지막 구간 [n-1, n)은 마지막 점)
+    edges = np.append(np.linspace(1, n - 1, n_out - 1).astype(np.int64), n)
+    # 각 bucket의 다음 bucket 평균점
+    centers = (edges[:-1] + edges[1:] - 1) / 2
+    means = np.add.reduceat(y, edges[:-1]) / np.diff(edges)
+    next_x, next_y = centers[1:], means[1:]
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        span = np.arange(lo, hi)
+        area = np.abs((a - next_x[i]) * (y[lo:hi] - y[a]) - (a - span) * (next_y[i] - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def downsample_indices(y, max_points: Optional[int], keep=None) -> np.ndarray:
+    """
+    LTTB로 고른 점 + 반드시 남길 점(keep, 이상치 등)의 위치
+
+    Args:
+        y (array): 시계열 값
+        max_points (int, optional): LTTB 목표 점 수 (None이면 전체)
+        keep (bool array, optional): 항상 포함할 점
+
+    Returns:
+        np.ndarray: 오름차순 점 위치
+    """
+    n = len(y)
+    if not max_points or n <= max_points:
+        return np.arange(n)
+    indices = lttb_indices(y, max_points)
+    if keep is not None and np.any(keep):
+        indices = np.union1d(indices, np.flatnonzero(keep))
+    return indices
+
+
+def series_trace(fast: bool, **kwargs):
+    """모드에 맞는 점 trace (fast: Scattergl, standard: Scatter)"""
+    return go.Scattergl(**kwargs) if fast else go.Scatter(**kwargs)
+
+
+def add_limit_lines(fig, x_vals, lines, indices: Optional[np.ndarray] = None):
+    """
+    중심선 / 관리 한계를 양 끝 두 점짜리 선으로 추가
+
+    Args:
+        fig (go.Figure): 대상 figure
+        x_vals (list): 시계열 x값 (첫 값과 마지막 값만 사용)
+        lines (list): (이름, 값, line dict) 목록 - 값이 점별 배열(가변 크기 부분군 한계)이면 계단선으로 그림
+        indices (np.ndarray, optional): 점별 배열 한계를 그릴 점 위치 (downsampling 결과, None이면 전체)
+    """
+    if len(x_vals) == 0:
+        return
+    ends = [x_vals[0], x_vals[len(x_vals) - 1]]
+    for name, value, line in lines:
+        if np.ndim(value):
+            points = indices if indices is not None else np.arange(len(value))
+            step_x, step_y = select_points(x_vals, np.asarray(value, dtype=float), points)
+            fig.add_trace(go.Scatter(x=step_x, y=step_y, mode='lines', name=name, line=dict(line, shape='hvh')))
+        else:
+            fig.add_trace(go.Scatter(x=ends, y=[value, value], mode='lines', name=name, line=line))
+
+
+def figure_payload_size(fig) -> int:
+    """브라우저로 보내는 figure JSON 크기 (bytes)"""
+    return len(pio.to_json(fig, validate=False).encode("utf-8"))
+
+
+def select_points(x_vals, y, indices: np.ndarray) -> Tuple[list, np.ndarray]:
+    """x값 목록 / y 배열에서 indices 위치의 점만 선택"""
+    if len(indices) == len(y):
+        return x_vals, y
+    return [x_vals[i] for i in indices], y[indices]
@@ -1,8 +1,204 @@
+import math
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
 import numpy as np
 import plotly.graph_objs as go
 import pandas as pd
+from .profiler import profiled
+from .run_rules import nelson_rules, nelson_rules_by_group, NELSON_RULES
+from .chart_render import resolve_render_mode, downsample_indices, series_trace, add_limit_lines, select_points
+from config import CHART_RENDER_CONFIG
+
+# Nelson 규칙별 위반 점 마커
+_RULE_MARKERS = {1: 'x', 2: 'circle-open', 3: 'triangle-up-open', 4: 'diamond-open',
+                 5: 'square-open', 6: 'star-open', 7: 'hexagon-open', 8: 'cross-open'}
+
+
+# 범위 관리도 상수 d2, d3 (부분군 크기 2~25, 정규분포 기준 표준값)
+# d2 = E[R/σ], d3 = SD[R/σ] - A2, D3, D4는 이 값으로 계산
+_D2_TABLE = {2: 1.128, 3: 1.693, 4: 2.059, 5: 2.326, 6: 2.534, 7: 2.704, 8: 2.847, 9: 2.970, 10: 3.078,
+             11: 3.173, 12: 3.258, 13: 3.336, 14: 3.407, 15: 3.472, 16: 3.532, 17: 3.588, 18: 3.640,
+             19: 3.689, 20: 3.735, 21: 3.778, 22: 3.819, 23: 3.858, 24: 3.895, 25: 3.931}
+_D3_TABLE = {2: 0.853, 3: 0.888, 4: 0.880, 5: 0.864, 6: 0.848, 7: 0.833, 8: 0.820, 9: 0.808, 10: 0.797,
+             11: 0.787, 12: 0.778, 13: 0.770, 14: 0.763, 15: 0.756, 16: 0.750, 17: 0.744, 18: 0.739,
+             19: 0.734, 20: 0.729, 21: 0.724, 22: 0.720, 23: 0.716, 24: 0.712, 25: 0.708}
+
+
+# Xbar-R 관리도 상수 (A2, D3, D4) 계산 함수
+@lru_cache(maxsize=None)
+def xbar_r_constants(n: int):
+    """
+    부분군 크기 n의 Xbar-R 관리도 상수
+
+    Returns:
+        (A2, D3, D4) - n이 2~25 범위를 벗어나면 ValueError (큰 부분군은 Xbar-S 관리도 사용)
+    """
+    d2, d3 = _range_constants(n)
+    return 3 / (d2 * math.sqrt(n)), max(0.0, 1 - 3 * d3 / d2), 1 + 3 * d3 / d2
+
+
+# 범위 관리도 상수 (d2, d3) 조회 함수
+def _range_constants(n: int):
+    if n not in _D2_TABLE:
+        raise ValueError(f"Xbar-R chart supports subgroup sizes 2-25 (got {n}); use the Xbar-S chart instead")
+    return _D2_TABLE[n], _D3_TABLE[n]
+
+
+# Xbar-S 관리도 상수 (c4, A3, B3, B4) 계산 함수
+@lru_cache(maxsize=None)
+def xbar_s_constants(n: int):
+    """
+    부분군 크기 n의 Xbar-S 관리도 상수 (모든 n >= 2에 대해 닫힌 형태로 계산)
+
+    c4 = sqrt(2 / (n - 1)) * Γ(n / 2) / Γ((n - 1) / 2)  (큰 n에서도 넘치지 않도록 lgamma 사용)
+    A3 = 3 / (c4 * sqrt(n)), B3 = max(0, 1 - 3 * sqrt(1 - c4²) / c4), B4 = 1 + 3 * sqrt(1 - c4²) / c4
+
+    Returns:
+        (c4, A3, B3, B4)
+    """
+    if n < 2:
+        raise ValueError(f"Xbar-S chart requires a subgroup size of at least 2 (got {n})")
+    c4 = math.sqrt(2 / (n - 1)) * math.exp(math.lgamma(n / 2) - math.lgamma((n - 1) / 2))
+    spread = 3 * math.sqrt(1 - c4 ** 2) / c4
+    return c4, 3 / (c4 * math.sqrt(n)), max(0.0, 1 - spread), 1 + spread
+
+
+# 부분군 크기 배열별 관리도 상수 (고유 크기마다 한 번만 계산)
+def _constants_by_size(sizes, constants, index):
+    unique_sizes, inverse = np.unique(sizes, return_inverse=True)
+    return np.array([constants(int(n))[index] for n in unique_sizes])[inverse]
+
+
+class Subgroups(NamedTuple):
+    """
+    가변 크기 부분군 (부분군 순서로 이어 붙인 값 + 부분군 시작 위치 + 부분군 이름 + 부분군 기준 컬럼)
+
+    values[starts[i]:starts[i + 1]]이 i번째 부분군이다.
+    """
+    values: np.ndarray
+    starts: np.ndarray
+    labels: Optional[list] = None
+    key: Optional[str] = None
 
-def create_imr_chart(data, x=None, return_summary=False, show_outliers=False):
+    @property
+    def sizes(self) -> np.ndarray:
+        return np.diff(np.append(self.starts, len(self.values)))
+
+
+# 관리도 입력을 Subgroups로 변환하는 함수 (2차원 배열 / 배열 목록 / Subgroups)
+def as_subgroups(data) -> Subgroups:
+    if isinstance(data, Subgroups):
+        return data
+    if isinstance(data, np.ndarray) and data.ndim == 2:
+        return Subgroups(data.astype(float).ravel(), np.arange(data.shape[0]) * data.shape[1])
+    arrays = [np.asarray(group, dtype=float).ravel() for group in data]
+    sizes = np.array([len(a) for a in arrays], dtype=np.int64)
+    values = np.concatenate(arrays) if arrays else np.empty(0)
+    return Subgroups(values, np.cumsum(sizes) - sizes)
+
+
+# 부분군 구성 함수 (측정일자 등 key 값이 같은 측정값끼리 한 부분군, 크기는 가변)
+def build_subgroups(df, key='측정일자', value_col='측정값') -> Subgroups:
+    """
+    Args:
+        df (pd.DataFrame): 측정 데이터 (한 관리번호)
+        key (str): 부분군 기준 컬럼 (날짜형이면 일 단위로 묶음)
+        value_col (str): 측정값 컬럼
+
+    Returns:
+        Subgroups: key 순서의 부분군 (labels = key 값, key = 기준 컬럼명(x축 제목), 결측 측정값 / key는 제외)
+    """
+    data = df.loc[df[value_col].notna() & df[key].notna(), [key, value_col]]
+    keys = data[key]
+    if pd.api.types.is_datetime64_any_dtype(keys):
+        keys = keys.dt.normalize()
+    codes, labels = pd.factorize(keys, sort=True)
+    order = np.argsort(codes, kind='stable')
+    sizes = np.bincount(codes, minlength=len(labels))
+    return Subgroups(data[value_col].to_numpy(dtype=float)[order], np.cumsum(sizes) - sizes, list(labels), key)
+
+
+# 부분군 크기가 min_size 미만인 부분군 제외 (이름이 없으면 원래 순번을 이름으로 사용)
+def _drop_small_subgroups(groups: Subgroups, x, min_size: int = 2):
+    keep = groups.sizes >= min_size
+    if keep.all():
+        return groups, x
+    keep_rows = np.repeat(keep, groups.sizes)
+    sizes = groups.sizes[keep]
+    labels = [label for label, k in zip(groups.labels, keep) if k] if groups.labels is not None else np.flatnonzero(keep).tolist()
+    x = [value for value, k in zip(x, keep) if k] if x is not None else None
+    return Subgroups(groups.values[keep_rows], np.cumsum(sizes) - sizes, labels, groups.key), x
+
+
+# 부분군 크기가 모두 같으면 스칼라, 다르면 부분군별 배열
+def _collapse(values):
+    return values[0] if len(values) and np.all(values == values[0]) else values
+
+
+# 요약 표 (한계가 부분군별로 다르면 중앙값 크기 부분군의 한계와 부분군 크기 범위를 표시)
+def _subgroup_summary(center, ucl, lcl, outliers, sizes):
+    if np.ndim(ucl) == 0 and np.ndim(center) == 0:
+        return pd.DataFrame({'Mean': [center], 'UCL': [ucl], 'LCL': [lcl], '이상치 수': [int(np.sum(outliers))]})
+    median = int(np.argsort(sizes, kind='stable')[len(sizes) // 2])
+    pick = lambda v: v[median] if np.ndim(v) else v
+    return pd.DataFrame({'Mean': [pick(center)], 'UCL': [pick(ucl)], 'LCL': [pick(lcl)],
+                         '이상치 수': [int(np.sum(outliers))],
+                         'Subgroup size': [f"{sizes.min()}-{sizes.max()}"]})
+
+
+# 부분군 관리도 x축 제목 (지정값 > 부분군 기준 컬럼 > x값이 있으면 측정일자 > 없으면 순번)
+def _subgroup_axis_title(groups: Subgroups, x, x_title: Optional[str], default: str) -> str:
+    if x_title:
+        return x_title
+    if groups.key:
+        return groups.key
+    return '측정일자' if x is not None or groups.labels is not None else default
+
+
+# 중심선 / UCL / LCL과 이상치를 포함한 관리도 figure 생성 함수 (한계는 스칼라 또는 점별 배열)
+# fast 모드는 점 trace를 WebGL로 그리고 max_points를 넘으면 LTTB로 줄임 (이상치는 항상 포함)
+# layout.meta에 렌더링 모드와 그린 점 수를 기록
+def _limit_chart(x_vals, y, center, ucl, lcl, outliers, show_outliers, name, title, xaxis_title, yaxis_title,
+                 render_mode=None):
+    y = np.asarray(y, dtype=float)
+    fast = resolve_render_mode(len(y), render_mode) == 'fast'
+    indices = downsample_indices(y, CHART_RENDER_CONFIG.get('max_points') if fast else None, keep=outliers)
+    drawn_x, drawn_y = select_points(x_vals, y, indices)
+
+    fig = go.Figure()
+    fig.add_trace(series_trace(fast, x=drawn_x, y=drawn_y, mode='lines+markers', name=name))
+    if show_outliers:
+        fig.add_trace(series_trace(fast, x=[x_vals[i] for i in np.where(outliers)[0]], y=y[outliers], mode='markers', name='이상치', marker=dict(color='red', size=10)))
+    add_limit_lines(fig, x_vals, [
+        ('중심선', center, dict(dash='dash', color='green')),
+        ('UCL', ucl, dict(dash='dot', color='red')),
+        ('LCL', lcl, dict(dash='dot', color='red'))
+    ], indices)
+    fig.update_layout(title=title, xaxis_title=xaxis_title, yaxis_title=yaxis_title,
+                      meta=dict(render_mode='fast' if fast else 'standard', points=len(y), points_drawn=len(indices)))
+    return fig
+
+
+# 규칙 위반 점을 규칙별 trace로 표시하는 함수 (위반이 있는 규칙만)
+def _add_rule_traces(fig, x_vals, y, masks):
+    fast = fig.layout.meta is not None and fig.layout.meta.get('render_mode') == 'fast'
+    for rule, mask in masks.items():
+        idx = np.flatnonzero(mask)
+        if len(idx):
+            fig.add_trace(series_trace(
+                fast,
+                x=[x_vals[i] for i in idx], y=y[idx], mode='markers', name=f'Rule {rule}',
+                hovertext=NELSON_RULES[rule],
+                marker=dict(symbol=_RULE_MARKERS[rule], size=13, color='orange', line=dict(width=2))
+            ))
+
+@profiled()
+def create_imr_chart(data, x=None, return_summary=False, show_outliers=False, rules=None, render_mode=None):
+    """
+    rules: 표시할 Nelson 규칙 번호 목록 (예: [1, 2, 5]), 위반 점을 규칙별 마커로 표시하고 summary에 규칙별 위반 수 추가
+    render_mode: 'auto', 'fast' (WebGL + LTTB), 'standard' (None이면 CHART_RENDER_CONFIG['mode'])
+    """
     mean = np.mean(data)
     mr = np.abs(np.diff(data))
     mr_bar = np.mean(mr)
@@ -14,18 +210,11 @@ def create_imr_chart(data, x=None, return_summary=False, show_outliers=False):
     outliers = (data > ucl) | (data < lcl)
     x_vals = x if x is not None else list(range(len(data)))
 
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=x_vals, y=data, mode='lines+markers', name='개별값'))
-
-    if show_outliers:
-        outlier_indices = [x_vals[i] for i in np.where(outliers)[0]]
-        fig.add_trace(go.Scatter(x=outlier_indices, y=data[outliers], mode='markers', name='이상치', marker=dict(color='red', size=10)))
-
-    fig.add_trace(go.Scatter(x=x_vals, y=[mean] * len(data), mode='lines', name='중심선', line=dict(color='green', dash='dash')))
-    fig.add_trace(go.Scatter(x=x_vals, y=[ucl] * len(data), mode='lines', name='UCL', line=dict(color='red', dash='dot')))
-    fig.add_trace(go.Scatter(x=x_vals, y=[lcl] * len(data), mode='lines', name='LCL', line=dict(color='red', dash='dot')))
+    fig = _limit_chart(x_vals, data, mean, ucl, lcl, outliers, show_outliers, '개별값',
+                       'I-MR control chart', 'Date' if x is not None else '순서', '값', render_mode)
 
-    fig.update_layout(title='I-MR control chart', xaxis_title='Date' if x is not None else '순서', yaxis_title='값')
+    rule_masks = nelson_rules(data, mean, sigma, rules) if rules else {}
+    _add_rule_traces(fig, x_vals, np.asarray(data, dtype=float), rule_masks)
 
     summary = {
         'Mean': [mean],
@@ -33,56 +222,184 @@ def create_imr_chart(data, x=None, return_summary=False, show_outliers=False):
         'LCL': [lcl],
         'outlier number': [int(np.sum(outliers))]
     }
+    for rule, mask in rule_masks.items():
+        summary[f'Rule {rule}'] = [int(mask.sum())]
 
     if return_summary:
         return fig, pd.DataFrame(summary)
     return fig
 
-def create_xbar_r_chart(data, sample_size, x=None, return_summary=False, show_outliers=False):
-    sample_means = np.mean(data, axis=1)
-    sample_ranges = np.ptp(data, axis=1)
-    xbar_bar = np.mean(sample_means)
-    r_bar = np.mean(sample_ranges)
+@profiled()
+def create_xbar_r_chart(data, sample_size=None, x=None, return_summary=False, show_outliers=False, rules=None,
+                        render_mode=None, x_title=None):
+    """
+    X-bar & R 관리도 (고정 크기 또는 가변 크기 부분군)
 
-    A2_TABLE = {2: 1.88, 3: 1.023, 4: 0.729, 5: 0.577, 6: 0.483, 7: 0.419, 8: 0.373, 9: 0.337, 10: 0.308}
-    D3_TABLE = {2: 0, 3: 0, 4: 0, 5: 0, 6: 0.076, 7: 0.136, 8: 0.184, 9: 0.223, 10: 0.256}
-    D4_TABLE = {2: 3.267, 3: 2.574, 4: 2.282, 5: 2.114, 6: 2.004, 7: 1.924, 8: 1.864, 9: 1.816, 10: 1.777}
+    Args:
+        data: 부분군 x 부분군 크기 2차원 배열, 부분군별 배열 목록(가변 크기), 또는 Subgroups (build_subgroups 결과)
+        sample_size (int, optional): 고정 부분군 크기 (참고용, 부분군 크기는 data에서 계산)
+        x (list, optional): 부분군별 x축 값 (None이면 Subgroups.labels 또는 순번)
+        x_title (str, optional): X-bar / R 관리도 x축 제목 (None이면 Subgroups.key, x값이 있으면 측정일자)
+        rules: X-bar 관리도에 표시할 Nelson 규칙 번호 목록 (부분군 평균의 sigma = sigma / sqrt(n))
+        render_mode: 'auto', 'fast' (WebGL + LTTB), 'standard' (None이면 CHART_RENDER_CONFIG['mode'])
 
-    A2 = A2_TABLE.get(sample_size, 0.577)
-    D3 = D3_TABLE.get(sample_size, 0.076)
-    D4 = D4_TABLE.get(sample_size, 1.924)
+    부분군 평균 / 범위는 np.add.reduceat, np.maximum/minimum.reduceat으로 한 번에 계산한다.
+    sigma = mean(R_i / d2(n_i))로 추정하고 부분군 크기별 한계를 사용한다
+    (X-bar: 총평균 ± 3 sigma / sqrt(n_i), R: d2(n_i) sigma 중심, D3/D4 한계 - 크기가 모두 같으면 A2 / D3 / D4 한계와 같음).
+    크기 1인 부분군은 범위를 계산할 수 없어 제외하며, 크기가 25를 넘으면 ValueError (Xbar-S 관리도 사용).
+    """
+    groups = as_subgroups(data)
+    x_title = _subgroup_axis_title(groups, x, x_title, '샘플 그룹')
+    groups, x = _drop_small_subgroups(groups, x)
+    values, starts, sizes = groups.values, groups.starts, groups.sizes
+    sample_means = np.add.reduceat(values, starts) / sizes
+    sample_ranges = np.maximum.reduceat(values, starts) - np.minimum.reduceat(values, starts)
+    xbar_bar = values.mean()
 
-    xbar_ucl = xbar_bar + A2 * r_bar
-    xbar_lcl = xbar_bar - A2 * r_bar
-    r_ucl = D4 * r_bar
-    r_lcl = D3 * r_bar
+    d2 = _constants_by_size(sizes, _range_constants, 0)
+    d3 = _constants_by_size(sizes, _range_constants, 1)
+    sigma = np.mean(sample_ranges / d2)
+    sigma_xbar = sigma / np.sqrt(sizes)
+
+    xbar_ucl = _collapse(xbar_bar + 3 * sigma_xbar)
+    xbar_lcl = _collapse(xbar_bar - 3 * sigma_xbar)
+    r_center = _collapse(d2 * sigma)
+    r_ucl = _collapse((d2 + 3 * d3) * sigma)
+    r_lcl = _collapse(np.maximum(d2 - 3 * d3, 0) * sigma)
 
     xbar_outliers = (sample_means > xbar_ucl) | (sample_means < xbar_lcl)
     r_outliers = (sample_ranges > r_ucl) | (sample_ranges < r_lcl)
 
-    x_vals = x if x is not None else list(range(len(sample_means)))
+    x_vals = x if x is not None else (groups.labels if groups.labels is not None else list(range(len(sample_means))))
 
-    xbar_fig = go.Figure()
-    xbar_fig.add_trace(go.Scatter(x=x_vals, y=sample_means, mode='lines+markers', name='샘플 평균'))
-    if show_outliers:
-        xbar_fig.add_trace(go.Scatter(x=[x_vals[i] for i in np.where(xbar_outliers)[0]], y=sample_means[xbar_outliers], mode='markers', name='이상치', marker=dict(color='red', size=10)))
-    xbar_fig.add_trace(go.Scatter(x=x_vals, y=[xbar_bar]*len(sample_means), mode='lines', name='중심선', line=dict(dash='dash', color='green')))
-    xbar_fig.add_trace(go.Scatter(x=x_vals, y=[xbar_ucl]*len(sample_means), mode='lines', name='UCL', line=dict(dash='dot', color='red')))
-    xbar_fig.add_trace(go.Scatter(x=x_vals, y=[xbar_lcl]*len(sample_means), mode='lines', name='LCL', line=dict(dash='dot', color='red')))
-    xbar_fig.update_layout(title='X-bar control chart', xaxis_title='측정일자' if x is not None else '샘플 그룹', yaxis_title='평균')
-
-    r_fig = go.Figure()
-    r_fig.add_trace(go.Scatter(x=x_vals, y=sample_ranges, mode='lines+markers', name='샘플 범위'))
-    if show_outliers:
-        r_fig.add_trace(go.Scatter(x=[x_vals[i] for i in np.where(r_outliers)[0]], y=sample_ranges[r_outliers], mode='markers', name='이상치', marker=dict(color='red', size=10)))
-    r_fig.add_trace(go.Scatter(x=x_vals, y=[r_bar]*len(sample_ranges), mode='lines', name='중심선', line=dict(dash='dash', color='green')))
-    r_fig.add_trace(go.Scatter(x=x_vals, y=[r_ucl]*len(sample_ranges), mode='lines', name='UCL', line=dict(dash='dot', color='red')))
-    r_fig.add_trace(go.Scatter(x=x_vals, y=[r_lcl]*len(sample_ranges), mode='lines', name='LCL', line=dict(dash='dot', color='red')))
-    r_fig.update_layout(title='R control chart', xaxis_title='Date' if x is not None else 'Sample Group', yaxis_title='Range')
+    xbar_fig = _limit_chart(x_vals, sample_means, xbar_bar, xbar_ucl, xbar_lcl, xbar_outliers, show_outliers, '샘플 평균',
+                            'X-bar control chart', x_title, '평균', render_mode)
+    xbar_rule_masks = nelson_rules(sample_means, xbar_bar, sigma_xbar, rules) if rules else {}
+    _add_rule_traces(xbar_fig, x_vals, sample_means, xbar_rule_masks)
+
+    r_fig = _limit_chart(x_vals, sample_ranges, r_center, r_ucl, r_lcl, r_outliers, show_outliers, '샘플 범위',
+                         'R control chart', x_title, 'Range', render_mode)
 
     if return_summary:
-        xbar_summary = pd.DataFrame({'Mean': [xbar_bar], 'UCL': [xbar_ucl], 'LCL': [xbar_lcl], '이상치 수': [int(np.sum(xbar_outliers))]})
-        r_summary = pd.DataFrame({'Mean': [r_bar], 'UCL': [r_ucl], 'LCL': [r_lcl], '이상치 수': [int(np.sum(r_outliers))]})
+        xbar_summary = _subgroup_summary(xbar_bar, xbar_ucl, xbar_lcl, xbar_outliers, sizes)
+        for rule, mask in xbar_rule_masks.items():
+            xbar_summary[f'Rule {rule}'] = int(mask.sum())
+        r_summary = _subgroup_summary(r_center, r_ucl, r_lcl, r_outliers, sizes)
         return xbar_fig, r_fig, xbar_summary, r_summary
 
     return xbar_fig, r_fig
+
+@profiled()
+def create_xbar_s_chart(data, sample_size=None, x=None, return_summary=False, show_outliers=False, rules=None,
+                        render_mode=None, x_title=None):
+    """
+    X-bar & S 관리도 (부분군 표준편차 기반, 부분군 크기 제한 없음)
+
+    Args:
+        data: 부분군 x 부분군 크기 2차원 배열, 부분군별 배열 목록(가변 크기), 또는 Subgroups (build_subgroups 결과)
+        sample_size (int, optional): 고정 부분군 크기 (참고용, 부분군 크기는 data에서 계산)
+        x (list, optional): 부분군별 x축 값 (None이면 Subgroups.labels 또는 순번)
+        x_title (str, optional): X-bar / S 관리도 x축 제목 (None이면 Subgroups.key, x값이 있으면 측정일자)
+        return_summary (bool): 요약 표 반환 여부
+        show_outliers (bool): 관리 한계 밖 점 표시 여부
+        rules (list, optional): X-bar 관리도에 표시할 Nelson 규칙 번호 (부분군 평균의 sigma = sigma / sqrt(n))
+        render_mode (str, optional): 'auto', 'fast' (WebGL + LTTB), 'standard'
+
+    sigma = mean(S_i / c4(n_i))로 추정하고 부분군 크기별 한계를 사용한다 (크기가 모두 같으면 A3 / B3 / B4 한계와 같음).
+
+    Returns:
+        xbar_fig, s_fig (return_summary=True이면 xbar_summary, s_summary 추가)
+    """
+    groups = as_subgroups(data)
+    x_title = _subgroup_axis_title(groups, x, x_title, '샘플 그룹')
+    groups, x = _drop_small_subgroups(groups, x)
+    values, starts, sizes = groups.values, groups.starts, groups.sizes
+    # 부분군 평균 / 표준편차(ddof=1)를 구간 합(reduceat)으로 한 번에 계산
+    sample_means = np.add.reduceat(values, starts) / sizes
+    deviations = values - np.repeat(sample_means, sizes)
+    sample_stds = np.sqrt(np.add.reduceat(deviations ** 2, starts) / (sizes - 1))
+    xbar_bar = values.mean()
+
+    c4 = _constants_by_size(sizes, xbar_s_constants, 0)
+    sigma = np.mean(sample_stds / c4)
+    sigma_xbar = sigma / np.sqrt(sizes)
+    spread = 3 * np.sqrt(1 - c4 ** 2) * sigma
+
+    xbar_ucl = _collapse(xbar_bar + 3 * sigma_xbar)
+    xbar_lcl = _collapse(xbar_bar - 3 * sigma_xbar)
+    s_center = _collapse(c4 * sigma)
+    s_ucl = _collapse(c4 * sigma + spread)
+    s_lcl = _collapse(np.maximum(c4 * sigma - spread, 0))
+
+    xbar_outliers = (sample_means > xbar_ucl) | (sample_means < xbar_lcl)
+    s_outliers = (sample_stds > s_ucl) | (sample_stds < s_lcl)
+
+    x_vals = x if x is not None else (groups.labels if groups.labels is not None else list(range(len(sample_means))))
+
+    xbar_fig = _limit_chart(x_vals, sample_means, xbar_bar, xbar_ucl, xbar_lcl, xbar_outliers, show_outliers, '샘플 평균',
+                            'X-bar control chart', x_title, '평균', render_mode)
+    xbar_rule_masks = nelson_rules(sample_means, xbar_bar, sigma_xbar, rules) if rules else {}
+    _add_rule_traces(xbar_fig, x_vals, sample_means, xbar_rule_masks)
+
+    s_fig = _limit_chart(x_vals, sample_stds, s_center, s_ucl, s_lcl, s_outliers, show_outliers, '샘플 표준편차',
+                         'S control chart', x_title, 'Standard deviation', render_mode)
+
+    if return_summary:
+        xbar_summary = _subgroup_summary(xbar_bar, xbar_ucl, xbar_lcl, xbar_outliers, sizes)
+        for rule, mask in xbar_rule_masks.items():
+            xbar_summary[f'Rule {rule}'] = int(mask.sum())
+        s_summary = _subgroup_summary(s_center, s_ucl, s_lcl, s_outliers, sizes)
+        return xbar_fig, s_fig, xbar_summary, s_summary
+
+    return xbar_fig, s_fig
+
+@profiled()
+def imr_summary_by_group(df, value_col='측정값', group_col='관리번호', order_col=None, rules=None):
+    """
+    모든 관리번호의 I-MR 관리 한계와 이상치 수를 한 번의 groupby로 계산
+
+    Args:
+        df (pd.DataFrame): 측정 데이터 (관리번호, 측정값)
+        value_col (str): 측정값 컬럼
+        group_col (str): 관리번호 컬럼
+        order_col (str, optional): 관리번호 안의 점 순서 기준 컬럼 (None이면 데이터 순서 = 상세 관리도와 같은 순서)
+        rules (iterable, optional): 판정할 Nelson 규칙 번호 - 주어지면 규칙 중 하나라도 위반한 점 수(Rule violations) 추가
+
+    Returns:
+        pd.DataFrame: 관리번호, n, Mean, MR-bar, Sigma, UCL, LCL, Above UCL, Below LCL, Out of control, Out of control %,
+        [Rule violations] (이상치가 많은 순, 결측 측정값은 제외)
+    """
+    columns = [group_col, value_col] + ([order_col] if order_col else [])
+    data = df.loc[df[value_col].notna() & df[group_col].notna(), columns]
+    if order_col:
+        data = data.sort_values([group_col, order_col], kind='stable')
+
+    grouped = data.groupby(group_col, sort=True)
+    values = data[value_col].astype(float)
+    # 이동범위는 관리번호 안에서만 계산 (그룹 첫 점은 NaN)
+    moving_range = grouped[value_col].diff().abs()
+
+    summary = pd.DataFrame({
+        'n': grouped[value_col].count(),
+        'Mean': grouped[value_col].mean(),
+        'MR-bar': moving_range.groupby(data[group_col], sort=True).mean()
+    })
+    summary['Sigma'] = summary['MR-bar'] / 1.128
+    summary['UCL'] = summary['Mean'] + 3 * summary['Sigma']
+    summary['LCL'] = summary['Mean'] - 3 * summary['Sigma']
+
+    # 행별 한계를 관리번호 위치로 가져와 이상치 수를 bincount로 집계
+    codes = grouped.ngroup().to_numpy()
+    above = values.to_numpy() > summary['UCL'].to_numpy()[codes]
+    below = values.to_numpy() < summary['LCL'].to_numpy()[codes]
+    summary['Above UCL'] = np.bincount(codes[above], minlength=len(summary))
+    summary['Below LCL'] = np.bincount(codes[below], minlength=len(summary))
+    summary['Out of control'] = summary['Above UCL'] + summary['Below LCL']
+    summary['Out of control %'] = 100 * summary['Out of control'] / summary['n']
+    if rules:
+        # 상세 관리도와 같은 점 순서 / 중심선 / sigma로 판정 (data는 이미 관리번호, 점 순서로 정렬됨)
+        violating = nelson_rules_by_group(data, value_col, group_col, order_col, rules).any(axis=1).to_numpy()
+        summary['Rule violations'] = np.bincount(codes[violating], minlength=len(summary))
+
+    summary = summary.rename_axis(group_col).reset_index()
+    return summary.sort_values(['Out of control', group_col], ascending=[False, True], ignore_index=True)
@@ -0,0 +1,227 @@
+"""
+백그라운드 변환 작업 관리
+
+업로드 페이지에서 transform_data를 스크립트 실행 중에 직접 호출하지 않고 작업 스레드에 맡긴다.
+    - 같은 입력(파일 내용/기간/search_cols/읽기 방식)의 작업은 하나만 실행되고, 다시 제출하면 기존 작업을 돌려준다.
+    - 작업은 작업을 기다리는 세션(구독자)을 기록하며, 마지막 구독자가 해제하면 다음 진행률 보고 지점에서 중단된다.
+    - 완료된 결과는 변환 결과 캐시에서 가져온다 (캐시 크기를 넘어 저장되지 않은 결과만 작업에 보관).
+      캐시에서 밀려난 완료 작업은 다시 제출하면 새 백그라운드 작업으로 교체된다 (스크립트 실행 중 변환하지 않음).
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from config import BACKGROUND_JOB_CONFIG
+from .data_transformer import transform_data, get_cached_transform, _make_cache_key
+from .result_cache import hash_bytes
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATUSES = (DONE, FAILED, CANCELLED)
+
+
+class ConversionCancelled(Exception):
+    """사용자가 변환 작업을 취소함"""
+
+
+class ConversionJob:
+    """
+    변환 작업 1개의 상태
+
+    - key: 작업 식별값 (같은 입력이면 같은 값)
+    - status: queued / running / done / failed / cancelled
+    - progress, stage: 마지막으로 보고된 진행률(0~1)과 단계명
+    - cache_key: 변환 결과 캐시 키
+    - result: 완료 시 캐시에 저장되지 못한 결과 (정리된 master_df, 변환 결과) - 캐시에 있으면 None
+    - error: 실패 시 오류 메시지
+    - subscribers: 작업 결과를 기다리는 구독자(세션) 식별값
+    """
+
+    def __init__(self, key: str, cache_key=None):
+        self.key = key
+        self.cache_key = cache_key
+        self.status = QUEUED
+        self.progress = 0.0
+        self.stage = "queued"
+        self.result = None
+        self.error = None
+        self.subscribers = set()
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.future = None
+        self._cancel_event = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    @property
+    def elapsed(self) -> float:
+        """실행 시간(s) (대기 시간 제외)"""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def cancel(self) -> None:
+        self._cancel_event.set()
+        # 아직 시작 전이면 바로 취소
+        if self.future is not None and self.future.cancel():
+            self.status = CANCELLED
+            self.finished_at = time.time()
+
+    def _on_progress(self, stage: str, fraction: float) -> None:
+        # 마지막 보고(1.0)는 변환이 끝나 캐시에 저장된 뒤이므로 취소하지 않음
+        if self._cancel_event.is_set() and fraction < 1.0:
+            raise ConversionCancelled()
+        self.stage = stage
+        self.progress = max(self.progress, min(float(fraction), 1.0))
+
+
+class ConversionJobManager:
+    """
+    변환 작업 스레드 풀
+
+    변환 결과(DataFrame)를 세션과 바로 공유할 수 있도록 프로세스가 아닌 스레드 풀을 사용한다.
+    완료된 작업은 최근 max_finished개만 보관한다.
+    """
+
+    def __init__(self, max_workers: int = 2, max_finished: int = 16):
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="conversion")
+        self._jobs: Dict[str, ConversionJob] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def job_key(input_bytes: bytes, master_bytes: bytes, start_date=None, end_date=None,
+                search_cols: List[int] = list(range(0, 11)), reader: Optional[str] = None,
+                incremental: Optional[bool] = None) -> str:
+        cache_key = _make_cache_key(hash_bytes(input_bytes), hash_bytes(master_bytes), start_date, end_date, search_cols)
+        return ConversionJobManager._job_key(cache_key, reader, incremental)
+
+    @staticmethod
+    def _job_key(cache_key, reader: Optional[str], incremental: Optional[bool]) -> str:
+        return hash_bytes(repr((cache_key, reader, incremental)).encode("utf-8"))
+
+    def submit(
+            self,
+            input_bytes: bytes,
+            master_bytes: bytes,
+            start_date=None,
+            end_date=None,
+            search_cols: List[int] = list(range(0, 11)),
+            reader: Optional[str] = None,
+            incremental: Optional[bool] = None,
+            subscriber: Optional[str] = None
+    ) -> ConversionJob:
+        """
+        변환 작업 제출 (같은 입력의 작업이 대기/실행 중이거나 완료되어 있으면 그 작업을 반환)
+
+        Args:
+            subscriber (str, optional): 작업을 기다리는 구독자(세션) 식별값 - release 전까지 작업이 취소되지 않음
+
+        Returns:
+            ConversionJob
+        """
+        cache_key = _make_cache_key(hash_bytes(input_bytes), hash_bytes(master_bytes), start_date, end_date, search_cols)
+        key = self._job_key(cache_key, reader, incremental)
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and (job.status in (QUEUED, RUNNING)
+                                    or (job.status == DONE and self._finished_result(job) is not None)):
+                if subscriber is not None:
+                    job.subscribers.add(subscriber)
+                return job
+
+            # 취소/실패한 작업, 결과가 캐시에서 밀려난 완료 작업은 새 작업으로 교체
+            job = ConversionJob(key, cache_key)
+            if subscriber is not None:
+                job.subscribers.add(subscriber)
+            self._jobs[key] = job
+            job.future = self._executor.submit(
+                self._run, job, input_bytes, master_bytes, start_date, end_date, search_cols, reader, incremental
+            )
+            self._prune()
+        return job
+
+    def get(self, key: Optional[str]) -> Optional[ConversionJob]:
+        with self._lock:
+            return self._jobs.get(key) if key else None
+
+    def release(self, key: Optional[str], subscriber: Optional[str] = None) -> bool:
+        """
+        구독 해제 - 남은 구독자가 없을 때만 아직 끝나지 않은 작업을 취소
+
+        Returns:
+            bool: 작업을 취소했으면 True (다른 세션이 아직 기다리면 False)
+        """
+        with self._lock:
+            job = self._jobs.get(key) if key else None
+            if job is None:
+                return False
+            job.subscribers.discard(subscriber)
+            if job.subscribers or job.finished:
+                return False
+        job.cancel()
+        return True
+
+    @staticmethod
+    def _finished_result(job: ConversionJob):
+        return job.result if job.result is not None else get_cached_transform(job.cache_key)
+
+    def result(self, key: Optional[str]):
+        """
+        완료된 작업의 결과 복사본 (변환하지 않음)
+
+        Returns:
+            tuple: (변환 결과, 정리된 master_df) - 작업이 완료되지 않았거나 결과가 캐시에서 밀려났으면 None
+            (None이면 다시 submit하여 백그라운드에서 변환)
+        """
+        job = self.get(key)
+        if job is None or job.status != DONE:
+            return None
+        cached = self._finished_result(job)
+        if cached is None:
+            return None
+        master_df, transformed_df = (df.copy() for df in cached)
+        return transformed_df, master_df
+
+    def _run(self, job: ConversionJob, input_bytes, master_bytes, start_date, end_date, search_cols,
+             reader, incremental) -> None:
+        job.started_at = time.time()
+        job.status = RUNNING
+        try:
+            job._on_progress("started", 0.0)
+            transformed_df, master_df = transform_data(
+                input_bytes, master_bytes, start_date, end_date, search_cols,
+                reader=reader, return_master=True, incremental=incremental, progress=job._on_progress
+            )
+            # 캐시 크기를 넘어 저장되지 않은 결과만 작업에 보관
+            if get_cached_transform(job.cache_key) is None:
+                job.result = (master_df, transformed_df)
+            job.status = DONE
+        except ConversionCancelled:
+            job.status = CANCELLED
+        except Exception as e:
+            job.error = str(e) or type(e).__name__
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+
+    def _prune(self) -> None:
+        finished = sorted((j for j in self._jobs.values() if j.finished), key=lambda j: j.finished_at or 0)
+        for job in finished[:max(len(finished) - self.max_finished, 0)]:
+            del self._jobs[job.key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+        return {status: statuses.count(status) for status in (QUEUED, RUNNING, DONE, FAILED, CANCELLED)}
+
+
+job_manager = ConversionJobManager(BACKGROUND_JOB_CONFIG['max_workers'], BACKGROUND_JOB_CONFIG['max_finished_jobs'])
@@ -4,64 +4,126 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime
-import streamlit as st
-import re
-from typing import Optional, List, Dict, Union
-
-
-# 날짜 형식이 가장 많이 들어있는 열의 인덱스를 찾는 함수
-def find_date_start_col(df: pd.DataFrame, sample_row_count: int = 10) -> int:
-    def is_date(x: Union[str, datetime]) -> bool:
-        if not isinstance(x, str):
-            return False
-        x = x.strip()
-
-        # 날짜 형식 패턴 (예: 1/6, 01-07-2024, 2024.01.08)
-        date_pattern = re.compile(r'^\d{1,4}[/.-]\d{1,2}([/.-]\d{2,4})?$')
-
-        if date_pattern.match(x):
-            return True
-
-        try:
-            converted = pd.to_datetime(x, errors='coerce')
-            return pd.notna(converted)
-        except:
-            return False
-
-    date_counts = [
-        sum(df.iloc[:sample_row_count, col_idx].astype(str).apply(is_date))
-        for col_idx in range(df.shape[1])
-    ]
-    best_col = date_counts.index(max(date_counts))
+import warnings
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, List, Dict, Union, Tuple, Callable
+
+from config import DATA_TRANSFORM_CONFIG, TRANSFORM_CACHE_CONFIG, INCREMENTAL_CONFIG
+from .result_cache import ResultCache, hash_bytes
+from .master_index import MasterIndex, get_master_index, normalize_keys
+from .profiler import stage
+from .excel_reader import read_excel_sheet, iter_sheet_rows, select_engine, STREAMING_ENGINES
+from .long_form_reader import detect_input_format, read_long_form, LONG_FORM_FORMATS
+from .ingest_state import ingest_store, workbook_identity, layout_hash, column_hashes
+
+# 변환 결과 캐시 (입력/마스터 파일 내용 해시 + 기간 + search_cols 기준)
+_transform_cache = ResultCache(
+    max_entries=TRANSFORM_CACHE_CONFIG['max_entries'],
+    max_bytes=TRANSFORM_CACHE_CONFIG['max_size_mb'] * 1024 * 1024
+)
+
+# 측정 파일을 읽는 동안 Master 시트를 동시에 읽기 위한 스레드 풀
+_master_read_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="master-read")
+
+# 진행률 콜백: progress(단계명, 0~1 진행률). 백그라운드 변환 작업의 진행 표시와 취소 확인 지점으로 사용
+# (콜백에서 예외를 올리면 변환이 중단된다)
+ProgressCallback = Callable[[str, float], None]
+
+
+def _report(progress: Optional[ProgressCallback], stage_name: str, fraction: float) -> None:
+    if progress is not None:
+        progress(stage_name, fraction)
+
+
+# 날짜 형식 패턴 (예: 1/6, 01-07-2024, 2024.01.08)
+_DATE_PATTERN = r'^\d{1,4}[/.-]\d{1,2}([/.-]\d{2,4})?$'
+# pd.to_datetime이 예외 없이 NaT로 변환하는 문자열
+_NAT_STRINGS = frozenset(['', 'NaT', 'nat', 'NAT', 'nan', 'NaN', 'NAN'])
+
+
+# 헤더 영역(앞쪽 n_rows 행)의 셀들을 한 번에 날짜 판정하는 함수
+# 셀마다 정규식/pd.to_datetime을 호출하지 않고, 고유 문자열만 모아 한 번의 pd.to_datetime 호출로 판정한다.
+def _classify_date_cells(df: pd.DataFrame, n_rows: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns:
+        text_is_date: str(셀) 기준 날짜 여부 (정규식 일치 또는 날짜 변환 가능) - find_date_start_col 기준
+        cell_is_date: Timestamp/datetime 셀이거나 pd.to_datetime이 예외 없이 처리하는 문자열 셀 - find_date_row 기준
+    """
+    block = df.iloc[:n_rows]
+    if block.size == 0:
+        empty = np.zeros(block.shape, dtype=bool)
+        return empty, empty
+
+    values = block.to_numpy(dtype=object)
+    text = block.astype(str).to_numpy(dtype=object)
+
+    # pandas 버전에 따라 astype(str) 결과에 결측치가 남을 수 있으므로 문자열이 아닌 값은 날짜가 아닌 것으로 처리
+    text_codes, text_uniques = pd.factorize(text.ravel(), use_na_sentinel=False)
+    is_text = np.array([isinstance(u, str) for u in text_uniques], dtype=bool)
+    raw_texts = pd.Series(text_uniques[is_text], dtype=object)
+    stripped = raw_texts.str.strip()
+
+    # 원본 문자열과 strip된 문자열을 합쳐 한 번만 날짜 변환
+    candidates = pd.unique(np.concatenate([stripped.to_numpy(dtype=object), raw_texts.to_numpy(dtype=object)]))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        parsed = pd.to_datetime(pd.Series(candidates, dtype=object), errors='coerce', format='mixed')
+    parsable = dict(zip(candidates, parsed.notna().to_numpy()))
+
+    text_date_flags = np.zeros(len(text_uniques), dtype=bool)
+    text_date_flags[is_text] = (
+        stripped.str.match(_DATE_PATTERN).to_numpy(dtype=bool) | stripped.map(parsable).to_numpy(dtype=bool)
+    )
+    text_is_date = text_date_flags[text_codes].reshape(values.shape)
+
+    cell_types = np.fromiter(map(type, values.ravel()), dtype=object, count=values.size).reshape(values.shape)
+    type_set = set(cell_types.ravel())
+    is_datetime = np.isin(cell_types, [t for t in type_set if issubclass(t, datetime)])
+    is_str = cell_types == str
+    raw_flags = np.zeros(len(text_uniques), dtype=bool)
+    raw_flags[is_text] = [parsable[u] or u in _NAT_STRINGS for u in raw_texts]
+    cell_is_date = is_datetime | (is_str & raw_flags[text_codes].reshape(values.shape))
+
+    return text_is_date, cell_is_date
+
+# 날짜 판정 결과에서 날짜 셀이 가장 많은 열을 고르는 함수
+def _best_date_col(text_is_date: np.ndarray) -> int:
+    date_counts = text_is_date.sum(axis=0)
+    best_col = int(np.argmax(date_counts))
 
     if date_counts[best_col] == 0:
         raise ValueError("No date column found")
 
     return best_col
 
+# 날짜 판정 결과에서 날짜가 min_date_count개 이상인 첫 번째 행을 고르는 함수
+def _first_date_row(cell_is_date: np.ndarray, date_start_col: int, min_date_count: int) -> int:
+    row_counts = cell_is_date[:, date_start_col:].sum(axis=1)
+    hits = np.flatnonzero(row_counts >= min_date_count)
+    if len(hits) == 0:
+        raise ValueError("No date row found")
+    return int(hits[0])
+
+# 날짜 형식이 가장 많이 들어있는 열의 인덱스를 찾는 함수
+def find_date_start_col(df: pd.DataFrame, sample_row_count: int = 10) -> int:
+    text_is_date, _ = _classify_date_cells(df, sample_row_count)
+    return _best_date_col(text_is_date)
+
 # 날짜가 포함된 첫 번째 행의 인덱스를 찾는 함수
 def find_date_row(df: pd.DataFrame, date_start_col: Optional[int] = None,
                   min_date_count: int = 1, max_row_check: int = 20) -> int:
+    return detect_date_header(df, date_start_col=date_start_col, min_date_count=min_date_count,
+                              max_row_check=max_row_check)[0]
+
+# 날짜 행과 날짜 시작 열을 함께 찾는 함수 (헤더 영역을 한 번만 판정)
+def detect_date_header(df: pd.DataFrame, date_start_col: Optional[int] = None, sample_row_count: int = 10,
+                       min_date_count: int = 1, max_row_check: int = 20) -> Tuple[int, int]:
+    n_rows = max_row_check if date_start_col is not None else max(sample_row_count, max_row_check)
+    text_is_date, cell_is_date = _classify_date_cells(df, n_rows)
     if date_start_col is None:
-        date_start_col = find_date_start_col(df)
-
-    def is_date(x: Union[str, datetime, pd.Timestamp]) -> bool:
-        if isinstance(x, (pd.Timestamp, datetime)):
-            return True
-        if isinstance(x, str):
-            try:
-                pd.to_datetime(x)
-                return True
-            except:
-                return False
-        return False
-
-    for i in range(min(max_row_check, len(df))):
-        row = df.iloc[i, date_start_col:]
-        if row.apply(is_date).sum() >= min_date_count:
-            return i
-
-    raise ValueError("No date row found")
+        date_start_col = _best_date_col(text_is_date[:sample_row_count])
+    date_row_index = _first_date_row(cell_is_date[:max_row_check], date_start_col, min_date_count)
+    return date_row_index, date_start_col
 
 # 날짜가 들어 있는 셀들의 열 인덱스를 실제 날짜 값과 매핑하는 함수
 def get_date_mapping(df: pd.DataFrame, date_row_index: int,
@@ -79,142 +141,550 @@ def get_date_mapping(df: pd.DataFrame, date_row_index: int,
 
     return mapping
 
+# 날짜 매핑을 선택 기간(start_date ~ end_date)의 열로 제한하는 함수
+def restrict_date_mapping(date_mapping: Dict[int, pd.Timestamp], start_date=None,
+                          end_date=None) -> Dict[int, pd.Timestamp]:
+    if not (start_date and end_date):
+        return dict(date_mapping)
+    start_ts, end_ts = pd.to_datetime(start_date), pd.to_datetime(end_date)
+    return {col: date for col, date in date_mapping.items() if start_ts <= date <= end_ts}
+
+# pd.read_excel에서 결측치로 처리되는 문자열 (pandas 기본 na_values)
+# '#DIV/0!' 등 엑셀 오류 값은 pd.read_excel과 같이 문자열로 남겨 측정값 NaN 행으로 유지
+_NA_STRINGS = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+])
+
+MEASUREMENT_COLUMNS = [
+    '1차 업체명', '지역명', '2차업체명', '모델명', '측정자', '측정장비', '부품명',
+    'CTQ/P 관리항목명', '측정일자', '측정값', 'Part No'
+]
+
+
+# openpyxl 셀 값을 pd.read_excel과 동일한 기준으로 결측치 처리하는 함수
+def _clean_cell(value):
+    if isinstance(value, str) and value in _NA_STRINGS:
+        return None
+    return value
+
+
+_NUMERIC_TYPES = (float, int, np.floating, np.integer)
+
+
+# 측정값 배열을 float 배열로 변환하는 함수 (기존 float(str(x).strip()) 처리와 동일한 결과)
+def _coerce_measurements(raw_values: np.ndarray) -> np.ndarray:
+    cell_types = np.fromiter(map(type, raw_values), dtype=object, count=len(raw_values))
+    is_str = cell_types == str
+    is_number = np.isin(cell_types, [t for t in set(cell_types) if issubclass(t, _NUMERIC_TYPES) and t is not bool])
+
+    values = np.full(len(raw_values), np.nan)
+    values[is_number] = raw_values[is_number].astype(float)
+    if is_str.any():
+        cleaned = pd.Series(raw_values[is_str], dtype=object).str.strip().str.replace("\xa0", "", regex=False)
+        values[is_str] = pd.to_numeric(cleaned, errors='coerce').astype(float).to_numpy()
+    return values
+
+
+# 각 행에 CTQ 명을 forward-fill 방식으로 할당하는 함수
+# (POINT 행부터 다음 POINT 행 직전까지, 마지막 블록은 last_end 직전까지)
+def _assign_block_rows(point_indices: List[Tuple[int, str]], last_end: int) -> Tuple[np.ndarray, np.ndarray]:
+    starts = np.array([start for start, _ in point_indices])
+    ends = np.append(starts[1:], last_end)
+    row_idx = np.concatenate([np.arange(s, e) for s, e in zip(starts, ends)])
+    ctq_per_row = np.repeat(np.array([str(name).strip() for _, name in point_indices], dtype=object), ends - starts)
+    return row_idx, ctq_per_row
+
+
+# 날짜 영역 블록(행 x 날짜열)을 long-form 측정 데이터로 펼치는 함수
+def _build_measurement_frame(
+        info_dict: Dict[str, str],
+        block: np.ndarray,
+        ctq_per_row: np.ndarray,
+        dates: List[pd.Timestamp]
+) -> pd.DataFrame:
+    # 행 우선 순서로 펼친다 (기존 행/열 반복 순서와 동일)
+    raw_values = block.ravel()
+    valid = ~pd.isna(raw_values)
+
+    ctq_long = np.repeat(ctq_per_row, len(dates))[valid]
+    date_long = np.tile(np.array(dates, dtype=object), block.shape[0])[valid]
+
+    # 숫자 셀은 그대로 float로, 문자열 셀만 공백 및 특수공백 제거 후 한 번에 숫자 변환 (변환 불가한 경우 NaN 처리)
+    raw_values = raw_values[valid]
+    if len(raw_values) == 0:
+        return pd.DataFrame()
+    values = _coerce_measurements(raw_values)
+
+    n_rows = len(values)
+    results = {
+        '1차 업체명': str(info_dict.get("1차 업체명", "")).strip(),
+        '지역명': str(info_dict.get("지역명", "")).strip(),
+        '2차업체명': str(info_dict.get("2차업체명", "")).strip(),
+        '모델명': str(info_dict.get("모델명", "")).strip(),
+        '측정자': str(info_dict.get("측정자", "")).strip(),
+        '측정장비': str(info_dict.get("측정장비", "")).strip(),
+        '부품명': str(info_dict.get("부품명", "")).strip(),
+        'CTQ/P 관리항목명': ctq_long,
+        '측정일자': date_long,
+        '측정값': values if not np.isnan(values).all() else np.full(n_rows, None, dtype=object),
+        'Part No': str(info_dict.get("Part No", "")).strip()
+    }
+
+    return pd.DataFrame(results, index=pd.RangeIndex(n_rows))
+
+
+# POINT 블록 위치를 찾아 측정 행 번호와 행별 CTQ 명을 반환하는 함수
+# block_end_col: 마지막 POINT 블록의 끝(값이 없는 행)을 판정할 시작 열 (시트 전체의 첫 날짜 열)
+def locate_point_blocks(
+        df: pd.DataFrame,
+        date_row_index: int,
+        block_end_col: int,
+        search_cols: List[int] = list(range(0, 11))
+) -> Tuple[np.ndarray, np.ndarray]:
+    search_cols = [col for col in search_cols if col < df.shape[1]]
+
+    # POINT 표시가 있는 행 찾기 (행마다 search_cols 순서상 첫 번째 POINT 셀만 사용)
+    point_indices = []
+    if search_cols and date_row_index < len(df):
+        search_block = df.iloc[date_row_index:, search_cols]
+        is_point = np.column_stack([
+            search_block.iloc[:, k].astype(str).str.strip().str.upper().str.contains("POINT", regex=False).to_numpy()
+            for k in range(len(search_cols))
+        ])
+        point_rows = np.flatnonzero(is_point.any(axis=1))
+        first_hits = is_point[point_rows].argmax(axis=1)
+
+        for row_offset, hit in zip(point_rows, first_hits):
+            i = date_row_index + int(row_offset)
+            ctq_col = search_cols[hit] + 1
+            if ctq_col < df.shape[1]:
+                # 4/3일 Master 파일의 공정ctq/ctp 관리 항목명에 -을 공백으로 변경.
+                # Data 관리하는 시트에서 CTQ 명에 -을 없애라고 공지를 했으나, 없애지 않은 경우 대비하여
+                # - 있는 경우 공백으로 변경하도록 함.
+                ctq_name = df.iloc[i, ctq_col].replace('-', ' ').strip()
+                if pd.notna(ctq_name):
+                    point_indices.append((i, ctq_name))
+
+    if not point_indices:
+        return np.array([], dtype=int), np.array([], dtype=object)
+
+    # 마지막 POINT 블록은 날짜 영역에 값이 하나도 없는 행이 나올 때까지 이어진다.
+    last_start = point_indices[-1][0]
+    has_value = df.iloc[last_start + 1:, block_end_col:].notna().any(axis=1).to_numpy()
+    empty_rows = np.flatnonzero(~has_value)
+    last_end = last_start + 1 + (int(empty_rows[0]) if len(empty_rows) else len(has_value))
+
+    return _assign_block_rows(point_indices, last_end)
+
 # 측정 데이터를 추출하는 함수
+# 셀 단위 반복 대신 날짜 영역을 하나의 배열로 잘라내어 long-form으로 펼친 뒤 한 번에 숫자 변환한다.
 def extract_measurement_data(
         df: pd.DataFrame,
         info_dict: Dict[str, str],
         date_mapping: Dict[int, pd.Timestamp],
         date_row_index: int,
-        search_cols: List[int] = list(range(0, 11))
+        search_cols: List[int] = list(range(0, 11)),
+        block_end_col: Optional[int] = None
 ) -> pd.DataFrame:
-    results = []
-    search_cols = [col for col in search_cols if col < df.shape[1]]
-
+    """
+    block_end_col: 마지막 POINT 블록의 끝(값이 없는 행)을 판정할 시작 열.
+        date_mapping을 선택 기간으로 제한해서 넘기는 경우 시트 전체의 첫 날짜 열을 넘겨야 기존과 같은 블록이 된다.
+        None이면 min(date_mapping)을 사용.
+    """
+    # POINT 블록이 있을 때만 날짜 열이 필요하므로 (기존 동작과 동일하게) 지연 계산
+    if block_end_col is None and date_mapping:
+        block_end_col = min(date_mapping.keys())
+    row_idx, ctq_per_row = locate_point_blocks(df, date_row_index, block_end_col, search_cols)
+
+    date_cols = [col for col in date_mapping if col < df.shape[1]]
+    if len(row_idx) == 0 or not date_cols:
+        return pd.DataFrame()
+
+    block = df.iloc[row_idx, date_cols].to_numpy(dtype=object)
+    return _build_measurement_frame(info_dict, block, ctq_per_row, [date_mapping[col] for col in date_cols])
+
+# 스트리밍 방식으로 측정 데이터를 추출하는 함수 (openpyxl read_only)
+# 시트 전체를 DataFrame으로 읽지 않고, 헤더 영역(header_rows)만 읽어 날짜 행/열을 찾은 뒤
+# 나머지 행은 한 줄씩 읽으면서 POINT 블록 정보와 선택 기간의 날짜 열 값만 보관한다.
+def extract_measurement_data_streaming(
+        input_file,
+        sheet_name: str,
+        info_dict: Dict[str, str],
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        search_cols: List[int] = list(range(0, 11)),
+        header_rows: int = 20,
+        progress: Optional[ProgressCallback] = None,
+        engine: Optional[str] = None
+) -> pd.DataFrame:
+    data = _read_file_bytes(input_file)
+
+    # 날짜 행/열 탐지는 기존 함수를 그대로 사용 (pd.read_excel과 동일한 셀 변환)
+    with stage("read_excel_header") as rec:
+        header_df = read_excel_sheet(data, sheet_name, engine, header=None, nrows=header_rows)
+        rec.set(rows_out=len(header_df))
+    with stage("find_date_row"):
+        date_row_idx, date_start_col = detect_date_header(header_df, max_row_check=header_rows)
+        date_map = get_date_mapping(header_df, date_row_idx, date_start_col)
+
+    # 선택 기간에 해당하는 날짜 열만 값을 보관
+    window_cols = list(restrict_date_mapping(date_map, start_date, end_date))
+    min_date_col = min(date_map) if date_map else None
+
+    label_cols = sorted({col for col in search_cols} | {col + 1 for col in search_cols})
+    label_rows, window_rows, has_value = [], [], []
+    width = 0
+
+    _report(progress, "stream_rows", 0.15)
+    with stage("stream_rows") as rec:
+        estimated_rows, rows = iter_sheet_rows(data, sheet_name, date_row_idx + 1, engine)
+        for k, row in enumerate(rows):
+            if k % 200 == 0:
+                _report(progress, "stream_rows", 0.15 + 0.6 * min(k / estimated_rows, 1.0))
+            n = len(row)
+            width = max(width, n)
+            label_rows.append([_clean_cell(row[col]) if col < n else None for col in label_cols])
+            window_rows.append([_clean_cell(row[col]) if col < n else None for col in window_cols])
+            has_value.append(
+                min_date_col is not None and
+                any(_clean_cell(v) is not None for v in row[min_date_col:])
+            )
+        rec.set(rows_out=len(window_rows), date_columns=len(window_cols))
+
+    # POINT 표시가 있는 행 찾기 (행마다 search_cols 순서상 첫 번째 POINT 셀만 사용)
+    label_pos = {col: k for k, col in enumerate(label_cols)}
+    search_cols = [col for col in search_cols if col < width]
     point_indices = []
-    for i in range(date_row_index, len(df)):
+    for offset, labels in enumerate(label_rows):
         for col in search_cols:
-            if col >= df.shape[1]:
-                continue
-            cell_value = df.iloc[i, col]
-            if "POINT" in str(cell_value).strip().upper():
-                ctq_col = col + 1
-                if ctq_col < df.shape[1]:
-                    # 4/3일 Master 파일의 공정ctq/ctp 관리 항목명에 -을 공백으로 변경.
-                    # Data 관리하는 시트에서 CTQ 명에 -을 없애라고 공지를 했으나, 없애지 않은 경우 대비하여
-                    # - 있는 경우 공백으로 변경하도록 함.
-                    ctq_name = df.iloc[i, ctq_col].replace('-', ' ').strip()
+            cell_value = labels[label_pos[col]]
+            if isinstance(cell_value, str) and "POINT" in cell_value.strip().upper():
+                if col + 1 < width:
+                    # Data 시트의 CTQ 명에 - 가 있는 경우 공백으로 변경 (extract_measurement_data와 동일)
+                    ctq_name = labels[label_pos[col + 1]].replace('-', ' ').strip()
                     if pd.notna(ctq_name):
-                        point_indices.append((i, ctq_name))
+                        point_indices.append((offset, ctq_name))
                 break
 
-    for idx, (start_idx, ctq_name) in enumerate(point_indices):
-        if idx + 1 < len(point_indices):
-            end_idx = point_indices[idx + 1][0]
-        else:
-            end_idx = start_idx + 1
-            while end_idx < len(df):
-                if df.iloc[end_idx, min(date_mapping.keys()):].notna().sum() > 0:
-                    end_idx += 1
-                else:
-                    break
-
-        for i in range(start_idx, end_idx):
-            for col in date_mapping:
-                if col < df.shape[1] and i < df.shape[0]:
-                    raw_value = df.iloc[i, col]
-                    if pd.notna(raw_value):
-                        value = str(raw_value).strip().replace("\xa0", "")  # 공백 및 특수공백 제거
-                        try:
-                            value = float(value)
-                        except ValueError:
-                            value = None  # 숫자로 변환 불가한 경우 None 처리
-
-                        results.append({
-                            '1차 업체명': str(info_dict.get("1차 업체명", "")).strip(),
-                            '지역명': str(info_dict.get("지역명", "")).strip(),
-                            '2차업체명': str(info_dict.get("2차업체명", "")).strip(),
-                            '모델명': str(info_dict.get("모델명", "")).strip(),
-                            '측정자': str(info_dict.get("측정자", "")).strip(),
-                            '측정장비': str(info_dict.get("측정장비", "")).strip(),
-                            '부품명': str(info_dict.get("부품명", "")).strip(),
-                            'CTQ/P 관리항목명': str(ctq_name).strip(),
-                            '측정일자': date_mapping[col],
-                            '측정값': value,
-                            'Part No': str(info_dict.get("Part No", "")).strip()
-                        })
-
-    return pd.DataFrame(results)
+    if not point_indices or not window_cols:
+        return pd.DataFrame(columns=MEASUREMENT_COLUMNS)
 
-# 관리번호를 매핑하는 함수
-def add_management_code(results_df: pd.DataFrame, master_key_df: pd.DataFrame) -> pd.DataFrame:
-    merge_keys = ["1차 업체명", "지역명", "2차업체명", "부품명", "CTQ/P 관리항목명", "모델명", "Part No"]
+    # 마지막 POINT 블록은 날짜 영역에 값이 하나도 없는 행이 나올 때까지 이어진다.
+    last_start = point_indices[-1][0]
+    empty_rows = np.flatnonzero(~np.array(has_value[last_start + 1:], dtype=bool))
+    last_end = last_start + 1 + int(empty_rows[0]) if len(empty_rows) else len(has_value)
 
-    master_key_df_renamed = master_key_df.rename(columns={
-        "부품": "부품명",
-        "공정CTQ/CTP 관리 항목명": "CTQ/P 관리항목명",
-        "2차 업체명": "2차업체명"
-    })
+    _report(progress, f"extract_measurement_data ({len(point_indices)} POINT blocks)", 0.78)
+    with stage("extract_measurement_data", rows_in=len(window_rows)) as rec:
+        row_idx, ctq_per_row = _assign_block_rows(point_indices, last_end)
+        block = np.empty((len(row_idx), len(window_cols)), dtype=object)
+        for k, offset in enumerate(row_idx):
+            block[k, :] = window_rows[offset]
 
-    master_key_df_renamed = master_key_df_renamed.loc[:, merge_keys + ["관리번호"]]
+        df_result = _build_measurement_frame(info_dict, block, ctq_per_row, [date_map[col] for col in window_cols])
+        rec.set(rows_out=len(df_result), point_blocks=len(point_indices))
+    return df_result if not df_result.empty else pd.DataFrame(columns=MEASUREMENT_COLUMNS)
 
-    for key in merge_keys:
-        results_df[key] = results_df[key].astype(str).str.strip()
-        master_key_df_renamed[key] = master_key_df_renamed[key].astype(str).str.strip()
+# 관리번호를 매핑하는 함수
+# Master 전체와 merge하지 않고, 컴파일된 MasterIndex의 해시 인덱스로 측정 데이터의 고유 키 조합만 조회한다.
+# (결과는 기존 pd.merge(how='left')와 동일: 키 컬럼 정규화, Master 중복 키는 행 반복, 관리번호는 첫 번째 열)
+def add_management_code(results_df: pd.DataFrame, master_key_df: Union[pd.DataFrame, MasterIndex]) -> pd.DataFrame:
+    master_index = master_key_df if isinstance(master_key_df, MasterIndex) else MasterIndex(master_key_df)
 
-    merged_df = pd.merge(results_df, master_key_df_renamed, on=merge_keys, how='left')
+    normalize_keys(results_df)
+    row_take, master_pos = master_index.lookup(results_df)
 
-    # 관리번호를 첫 번째 열로 이동
-    if "관리번호" in merged_df.columns:
-        cols = merged_df.columns.tolist()
-        cols.remove("관리번호")
-        merged_df = merged_df[["관리번호"] + cols]
+    if len(row_take) == len(results_df):
+        merged_df = results_df.reset_index(drop=True)
+    else:
+        merged_df = results_df.iloc[row_take].reset_index(drop=True)
+
+    # 관리번호를 첫 번째 열로 추가
+    merged_df.insert(0, "관리번호", master_index.code_values(master_pos))
 
     return merged_df
 
+# 증분 변환 함수
+# 같은 파일(Information 값/search_cols/Master 동일)을 이전에 변환한 적이 있고 POINT 블록 구조가 같으면
+# 날짜 열별 내용 해시를 비교해 새로 추가되거나 값이 바뀐 날짜 열만 추출하고, 나머지는 이전 결과를 재사용한다.
+# 제한: 어떤 열이 바뀌었는지는 모든 날짜 열의 셀 값을 읽어 해시해야 알 수 있으므로 Data 시트는 항상 전체를 읽는다
+# (스트리밍 reader로 읽어도 시트 XML 전체를 파싱하는 것은 같음). 절약되는 것은 재사용한 날짜 열의
+# 숫자 변환 / long-form 변환 / 관리번호 매핑이며, 시트 읽기 시간은 전체 변환과 같다.
+def extract_measurement_data_incremental(
+        df: pd.DataFrame,
+        info_dict: Dict[str, str],
+        date_mapping: Dict[int, pd.Timestamp],
+        date_row_index: int,
+        master_index: MasterIndex,
+        search_cols: List[int] = list(range(0, 11))
+) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """
+    Returns:
+        (관리번호가 매핑된 전체 기간 측정 데이터, {'reused_dates': 재사용한 날짜 수, 'extracted_dates': 새로 추출한 날짜 수})
+    """
+    date_cols = [col for col in date_mapping if col < df.shape[1]]
+    block_end_col = min(date_mapping) if date_mapping else None
+    row_idx, ctq_per_row = locate_point_blocks(df, date_row_index, block_end_col, search_cols)
+
+    block = df.iloc[row_idx, date_cols].to_numpy(dtype=object)
+    date_hashes: Dict[pd.Timestamp, Tuple[int, ...]] = {}
+    for col, col_hash in zip(date_cols, column_hashes(block)):
+        date_hashes[date_mapping[col]] = date_hashes.get(date_mapping[col], ()) + (int(col_hash),)
+
+    identity = workbook_identity(info_dict, search_cols, master_index.source_hash or "")
+    layout = layout_hash(row_idx, ctq_per_row)
+    state = ingest_store.load(identity)
+
+    previous = None
+    changed = set(date_hashes)
+    if state is not None and state['layout'] == layout:
+        changed = {date for date, h in date_hashes.items() if state['columns'].get(date) != h}
+        unchanged = [date for date in date_hashes if date not in changed]
+        previous = state['data'][state['data']['측정일자'].isin(unchanged)]
+
+    new_pos = [k for k, col in enumerate(date_cols) if date_mapping[col] in changed]
+    new_part = pd.DataFrame()
+    if new_pos and len(row_idx):
+        new_part = _build_measurement_frame(info_dict, block[:, new_pos], ctq_per_row,
+                                            [date_mapping[date_cols[k]] for k in new_pos])
+        if not new_part.empty:
+            new_part = add_management_code(new_part, master_index)
+
+    parts = [part for part in (previous, new_part) if part is not None and not part.empty]
+    df_result = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=["관리번호"] + MEASUREMENT_COLUMNS)
+
+    if state is None or changed or state['layout'] != layout or len(state['columns']) != len(date_hashes):
+        ingest_store.save(identity, {'layout': layout, 'columns': date_hashes, 'data': df_result})
+
+    return df_result, {'reused_dates': len(date_hashes) - len(changed), 'extracted_dates': len(changed)}
+
+# 측정 행마다 반복되는 문자열 컬럼 (category dtype으로 저장)
+CATEGORY_COLUMNS = [
+    '1차 업체명', '지역명', '2차업체명', '모델명', '측정자', '측정장비', '부품명',
+    'CTQ/P 관리항목명', 'Part No'
+]
+
+# 변환 결과의 반복 문자열 컬럼을 category로, 측정값을 float(NaN)로 변환하는 함수
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    if '측정값' in df.columns:
+        df['측정값'] = pd.to_numeric(df['측정값'], errors='coerce').astype(float)
+    return df
+
+# 변환 결과의 메모리 사용량 비교 (category 컬럼을 기존 문자열 컬럼으로 되돌린 경우 vs 현재)
+def memory_report(df: pd.DataFrame) -> pd.DataFrame:
+    expanded = df.astype({col: str for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)})
+
+    report = pd.DataFrame({
+        'dtype': df.dtypes.astype(str),
+        'before_MB': expanded.memory_usage(index=False, deep=True) / (1024 * 1024),
+        'after_MB': df.memory_usage(index=False, deep=True) / (1024 * 1024)
+    })
+    report.loc['Total'] = ['', report['before_MB'].sum(), report['after_MB'].sum()]
+    return report.round(3)
+
+# 업로드 파일 객체 또는 경로에서 바이트 데이터를 읽는 함수
+def _read_file_bytes(file) -> bytes:
+    if isinstance(file, (bytes, bytearray)):
+        return bytes(file)
+    if hasattr(file, "getvalue"):
+        return file.getvalue()
+    if hasattr(file, "read"):
+        file.seek(0)
+        data = file.read()
+        file.seek(0)
+        return data
+    with open(file, "rb") as f:
+        return f.read()
+
+# 변환 결과 캐시 키 생성 함수
+def _make_cache_key(input_hash: str, master_hash: str, start_date, end_date,
+                    search_cols: List[int]) -> Tuple:
+    start_key = str(pd.to_datetime(start_date)) if start_date else None
+    end_key = str(pd.to_datetime(end_date)) if end_date else None
+    return input_hash, master_hash, start_key, end_key, tuple(search_cols)
+
+# 변환 결과 캐시 상태 조회 / 초기화
+def get_transform_cache_stats() -> Dict[str, Union[int, float]]:
+    return _transform_cache.stats()
+
+def clear_transform_cache() -> None:
+    _transform_cache.clear()
+
+# 캐시된 변환 결과 조회 (변환하지 않음, 없으면 None) - (정리된 master_df, 변환 결과) 원본이므로 복사해서 사용
+def get_cached_transform(cache_key: Tuple) -> Optional[Tuple[pd.DataFrame, pd.DataFrame]]:
+    return _transform_cache.get(cache_key)
+
+# 엑셀 측정 파일(Information / Data 시트)에서 측정 데이터를 추출하는 함수
+# (incremental이면 관리번호까지 매핑된 결과를 반환)
+def _extract_from_workbook(
+        input_bytes: bytes,
+        master_future: "Future[MasterIndex]",
+        start_date: Optional[str],
+        end_date: Optional[str],
+        search_cols: List[int],
+        reader: str,
+        incremental: bool,
+        progress: Optional[ProgressCallback],
+        engine: Optional[str]
+) -> pd.DataFrame:
+    engine = select_engine(input_bytes, engine)
+    _report(progress, "read_information", 0.05)
+    with stage("read_information", engine=engine):
+        info_df = read_excel_sheet(input_bytes, "Information", engine)
+        info_dict = info_df.set_index("Contents")['Value'].to_dict()
+
+    # 행 단위 읽기를 지원하지 않는 엔진(xlrd)은 시트 전체를 읽는 방식으로 처리
+    if reader == "streaming" and not incremental and engine in STREAMING_ENGINES:
+        df_result = extract_measurement_data_streaming(
+            input_bytes, info_dict["Data_sheet"], info_dict, start_date, end_date, search_cols,
+            progress=progress, engine=engine
+        )
+    else:
+        _report(progress, "read_excel", 0.1)
+        with stage("read_excel", engine=engine) as rec:
+            original_df = read_excel_sheet(input_bytes, info_dict["Data_sheet"], engine, header=None)
+            rec.set(rows_out=len(original_df), columns=original_df.shape[1])
+        _report(progress, "find_date_row", 0.6)
+        with stage("find_date_row"):
+            date_row_idx, date_start_col = detect_date_header(original_df)
+            date_map = get_date_mapping(original_df, date_row_idx, date_start_col)
+
+        if incremental:
+            # 날짜 열별 해시를 비교해야 하므로 시트 전체를 사용한다 (기간 필터는 아래에서 적용)
+            # - 시트 읽기 비용은 줄지 않고, 재사용한 날짜 열의 추출 / 관리번호 매핑만 생략된다
+            _report(progress, "extract_measurement_data", 0.7)
+            with stage("extract_measurement_data_incremental", rows_in=len(original_df)) as rec:
+                df_result, reuse_info = extract_measurement_data_incremental(
+                    original_df, info_dict, date_map, date_row_idx, master_future.result(), search_cols
+                )
+                rec.set(rows_out=len(df_result), **reuse_info)
+        else:
+            # 선택 기간 밖의 날짜 열은 추출(숫자 변환, long-form 변환) 대상에서 제외
+            window_map = restrict_date_mapping(date_map, start_date, end_date)
+            _report(progress, "extract_measurement_data", 0.7)
+            with stage("extract_measurement_data", rows_in=len(original_df)) as rec:
+                if window_map:
+                    df_result = extract_measurement_data(original_df, info_dict, window_map, date_row_idx, search_cols,
+                                                         block_end_col=min(date_map))
+                else:
+                    df_result = pd.DataFrame(columns=MEASUREMENT_COLUMNS)
+                rec.set(rows_out=len(df_result), date_columns=len(window_map))
+
+    return df_result
+
+# 실제 변환 작업 (엑셀 / long-form 파일 읽기 ~ 정렬)
+def _run_transform(
+        input_bytes: bytes,
+        master_future: "Future[MasterIndex]",
+        start_date: Optional[str],
+        end_date: Optional[str],
+        search_cols: List[int],
+        reader: str,
+        incremental: bool = False,
+        progress: Optional[ProgressCallback] = None,
+        engine: Optional[str] = None
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+
+    # 장비 출력 long-form 파일(CSV/Parquet)은 엑셀 양식 해석 없이 바로 읽음
+    input_format = detect_input_format(input_bytes)
+    if input_format in LONG_FORM_FORMATS:
+        _report(progress, "read_long_form", 0.1)
+        with stage("read_long_form", format=input_format) as rec:
+            df_result = read_long_form(input_bytes, MEASUREMENT_COLUMNS, input_format, start_date, end_date)
+            rec.set(rows_out=len(df_result))
+        incremental = False
+    else:
+        df_result = _extract_from_workbook(input_bytes, master_future, start_date, end_date, search_cols, reader,
+                                           incremental, progress, engine)
+
+    if not incremental:
+        _report(progress, "add_management_code", 0.85)
+        with stage("add_management_code", rows_in=len(df_result)) as rec:
+            df_result = add_management_code(df_result, master_future.result())
+            rec.set(rows_out=len(df_result))
+
+    _report(progress, "filter_sort", 0.92)
+    with stage("filter_sort", rows_in=len(df_result)) as rec:
+        if start_date and end_date:
+            start_date = pd.to_datetime(start_date)
+            end_date = pd.to_datetime(end_date)
+            df_result = df_result[
+                (df_result["측정일자"] >= start_date) &
+                (df_result["측정일자"] <= end_date)
+            ]
+
+        df_result_sorted = df_result.sort_values(by=["측정일자", "CTQ/P 관리항목명"]).reset_index(drop=True)
+        df_result_sorted = compact_dtypes(df_result_sorted)
+        rec.set(rows_out=len(df_result_sorted))
+
+    return master_future.result().master_df, df_result_sorted
+
 # 전체 프로세스를 실행하는 함수, input, master 수정 필요, start, end 수정 필요
+# 동일한 파일 내용/기간/search_cols로 다시 호출되면 캐시된 결과의 복사본을 반환한다.
 def transform_data(
         input_file,
         master_file,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
-        search_cols: List[int] = list(range(0, 11))
-) -> pd.DataFrame:
-
-    info_df = pd.read_excel(input_file, sheet_name="Information", engine="openpyxl")
-    info_dict = info_df.set_index("Contents")['Value'].to_dict()
-
-    original_df = pd.read_excel(input_file, sheet_name=info_dict["Data_sheet"], header=None, engine="openpyxl")
-    master_df = pd.read_excel(master_file, sheet_name="Master", engine="openpyxl")
-
-    # 25.6.20 수정
-    # master file의 LSL, Target 값의 끝에 공백이 있어서 숫자형으로 아니고 object로 정의됨
-    # 그래서 특수공백 제거하고 숫자 변환 처리 추가함.
-    for col in ["USL", "LSL", "Target", "UCL", "LCL"]:
-        master_df[col] = (
-            master_df[col]
-            .astype(str)  # 우선 문자열로 변환
-            .str.replace(r"[^\d\.\-]", "", regex=True)  # 숫자, 소수점, 음수부호 외 제거
-            .replace("", np.nan)  # 빈 문자열은 np.nan으로 처리
-            .astype(float)  # 최종적으로 float 변환
-        )
-
-    st.session_state.master_data = master_df
-
-    date_row_idx = find_date_row(original_df)
-    date_map = get_date_mapping(original_df, date_row_idx)
-
-    df_result = extract_measurement_data(original_df, info_dict, date_map, date_row_idx, search_cols)
-    df_result = add_management_code(df_result, master_df)
-
-    if start_date and end_date:
-        start_date = pd.to_datetime(start_date)
-        end_date = pd.to_datetime(end_date)
-        df_result = df_result[
-            (df_result["측정일자"] >= start_date) &
-            (df_result["측정일자"] <= end_date)
-        ]
-
-    df_result_sorted = df_result.sort_values(by=["측정일자", "CTQ/P 관리항목명"]).reset_index(drop=True)
-    st.session_state.transformed_data = df_result_sorted
-
-    return df_result_sorted
\ No newline at end of file
+        search_cols: List[int] = list(range(0, 11)),
+        use_cache: bool = True,
+        reader: Optional[str] = None,
+        return_master: bool = False,
+        incremental: Optional[bool] = None,
+        progress: Optional[ProgressCallback] = None,
+        engine: Optional[str] = None
+) -> Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    Streamlit 세션에 의존하지 않으므로 CLI/배치 변환에서도 그대로 사용할 수 있다.
+    세션 저장(transformed_data, master_data)은 호출하는 페이지에서 처리한다.
+
+    input_file이 long-form CSV / Parquet(변환 결과와 같은 컬럼)이면 엑셀 양식 해석 없이 읽고
+    관리번호 매핑 / 기간 필터만 적용한다 (reader, incremental, engine은 사용하지 않음).
+    reader: Data 시트 읽기 방식
+        "streaming" - openpyxl read_only 스트리밍, 선택 기간의 날짜 열만 메모리에 보관 (기본값)
+        "dataframe" - 시트 전체를 pd.read_excel로 읽은 뒤 추출
+        None이면 DATA_TRANSFORM_CONFIG['data_sheet_reader'] 설정을 따른다.
+    return_master: True이면 (변환 결과, 정리된 master_df)를 함께 반환
+    incremental: True이면 같은 파일의 이전 변환 결과를 재사용하고 새로 추가/변경된 날짜 열만 변환
+        None이면 INCREMENTAL_CONFIG['enabled'] 설정을 따른다.
+        열별 변경 확인을 위해 Data 시트는 항상 전체를 읽으므로(pd.read_excel) 시트 읽기 시간은 줄지 않는다.
+        (streaming reader 설정은 사용하지 않음)
+    progress: 단계별 진행률 콜백 progress(단계명, 0~1). 콜백에서 예외를 올리면 변환을 중단한다.
+    engine: 엑셀 읽기 엔진 ('auto', 'calamine', 'openpyxl', 'xlrd')
+        None이면 DATA_TRANSFORM_CONFIG['excel_engine'] 설정을 따른다 (auto: 설치된 가장 빠른 엔진).
+    """
+    reader = reader or DATA_TRANSFORM_CONFIG['data_sheet_reader']
+    if incremental is None:
+        incremental = INCREMENTAL_CONFIG['enabled']
+
+    with stage("transform_data", reader=reader, incremental=incremental) as rec:
+        with stage("hash_inputs"):
+            input_bytes = _read_file_bytes(input_file)
+            master_bytes = _read_file_bytes(master_file)
+            master_hash = hash_bytes(master_bytes)
+            cache_key = _make_cache_key(hash_bytes(input_bytes), master_hash, start_date, end_date, search_cols)
+
+        cached = _transform_cache.get(cache_key) if use_cache else None
+        rec.set(cache_hit=cached is not None)
+        if cached is None:
+            # 정리된 Master와 매핑 인덱스는 Master 파일 해시 기준으로 모든 세션이 공유
+            # Master 시트는 측정 파일(Information/Data 시트)을 읽는 동안 다른 스레드에서 동시에 읽는다.
+            _report(progress, "master_index", 0.02)
+            master_future = _master_read_pool.submit(get_master_index, master_bytes, master_hash, engine)
+            cached = _run_transform(input_bytes, master_future, start_date, end_date, search_cols, reader, incremental,
+                                    progress, engine)
+            if use_cache:
+                _transform_cache.put(cache_key, cached)
+
+        # 세션에서 데이터가 수정될 수 있으므로 캐시 원본 대신 복사본을 저장
+        master_df, df_result_sorted = (df.copy() for df in cached)
+        rec.set(rows_out=len(df_result_sorted))
+    _report(progress, "done", 1.0)
+
+    if return_master:
+        return df_result_sorted, master_df
+    return df_result_sorted
@@ -1,70 +1,216 @@
+import hashlib
+from typing import Optional, Tuple
+
+import numpy as np
 import pandas as pd
 import streamlit as st
+from .profiler import profiled, stage
+from .master_index import SPEC_COLUMNS, SPEC_TABLE_COLUMNS, SpecIndex, get_spec_index
+from .limit_check import limit_status, status_labels, violation_counts, code_positions, SPEC_VIOLATION
+from .control_chart import imr_summary_by_group
+from .run_rules import NELSON_RULES
+from .capability_analysis import capability_report
+
+# 세션 데이터 이름 -> (저장된 DataFrame 객체, 버전)
+_DATA_VERSIONS_KEY = "_data_versions"
+# 마지막 스펙 검증 결과 (SpecVerification)
+_VERIFICATION_KEY = "_spec_verification"
+# transformed_data 버전별 측정된 관리번호 목록 (버전, 관리번호 배열)
+_MEASURED_CODES_KEY = "_measured_codes"
+# transformed_data 버전별 전체 관리번호 I-MR 요약 (버전, 요약 DataFrame)
+_IMR_OVERVIEW_KEY = "_imr_overview"
+# (transformed_data 버전, master_data 버전)별 전체 관리번호 공정능력 표
+_CAPABILITY_REPORT_KEY = "_capability_report"
+
+
+# DataFrame 내용 fingerprint (버전 없이 세션에 저장된 데이터의 버전으로 사용)
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    h = hashlib.sha256(repr((list(df.columns), df.shape)).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+# 세션에 DataFrame 저장 (버전을 함께 기록)
+def set_session_frame(name: str, df: pd.DataFrame, version: Optional[str] = None) -> None:
+    """
+    Args:
+        name (str): 세션 키 (transformed_data, master_data)
+        df (pd.DataFrame): 저장할 데이터
+        version (str, optional): 데이터 버전 (변환 작업 키, 파일 해시 등). 없으면 내용 fingerprint 사용
+    """
+    st.session_state[name] = df
+    versions = st.session_state.setdefault(_DATA_VERSIONS_KEY, {})
+    versions[name] = (df, version or frame_fingerprint(df))
+
+
+# 세션 데이터 버전 조회
+# set_session_frame으로 저장된 객체는 기록된 버전을 그대로 사용하고,
+# 다른 경로로 바뀐 객체는 내용 fingerprint를 한 번 계산해 기록한다.
+def get_data_version(name: str) -> Optional[str]:
+    df = st.session_state.get(name)
+    if df is None:
+        return None
+    versions = st.session_state.setdefault(_DATA_VERSIONS_KEY, {})
+    entry = versions.get(name)
+    if entry is None or entry[0] is not df:
+        entry = versions[name] = (df, frame_fingerprint(df))
+    return entry[1]
+
+# master_data의 관리번호별 스펙 인덱스 (Master 버전별로 한 번만 생성, 관리번호 조회는 dict 조회)
+def get_master_spec_index() -> Optional[SpecIndex]:
+    master_df = st.session_state.get("master_data")
+    if master_df is None or "관리번호" not in master_df.columns:
+        return None
+    return get_spec_index(master_df, get_data_version("master_data"))
+
+
+# transformed_data에 있는 관리번호 목록 (결측 제외, 등장 순서, 데이터 버전별로 한 번만 계산)
+def get_measured_codes() -> np.ndarray:
+    df = st.session_state.get("transformed_data")
+    if df is None or "관리번호" not in df.columns:
+        return np.array([], dtype=object)
+    version = get_data_version("transformed_data")
+    cached = st.session_state.get(_MEASURED_CODES_KEY)
+    if cached is None or cached[0] != version:
+        cached = st.session_state[_MEASURED_CODES_KEY] = (version, df["관리번호"].dropna().unique())
+    return cached[1]
+
+
+# 전체 관리번호 I-MR 관리 한계 요약 (transformed_data 버전별로 한 번만 계산)
+def get_imr_overview() -> pd.DataFrame:
+    df = st.session_state.get("transformed_data")
+    if df is None or df.empty:
+        return pd.DataFrame()
+    version = get_data_version("transformed_data")
+    cached = st.session_state.get(_IMR_OVERVIEW_KEY)
+    if cached is None or cached[0] != version:
+        cached = st.session_state[_IMR_OVERVIEW_KEY] = (version, imr_summary_by_group(df, rules=NELSON_RULES))
+    return cached[1]
+
+
+# 전체 관리번호 공정능력지수 표 (측정 데이터 / Master 버전이 바뀔 때만 다시 계산)
+def get_capability_report() -> pd.DataFrame:
+    df = st.session_state.get("transformed_data")
+    spec_index = get_master_spec_index()
+    if df is None or df.empty or spec_index is None:
+        return pd.DataFrame()
+    version = (get_data_version("transformed_data"), get_data_version("master_data"))
+    cached = st.session_state.get(_CAPABILITY_REPORT_KEY)
+    if cached is None or cached[0] != version:
+        cached = st.session_state[_CAPABILITY_REPORT_KEY] = (version, capability_report(df, spec_index))
+    return cached[1]
+
 
 # master_data에서 spec (USL,LSL, Target, UCL, LCL) 가져오기
 def get_spec_from_master():
     """
     세션에 저장된 transformed_data의 관리번호를 기준으로
     master_data에서 USL, LSL, Target, UCL, LCL을 추출.
+    (Master 버전별 스펙 인덱스와 데이터 버전별 관리번호 목록을 사용하므로 다시 호출해도 Master 전체를 검색하지 않음)
     """
     if "transformed_data" not in st.session_state or "master_data" not in st.session_state:
         st.warning("데이터가 세션에 없습니다.")
         return pd.DataFrame()
 
     transformed_df = st.session_state.transformed_data
-    master_df = st.session_state.master_data
+    spec_index = get_master_spec_index()
 
-    if "관리번호" not in transformed_df.columns or "관리번호" not in master_df.columns:
+    if "관리번호" not in transformed_df.columns or spec_index is None:
         st.error("관리번호 컬럼이 존재하지 않습니다.")
         return pd.DataFrame()
 
-    unique_ids = transformed_df["관리번호"].dropna().unique()
-    filtered_master = master_df[master_df["관리번호"].isin(unique_ids)]
-
-    required_columns = ['관리번호', '부품', '공정CTQ/CTP 관리 항목명', 'USL', 'LSL', 'Target', 'UCL', 'LCL']
-    available_columns = [col for col in required_columns if col in filtered_master.columns]
-    if len(available_columns) < len(required_columns):
+    if spec_index.missing_columns:
         st.warning("Master 파일에 일부 품질 관리 기준 컬럼이 누락되었습니다.")
 
-    result_df = filtered_master[available_columns].drop_duplicates()
-    return result_df
+    return spec_index.frame(get_measured_codes())
 
-def verify_data():
+class SpecVerification:
     """
-        spec_df와 transformed_data를 비교하여
-        USL/LSL 초과 데이터를 spev_over_data로 반환합니다.
+    스펙 검증 결과 (transformed_data / master_data 버전별로 세션에 1개 보관)
+
+    - version: (transformed_data 버전, master_data 버전)
+    - spec_index: Master 스펙 인덱스
+    - spec_pos: 측정 데이터 행별 스펙 행 위치 (-1은 스펙 없음)
+    - status: 행별 USL/LSL/UCL/LCL 위반 상태 코드 (modules.limit_check)
+    - mask: USL/LSL을 벗어난 행
+    - counts: 관리번호별 위반 건수
+    - spec_over_data: 벗어난 행 + 스펙 컬럼 + spec_over("NG") + limit_status
     """
-    spec_df = get_spec_from_master()
-    if spec_df.empty:
-        st.warning("스펙 데이타가 없습니다.")
-        return pd.DataFrame(), pd.DataFrame()
 
-    if "transformed_data" not in st.session_state:
+    def __init__(self, version: Tuple[str, str], df: pd.DataFrame, spec_index: SpecIndex):
+        self.version = version
+        self.spec_index = spec_index
+        row_codes, uniques = pd.factorize(df["관리번호"])
+        self.spec_pos = code_positions(row_codes, uniques, spec_index.code_index)
+
+        values = pd.to_numeric(df["측정값"], errors="coerce").to_numpy(dtype=float)
+        self.status = limit_status(values, self.spec_pos, spec_index.limits)
+        self.mask = (self.status & SPEC_VIOLATION) != 0
+        self.counts = violation_counts(self.status, row_codes, uniques)
+        self.spec_over_data = self._with_specs(df, self.mask)
+
+    def _with_specs(self, df: pd.DataFrame, rows: Optional[np.ndarray] = None) -> pd.DataFrame:
+        if rows is None:
+            result, positions, status = df.copy(), self.spec_pos, self.status
+        else:
+            result, positions, status = df[rows].copy(), self.spec_pos[rows], self.status[rows]
+        for col in SPEC_COLUMNS:
+            values = self.spec_index.column_values(col, positions)
+            if values is not None:
+                result[col] = values
+        result["spec_over"] = np.where((status & SPEC_VIOLATION) != 0, "NG", "")
+        result["limit_status"] = status_labels(status)
+        return result
+
+    def merged(self, df: pd.DataFrame) -> pd.DataFrame:
+        """전체 측정 데이터 + 스펙 컬럼 + spec_over / limit_status (다운로드 시에만 생성)"""
+        return self._with_specs(df)
+
+
+# 스펙 검증 결과를 가져오는 함수
+# 데이터 / Master 버전이 마지막 검증과 같으면 다시 계산하지 않는다.
+def get_spec_verification() -> Optional[SpecVerification]:
+    if st.session_state.get("transformed_data") is None or st.session_state.get("master_data") is None:
         st.warning("변환된 데이터가 없습니다.")
-        return pd.DataFrame(), pd.DataFrame()
-
-    df = st.session_state.transformed_data.copy()
+        return None
 
+    df = st.session_state.transformed_data
     if "관리번호" not in df.columns or "측정값" not in df.columns:
         st.error("transformed_data에 '관리번호' 또는 '측정값' 컬럼이 없습니다.")
-        return pd.DataFrame(), pd.DataFrame()
-
-    # 스펙과 transformed_data 병합
-    merged_df = pd.merge(df, spec_df, on="관리번호", how="left")
-
-    # USL, LSL 벗어난 값 찾기
-    over_condition = (
-            (merged_df["USL"].notnull() & (merged_df["측정값"] > merged_df["USL"])) |
-            (merged_df["LSL"].notnull() & (merged_df["측정값"] < merged_df["LSL"]))
-    )
-
-    # 원본 데이터에 spec_over 추가 벗어난 경우 NG 표기.
-    merged_df["spec_over"] =""
-    merged_df.loc[over_condition, 'spec_over'] = "NG"
-    merged_df = merged_df.drop(columns=merged_df.columns[[12,13]])
+        return None
+
+    version = (get_data_version("transformed_data"), get_data_version("master_data"))
+    cached = st.session_state.get(_VERIFICATION_KEY)
+    if cached is not None and cached.version == version:
+        return cached
+
+    with stage("spec_verification", rows_in=len(df)) as rec:
+        spec_df = get_spec_from_master()
+        if spec_df.empty:
+            st.warning("스펙 데이타가 없습니다.")
+            return None
+        verification = SpecVerification(version, df, get_master_spec_index())
+        rec.set(rows_out=len(verification.spec_over_data))
+    st.session_state[_VERIFICATION_KEY] = verification
+    return verification
+
+@profiled()
+def verify_data(with_merged: bool = True):
+    """
+        spec_df와 transformed_data를 비교하여
+        USL/LSL 초과 데이터를 spev_over_data로 반환합니다.
+        (검증 결과는 데이터 / Master 버전별로 캐시되며, 버전이 바뀔 때만 다시 계산)
 
-    spec_over_data = merged_df[over_condition].copy()
+        Args:
+            with_merged (bool): 전체 데이터에 스펙 / spec_over 컬럼을 붙인 merged_df도 만들지 여부
+                (False이면 merged_df 대신 None 반환)
+    """
+    verification = get_spec_verification()
+    if verification is None:
+        return pd.DataFrame(), pd.DataFrame()
 
+    spec_over_data = verification.spec_over_data.copy()
+    merged_df = verification.merged(st.session_state.transformed_data) if with_merged else None
     return spec_over_data, merged_df
 
 def get_spec_for_measured_ctq():
@@ -78,19 +224,10 @@ def get_spec_for_measured_ctq():
         st.session_state.spec_df_filtered = pd.DataFrame()
         return pd.DataFrame()
 
-    df = st.session_state.transformed_data
-    if "관리번호" not in df.columns:
-        st.error("transformed_data에 '관리번호' 컬럼이 없습니다.")
-        st.session_state.spec_for_measured_ctq = pd.DataFrame()
-        return pd.DataFrame()
-
-    used_ids = df["관리번호"].dropna().unique()
-    filtered_spec = spec_df[spec_df["관리번호"].isin(used_ids)].copy()
+    # get_spec_from_master 결과가 이미 측정된 관리번호의 스펙
+    filtered_spec = spec_df.copy()
 
     # 세션 상태에 저장 (다른 페이지에서 재사용 가능)
     st.session_state.spec_for_measured_ctq = filtered_spec
 
     return filtered_spec
-
-
-
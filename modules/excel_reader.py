@@ -0,0 +1,147 @@
+"""
+엑셀 읽기 엔진 선택
+
+설치된 엔진 중 파일 형식에 맞는 가장 빠른 엔진을 자동으로 사용한다.
+    .xlsx: calamine (python-calamine 설치 시) -> openpyxl
+    .xls : calamine (python-calamine 설치 시) -> xlrd
+
+DATA_TRANSFORM_CONFIG['excel_engine']이 'auto'가 아니면 해당 엔진을 강제로 사용한다.
+"""
+import importlib.util
+from functools import lru_cache
+from io import BytesIO
+from typing import Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from config import DATA_TRANSFORM_CONFIG
+
+# 엔진 이름 -> 필요한 패키지
+ENGINE_MODULES = {
+    "calamine": "python_calamine",
+    "openpyxl": "openpyxl",
+    "xlrd": "xlrd"
+}
+
+# 파일 형식별 엔진 우선순위 (설치된 첫 번째 엔진 사용)
+ENGINE_PREFERENCE = {
+    "xlsx": ["calamine", "openpyxl"],
+    "xls": ["calamine", "xlrd"]
+}
+
+# 행 단위로 읽을 수 있는 엔진 (streaming reader에서 사용)
+STREAMING_ENGINES = ("calamine", "openpyxl")
+
+# 구형 .xls (OLE2 복합 문서) 파일 시그니처
+_XLS_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+
+@lru_cache(maxsize=None)
+def is_engine_available(engine: str) -> bool:
+    module = ENGINE_MODULES.get(engine)
+    return module is not None and importlib.util.find_spec(module) is not None
+
+
+def available_engines() -> List[str]:
+    """설치되어 사용 가능한 엔진 목록"""
+    return [engine for engine in ENGINE_MODULES if is_engine_available(engine)]
+
+
+def detect_format(data: bytes) -> str:
+    """파일 내용으로 형식 판별 ('xls' 또는 'xlsx')"""
+    return "xls" if data[:8] == _XLS_SIGNATURE else "xlsx"
+
+
+def select_engine(data: bytes, engine: Optional[str] = None) -> str:
+    """
+    파일 내용에 맞는 읽기 엔진 선택
+
+    Args:
+        data (bytes): 엑셀 파일 내용
+        engine (str, optional): 'auto' 또는 엔진 이름 (None이면 DATA_TRANSFORM_CONFIG['excel_engine'])
+
+    Returns:
+        str: pd.read_excel의 engine 값
+    """
+    engine = engine or DATA_TRANSFORM_CONFIG.get('excel_engine', 'auto')
+    file_format = detect_format(data)
+    candidates = ENGINE_PREFERENCE[file_format]
+
+    if engine != "auto":
+        if engine not in candidates:
+            raise ValueError(f"'{engine}' engine cannot read .{file_format} files (supported: {', '.join(candidates)})")
+        if not is_engine_available(engine):
+            raise ImportError(f"'{engine}' engine is not installed (pip install {ENGINE_MODULES[engine].replace('_', '-')})")
+        return engine
+
+    for candidate in candidates:
+        if is_engine_available(candidate):
+            return candidate
+    raise ImportError(f"No Excel reader installed for .{file_format} files "
+                      f"(install python-calamine or {candidates[-1]})")
+
+
+def read_excel_sheet(data: bytes, sheet_name, engine: Optional[str] = None, **kwargs) -> pd.DataFrame:
+    """선택된 엔진으로 시트 1개를 DataFrame으로 읽음 (kwargs는 pd.read_excel 인자)"""
+    return pd.read_excel(BytesIO(data), sheet_name=sheet_name, engine=select_engine(data, engine), **kwargs)
+
+
+def iter_sheet_rows(data: bytes, sheet_name: str, min_row: int = 1,
+                    engine: Optional[str] = None) -> Tuple[int, Iterator[tuple]]:
+    """
+    시트를 한 행씩 읽는 iterator (값만, 셀 위치는 A1 기준으로 맞춤)
+
+    Args:
+        data (bytes): 엑셀 파일 내용
+        sheet_name (str): 시트명
+        min_row (int): 읽기 시작 행 (1부터)
+        engine (str, optional): 엔진 (행 단위 읽기를 지원하지 않는 엔진이면 ValueError)
+
+    Returns:
+        (예상 행 수(진행률 표시용), 행 tuple iterator)
+    """
+    engine = select_engine(data, engine)
+    if engine == "calamine":
+        return _iter_rows_calamine(data, sheet_name, min_row)
+    if engine == "openpyxl":
+        return _iter_rows_openpyxl(data, sheet_name, min_row)
+    raise ValueError(f"'{engine}' engine does not support row streaming")
+
+
+def _iter_rows_openpyxl(data: bytes, sheet_name: str, min_row: int) -> Tuple[int, Iterator[tuple]]:
+    from openpyxl import load_workbook
+
+    wb = load_workbook(BytesIO(data), read_only=True, data_only=True, keep_links=False)
+    ws = wb[sheet_name]
+    # 시트에 기록된 크기는 진행률 추정에만 사용 (실제 읽기는 reset_dimensions 후 끝까지)
+    estimated_rows = max((ws.max_row or 0) - min_row + 1, 1)
+    ws.reset_dimensions()
+
+    def rows():
+        try:
+            yield from ws.iter_rows(min_row=min_row, values_only=True)
+        finally:
+            wb.close()
+    return estimated_rows, rows()
+
+
+def _iter_rows_calamine(data: bytes, sheet_name: str, min_row: int) -> Tuple[int, Iterator[tuple]]:
+    from python_calamine import load_workbook
+
+    wb = load_workbook(BytesIO(data))
+    sheet = wb.get_sheet_by_name(sheet_name)
+    # calamine iter_rows는 1행부터 반환하지만 열은 데이터가 있는 첫 열(start)부터 반환하므로
+    # 앞쪽 빈 열을 채워 openpyxl과 셀 위치를 맞춤
+    start_col = sheet.start[1] if sheet.start else 0
+    n_rows = sheet.end[0] + 1 if sheet.end else 0
+    estimated_rows = max(n_rows - min_row + 1, 1)
+
+    def rows():
+        try:
+            pad = (None,) * start_col
+            for row_no, row in enumerate(sheet.iter_rows(), start=1):
+                if row_no >= min_row:
+                    yield pad + tuple(row)
+        finally:
+            wb.close()
+    return estimated_rows, rows()
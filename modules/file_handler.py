@@ -8,6 +8,8 @@ from typing import Union
 from io import BytesIO
 from datetime import datetime
 
+from .excel_reader import read_excel_sheet
+
 # 문자열 정리 함수
 def clean_string(s):
     return str(s).strip().replace("/", "-")
@@ -31,7 +33,7 @@ def upload_excel_file() -> Union[pd.DataFrame, None]:
             if uploaded_file.name.endswith('.csv'):
                 df = pd.read_csv(uploaded_file)
             else:
-                df = pd.read_excel(uploaded_file)
+                df = read_excel_sheet(uploaded_file.getvalue(), 0)
 
             return df
 
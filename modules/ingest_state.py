@@ -0,0 +1,91 @@
+"""
+증분 변환(incremental ingestion) 상태 저장소
+
+같은 측정 파일이 날짜 열만 추가되어 매주 다시 업로드되는 경우를 위해
+파일 식별값별로 (날짜 열별 내용 해시, 이전 변환 결과)를 메모리와 디스크에 보관한다.
+(해시 비교를 위해 Data 시트는 매번 전체를 읽으며, 재사용으로 줄어드는 것은 추출 / 관리번호 매핑 비용이다)
+"""
+import os
+import pickle
+import threading
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from config import INCREMENTAL_CONFIG
+from .result_cache import ResultCache, hash_bytes
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# 파일 식별값: Information 시트 값 + search_cols + Master 해시가 모두 같아야 이전 결과를 재사용할 수 있다.
+def workbook_identity(info_dict: Dict, search_cols: Iterable[int], master_hash: str) -> str:
+    info_items = sorted((str(k), str(v).strip()) for k, v in info_dict.items())
+    return hash_bytes(repr((info_items, tuple(search_cols), master_hash)).encode("utf-8"))
+
+
+# POINT 블록 구조(측정 행 번호 + CTQ 명) 해시. 구조가 바뀌면 전체를 다시 변환한다.
+def layout_hash(row_idx: np.ndarray, ctq_per_row: np.ndarray) -> str:
+    return hash_bytes(np.asarray(row_idx, dtype=np.int64).tobytes() + "\x1f".join(map(str, ctq_per_row)).encode("utf-8"))
+
+
+# 날짜 열별 내용 해시 (블록 전체를 한 번에 해시한 뒤 열 단위로 위치 가중 합산)
+def column_hashes(block: np.ndarray) -> np.ndarray:
+    if block.size == 0:
+        return np.zeros(block.shape[1], dtype=np.uint64)
+    cell_hashes = pd.util.hash_array(block.ravel()).reshape(block.shape)
+    weights = pd.util.hash_array(np.arange(block.shape[0], dtype=np.int64))
+    with np.errstate(over='ignore'):
+        return (cell_hashes * weights[:, None]).sum(axis=0, dtype=np.uint64)
+
+
+class IngestStateStore:
+    """
+    파일 식별값 -> {'layout': str, 'columns': {측정일자: 해시}, 'data': 이전 변환 결과(전체 기간)}
+
+    최근 항목은 메모리(LRU)에, 전체는 state_dir에 pickle로 저장한다.
+    """
+
+    def __init__(self, state_dir: str, max_memory_entries: int = 16):
+        self.state_dir = state_dir if os.path.isabs(state_dir) else os.path.join(PROJECT_ROOT, state_dir)
+        self._memory = ResultCache(max_entries=max_memory_entries)
+        self._lock = threading.Lock()
+
+    def _path(self, identity: str) -> str:
+        return os.path.join(self.state_dir, f"{identity}.pkl")
+
+    def load(self, identity: str) -> Optional[Dict]:
+        state = self._memory.get(identity)
+        if state is not None:
+            return state
+        path = self._path(identity)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                state = pickle.load(f)
+        except Exception:
+            # 손상된 상태 파일은 무시하고 전체 변환
+            return None
+        self._memory.put(identity, state)
+        return state
+
+    def save(self, identity: str, state: Dict) -> None:
+        self._memory.put(identity, state)
+        with self._lock:
+            os.makedirs(self.state_dir, exist_ok=True)
+            tmp_path = self._path(identity) + ".tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(identity))
+
+    def clear(self) -> None:
+        self._memory.clear()
+        if os.path.isdir(self.state_dir):
+            for name in os.listdir(self.state_dir):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(self.state_dir, name))
+
+
+ingest_store = IngestStateStore(INCREMENTAL_CONFIG['state_dir'], INCREMENTAL_CONFIG['max_memory_entries'])
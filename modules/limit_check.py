@@ -0,0 +1,128 @@
+"""
+스펙 / 관리 한계 위반 판정 (USL, LSL, UCL, LCL)
+
+측정 데이터와 스펙 표를 merge하지 않고, 관리번호를 스펙 표의 행 위치로 바꾼 뒤
+한계값 배열에서 행별 한계를 가져와 네 가지 위반을 비트 상태 코드(uint8) 하나로 계산한다.
+
+    status & USL_OVER   -> 측정값 > USL
+    status & LSL_UNDER  -> 측정값 < LSL
+    status & UCL_OVER   -> 측정값 > UCL
+    status & LCL_UNDER  -> 측정값 < LCL
+
+한계값이 없거나(NaN) 측정값이 없으면 해당 비트는 0이다.
+"""
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+USL_OVER = 1
+LSL_UNDER = 2
+UCL_OVER = 4
+LCL_UNDER = 8
+
+SPEC_VIOLATION = USL_OVER | LSL_UNDER
+CONTROL_VIOLATION = UCL_OVER | LCL_UNDER
+
+LIMIT_COLUMNS = ["USL", "LSL", "UCL", "LCL"]
+
+# (비트, 한계 컬럼, 비교 함수, 표시명) - LIMIT_COLUMNS 순서
+_LIMIT_CHECKS = [
+    (USL_OVER, "USL", np.greater, "USL over"),
+    (LSL_UNDER, "LSL", np.less, "LSL under"),
+    (UCL_OVER, "UCL", np.greater, "UCL over"),
+    (LCL_UNDER, "LCL", np.less, "LCL under")
+]
+
+# 상태 코드(0~15) -> 표시 문자열 (예: 5 -> "USL over, UCL over")
+STATUS_LABELS = [
+    ", ".join(label for bit, _, _, label in _LIMIT_CHECKS if code & bit) for code in range(16)
+]
+
+
+def limit_table(spec_df: pd.DataFrame) -> Tuple[pd.Index, np.ndarray]:
+    """
+    스펙 표를 관리번호 index와 한계값 배열로 변환
+
+    Args:
+        spec_df (pd.DataFrame): 관리번호 + USL/LSL/UCL/LCL (없는 컬럼은 한계 없음으로 처리)
+
+    Returns:
+        (관리번호 index, (관리번호 수 + 1) x 4 float 배열)
+        마지막 행은 모두 NaN이며 스펙이 없는 측정 행(위치 -1)이 가리킨다.
+    """
+    specs = spec_df.drop_duplicates(subset="관리번호")
+    limits = np.full((len(specs) + 1, len(LIMIT_COLUMNS)), np.nan)
+    for k, col in enumerate(LIMIT_COLUMNS):
+        if col in specs.columns:
+            limits[:-1, k] = pd.to_numeric(specs[col], errors="coerce").to_numpy(dtype=float)
+    return pd.Index(specs["관리번호"]), limits
+
+
+def code_positions(row_codes: np.ndarray, uniques, code_index: pd.Index) -> np.ndarray:
+    """
+    측정 행별 관리번호 -> 스펙 표 행 위치 (스펙 없음 / 결측 관리번호는 -1)
+
+    Args:
+        row_codes, uniques: pd.factorize(측정 데이터 관리번호) 결과
+        code_index (pd.Index): limit_table의 관리번호 index
+
+    고유 관리번호만 조회한 뒤 행 단위로 펼친다.
+    """
+    unique_pos = code_index.get_indexer(uniques)
+    return np.append(unique_pos, -1)[row_codes]
+
+
+def limit_status(values: np.ndarray, positions: np.ndarray, limits: np.ndarray) -> np.ndarray:
+    """
+    행별 한계 위반 상태 코드
+
+    Args:
+        values (np.ndarray): 측정값 (float, 결측은 NaN)
+        positions (np.ndarray): code_positions 결과
+        limits (np.ndarray): limit_table의 한계값 배열
+
+    Returns:
+        np.ndarray: uint8 상태 코드 (USL_OVER | LSL_UNDER | UCL_OVER | LCL_UNDER 조합)
+    """
+    values = np.asarray(values, dtype=float)
+    status = np.zeros(len(values), dtype=np.uint8)
+    # 한계 컬럼별로 행별 한계를 가져와 비교 (NaN 비교는 False)
+    for k, (bit, _, compare, _) in enumerate(_LIMIT_CHECKS):
+        np.bitwise_or(status, bit, out=status, where=compare(values, limits[positions, k]))
+    return status
+
+
+def status_labels(status: np.ndarray) -> pd.Categorical:
+    """상태 코드 -> 표시 문자열 (category, 위반 없음은 빈 문자열)"""
+    return pd.Categorical.from_codes(status, categories=STATUS_LABELS)
+
+
+def violation_counts(status: np.ndarray, row_codes: np.ndarray, uniques) -> pd.DataFrame:
+    """
+    관리번호별 위반 건수
+
+    Args:
+        status (np.ndarray): limit_status 결과
+        row_codes, uniques: pd.factorize(측정 데이터 관리번호) 결과 (결측 관리번호 행(-1)은 제외)
+
+    Returns:
+        pd.DataFrame: 관리번호, n, USL over, LSL under, UCL over, LCL under, Spec NG, Control NG
+        (Spec NG: USL/LSL 위반 행 수, Control NG: UCL/LCL 위반 행 수, Spec NG 많은 순)
+    """
+    valid = row_codes >= 0
+    n_codes = len(uniques)
+    # 관리번호 x 상태 코드(16가지) 건수를 한 번에 센 뒤 비트별로 합산
+    histogram = np.bincount(row_codes[valid] * 16 + status[valid], minlength=n_codes * 16).reshape(n_codes, 16)
+    codes = np.arange(16)
+
+    def count(bits: int) -> np.ndarray:
+        return histogram[:, (codes & bits) != 0].sum(axis=1)
+
+    counts = pd.DataFrame({"관리번호": uniques, "n": histogram.sum(axis=1)})
+    for bit, _, _, label in _LIMIT_CHECKS:
+        counts[label] = count(bit)
+    counts["Spec NG"] = count(SPEC_VIOLATION)
+    counts["Control NG"] = count(CONTROL_VIOLATION)
+    return counts.sort_values(["Spec NG", "Control NG", "관리번호"], ascending=[False, False, True],
+                              ignore_index=True)
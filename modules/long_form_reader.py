@@ -0,0 +1,201 @@
+"""
+장비 출력(long-form) 측정 데이터 읽기 (CSV / Parquet)
+
+CMM, 토크 측정기 등에서 내보낸 long-form 파일은 이미 변환 결과(transformed_data)와 같은 컬럼을 가지므로
+엑셀 양식(Information 시트, POINT 블록, 날짜 열) 해석 없이 pyarrow로 바로 읽는다.
+    - 입력 바이트는 복사 없이 pyarrow 버퍼로 읽고, 파일 경로는 memory map으로 읽는다.
+    - 측정일자가 날짜형이면 선택 기간 밖의 행은 pandas로 변환하기 전에 제외한다 (Parquet은 row group 단위로 건너뜀).
+    - 시간대가 있는 측정일자는 그 시간대의 현지 시각으로 비교하고 시간대를 제거한다.
+    - 관리번호 컬럼이 있어도 사용하지 않는다 (현재 Master 기준으로 다시 매핑).
+"""
+import os
+from typing import List, Optional, Tuple, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from .excel_reader import _XLS_SIGNATURE
+
+LONG_FORM_FORMATS = ("csv", "parquet")
+
+# 문자열로 읽을 매핑 키 / 정보 컬럼 (Part No 앞자리 0 등이 숫자 변환으로 바뀌지 않도록)
+_STRING_COLUMNS = [
+    '1차 업체명', '지역명', '2차업체명', '모델명', '측정자', '측정장비', '부품명', 'CTQ/P 관리항목명', 'Part No'
+]
+
+_PARQUET_MAGIC = b"PAR1"
+_ZIP_MAGIC = b"PK\x03\x04"
+
+# CSV 인코딩 (utf-8이 아니면 한글 Windows 기본 인코딩으로 읽음)
+_CSV_ENCODINGS = ("utf8", "cp949")
+
+
+def detect_input_format(data: bytes) -> str:
+    """파일 내용으로 측정 파일 형식 판별 ('xlsx', 'xls', 'parquet', 'csv')"""
+    if data[:4] == _PARQUET_MAGIC:
+        return "parquet"
+    if data[:4] == _ZIP_MAGIC:
+        return "xlsx"
+    if data[:8] == _XLS_SIGNATURE:
+        return "xls"
+    return "csv"
+
+
+def _open_source(source: Union[bytes, str]):
+    # 바이트는 복사 없이 버퍼로 감싸고, 경로는 memory map으로 연다
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return pa.BufferReader(pa.py_buffer(source))
+    return pa.memory_map(os.fspath(source), "r")
+
+
+def _detect_csv_encoding(source: Union[bytes, str], sample_size: int = 1 << 16) -> str:
+    # 앞부분 sample을 utf-8로 디코딩해 보고 실패하면 cp949로 판단 (sample 끝에서 잘린 글자는 무시)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        sample = bytes(source[:sample_size])
+    else:
+        with open(source, "rb") as f:
+            sample = f.read(sample_size)
+    try:
+        sample.decode("utf-8")
+    except UnicodeDecodeError as e:
+        if e.start < len(sample) - 3:
+            return _CSV_ENCODINGS[1]
+    return _CSV_ENCODINGS[0]
+
+
+def _read_csv_table(source: Union[bytes, str], columns: List[str]) -> pa.Table:
+    # 측정일자는 문자열로 읽음 (pyarrow 추론은 시간대 표기가 있으면 UTC로 바꿔 현지 시각을 잃음)
+    convert_options = pa_csv.ConvertOptions(
+        include_columns=columns,
+        column_types={col: pa.string() for col in _STRING_COLUMNS + ["측정일자"] if col in columns}
+    )
+    read_options = pa_csv.ReadOptions(encoding=_detect_csv_encoding(source))
+    try:
+        with _open_source(source) as f:
+            table = pa_csv.read_csv(f, read_options=read_options, convert_options=convert_options)
+    except KeyError as e:
+        # include_columns에 있는 컬럼이 파일에 없는 경우
+        raise ValueError(f"Long-form file is missing a required column ({e.args[0]})") from e
+
+    if "측정일자" in table.column_names:
+        # 시간대 표기가 없는 ISO 날짜면 날짜형으로 변환 (기간 필터를 pyarrow 단계에서 적용),
+        # 아니면 문자열로 두고 pandas에서 변환
+        dates = table.column("측정일자")
+        dates = pc.if_else(pc.equal(dates, ""), pa.scalar(None, pa.string()), dates)
+        try:
+            table = table.set_column(table.schema.get_field_index("측정일자"), "측정일자",
+                                     pc.cast(dates, pa.timestamp("s")))
+        except pa.ArrowInvalid:
+            pass
+    return table
+
+
+def _check_columns(table_schema: pa.Schema, columns: List[str]) -> None:
+    missing = [col for col in columns if col not in table_schema.names]
+    if missing:
+        raise ValueError(f"Long-form file is missing columns: {', '.join(missing)}")
+
+
+def _date_bounds(table_schema: pa.Schema, start_date, end_date) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+    # 측정일자가 날짜형일 때만 pyarrow 단계에서 기간 필터를 적용 (문자열이면 pandas 변환 후 필터)
+    # 시간대가 있는 측정일자는 그 시간대의 현지 시각 기준으로 비교 (읽은 뒤 시간대를 제거한 값과 같은 기준)
+    if not (start_date and end_date) or "측정일자" not in table_schema.names:
+        return None
+    date_type = table_schema.field("측정일자").type
+    if not pa.types.is_timestamp(date_type):
+        return None
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    if date_type.tz is not None:
+        start, end = start.tz_localize(date_type.tz), end.tz_localize(date_type.tz)
+    return start, end
+
+
+def _date_filter(table_schema: pa.Schema, bounds: Tuple[pd.Timestamp, pd.Timestamp]):
+    date_type = table_schema.field("측정일자").type
+    start, end = (pa.scalar(bound.to_pydatetime(), type=date_type) for bound in bounds)
+    return (pc.field("측정일자") >= start) & (pc.field("측정일자") <= end)
+
+
+def _row_groups_in_range(parquet_file: pq.ParquetFile, bounds: Tuple[pd.Timestamp, pd.Timestamp]) -> List[int]:
+    """측정일자 min/max 통계가 기간과 겹치는 row group (통계가 없으면 포함)"""
+    metadata = parquet_file.metadata
+    row_groups = []
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        stats = next((row_group.column(j).statistics for j in range(row_group.num_columns)
+                      if row_group.column(j).path_in_schema == "측정일자"), None)
+        if stats is not None and stats.has_min_max:
+            if pd.Timestamp(stats.max) < bounds[0] or pd.Timestamp(stats.min) > bounds[1]:
+                continue
+        row_groups.append(i)
+    return row_groups
+
+
+def read_long_form(
+        source: Union[bytes, str],
+        columns: List[str],
+        file_format: Optional[str] = None,
+        start_date=None,
+        end_date=None
+) -> pd.DataFrame:
+    """
+    long-form CSV / Parquet 측정 파일을 변환 결과와 같은 형태로 읽음
+
+    Args:
+        source (bytes | str): 파일 내용 또는 경로
+        columns (list): 필요한 컬럼 (MEASUREMENT_COLUMNS)
+        file_format (str, optional): 'csv' 또는 'parquet' (None이면 내용으로 판별)
+        start_date, end_date (optional): 기간 (날짜형 측정일자는 읽는 단계에서 기간 밖 행 제외)
+
+    Returns:
+        pd.DataFrame: columns 순서의 측정 데이터 (측정값이 비어 있는 행 제외, 측정값은 float,
+        시간대가 있는 측정일자는 현지 시각으로 시간대 제거)
+    """
+    if file_format is None:
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            file_format = detect_input_format(bytes(source[:8]))
+        else:
+            with open(source, "rb") as f:
+                file_format = detect_input_format(f.read(8))
+    if file_format not in LONG_FORM_FORMATS:
+        raise ValueError(f"Unsupported long-form format: {file_format}")
+
+    if file_format == "parquet":
+        # 파일은 한 번만 열고, 기간 밖 row group은 통계로 건너뜀
+        with _open_source(source) as f, pq.ParquetFile(f) as parquet_file:
+            schema = parquet_file.schema_arrow
+            _check_columns(schema, columns)
+            bounds = _date_bounds(schema, start_date, end_date)
+            row_groups = (_row_groups_in_range(parquet_file, bounds) if bounds is not None
+                          else range(parquet_file.metadata.num_row_groups))
+            table = parquet_file.read_row_groups(row_groups, columns=columns)
+    else:
+        table = _read_csv_table(source, columns)
+        schema = table.schema
+        _check_columns(schema, columns)
+        bounds = _date_bounds(schema, start_date, end_date)
+
+    if bounds is not None:
+        table = table.filter(_date_filter(schema, bounds))
+
+    df = table.select(columns).to_pandas()
+
+    # 빈 측정값은 엑셀 변환과 같이 행을 만들지 않음
+    df = df[df["측정값"].notna()].reset_index(drop=True)
+    for col in _STRING_COLUMNS:
+        if col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(object)
+    if not pd.api.types.is_datetime64_any_dtype(df["측정일자"]):
+        df["측정일자"] = pd.to_datetime(df["측정일자"], errors="coerce")
+    if getattr(df["측정일자"].dt, "tz", None) is not None:
+        # 엑셀 변환 결과 / 조회 기간과 같이 시간대 없는 현지 시각으로 맞춤
+        df["측정일자"] = df["측정일자"].dt.tz_localize(None)
+    if pd.api.types.is_numeric_dtype(df["측정값"]):
+        df["측정값"] = df["측정값"].astype(float)
+    else:
+        values = df["측정값"].astype(str).str.strip().str.replace("\xa0", "", regex=False)
+        df["측정값"] = pd.to_numeric(values, errors="coerce").astype(float)
+    return df
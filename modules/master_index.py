@@ -0,0 +1,232 @@
+"""
+Master 파일 인덱스 (관리번호 매핑 키 / 스펙 한계값)
+
+Master 시트를 한 번만 읽고 정리한 뒤, 7개 매핑 키 tuple -> Master 행 위치 해시 인덱스로 컴파일한다.
+Master 파일 내용 해시 기준으로 서버 프로세스 전체(모든 세션)에서 공유된다.
+"""
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .profiler import stage
+from .excel_reader import read_excel_sheet
+from .result_cache import ResultCache, hash_bytes
+from .limit_check import limit_table, code_positions
+
+MERGE_KEYS = ["1차 업체명", "지역명", "2차업체명", "부품명", "CTQ/P 관리항목명", "모델명", "Part No"]
+SPEC_COLUMNS = ["USL", "LSL", "Target", "UCL", "LCL"]
+# 관리번호별 스펙 표 컬럼 (get_spec_from_master 결과)
+SPEC_TABLE_COLUMNS = ["관리번호", "부품", "공정CTQ/CTP 관리 항목명"] + SPEC_COLUMNS
+
+# Master 컬럼명 -> 측정 데이터 컬럼명
+MASTER_COLUMN_RENAME = {
+    "부품": "부품명",
+    "공정CTQ/CTP 관리 항목명": "CTQ/P 관리항목명",
+    "2차 업체명": "2차업체명"
+}
+
+# 결측 키 값 (pd.merge는 결측치끼리 같은 키로 매칭하므로 동일하게 처리)
+_MISSING_KEY = ("__missing__",)
+
+_master_index_cache = ResultCache(max_entries=4)
+_spec_index_cache = ResultCache(max_entries=4)
+
+
+# master file의 스펙 컬럼 정리 함수
+def clean_master_specs(master_df: pd.DataFrame) -> pd.DataFrame:
+    # 25.6.20 수정
+    # master file의 LSL, Target 값의 끝에 공백이 있어서 숫자형으로 아니고 object로 정의됨
+    # 그래서 특수공백 제거하고 숫자 변환 처리 추가함.
+    for col in SPEC_COLUMNS:
+        master_df[col] = (
+            master_df[col]
+            .astype(str)  # 우선 문자열로 변환
+            .str.replace(r"[^\d\.\-]", "", regex=True)  # 숫자, 소수점, 음수부호 외 제거
+            .replace("", np.nan)  # 빈 문자열은 np.nan으로 처리
+            .astype(float)  # 최종적으로 float 변환
+        )
+    return master_df
+
+
+# 매핑 키 컬럼 정규화 (add_management_code의 astype(str).str.strip()과 동일)
+def normalize_keys(df: pd.DataFrame, keys: List[str] = MERGE_KEYS) -> pd.DataFrame:
+    for key in keys:
+        df[key] = df[key].astype(str).str.strip()
+    return df
+
+
+def _key_tuples(key_df: pd.DataFrame) -> List[Tuple]:
+    columns = [
+        [_MISSING_KEY if pd.isna(v) else v for v in key_df[key].to_numpy(dtype=object)]
+        for key in key_df.columns
+    ]
+    return list(zip(*columns))
+
+
+class MasterIndex:
+    """
+    정리된 Master 데이터와 매핑 키 인덱스
+
+    - master_df: 스펙 컬럼이 float로 정리된 Master 원본 (세션의 master_data로 사용)
+    - source_hash: Master 파일 내용 해시 (파일에서 만든 경우)
+    - key_index: 매핑 키 tuple -> Master 행 위치 목록 (Master 순서 유지)
+    - codes: Master 행 위치별 관리번호
+    - specs: Master 행 위치별 USL/LSL/Target/UCL/LCL
+    """
+
+    def __init__(self, master_df: pd.DataFrame, source_hash: Optional[str] = None):
+        self.master_df = master_df
+        self.source_hash = source_hash
+
+        key_df = master_df.rename(columns=MASTER_COLUMN_RENAME).loc[:, MERGE_KEYS + ["관리번호"]]
+        key_df = normalize_keys(key_df.copy()).reset_index(drop=True)
+
+        self.codes = key_df["관리번호"]
+        self.specs = master_df.reindex(columns=SPEC_COLUMNS).reset_index(drop=True)
+
+        self.key_index: Dict[Tuple, List[int]] = {}
+        for pos, key in enumerate(_key_tuples(key_df[MERGE_KEYS])):
+            self.key_index.setdefault(key, []).append(pos)
+        self.has_duplicate_keys = any(len(v) > 1 for v in self.key_index.values())
+
+    def lookup(self, results_df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        측정 데이터 각 행의 Master 행 위치를 찾는다 (키 컬럼은 정규화되어 있어야 함)
+
+        측정 데이터는 고유 키 조합이 적으므로 고유 조합만 해시 조회한 뒤 행 단위로 펼친다.
+
+        Returns:
+            (row_take, master_pos): pd.merge(how='left') 결과의 각 행이 가리키는
+            측정 데이터 행 번호와 Master 행 위치(-1은 매칭 없음)
+        """
+        n = len(results_df)
+        if n == 0:
+            return np.arange(0), np.arange(0)
+
+        # 키 컬럼별 factorize 후 조합 코드로 고유 키 조합 산출
+        col_codes, col_uniques = [], []
+        for key in MERGE_KEYS:
+            codes, uniques = pd.factorize(results_df[key], use_na_sentinel=False)
+            col_codes.append(codes)
+            col_uniques.append(uniques)
+        combined = np.ravel_multi_index(col_codes, [max(len(u), 1) for u in col_uniques])
+        unique_combined, first_rows, inverse = np.unique(combined, return_index=True, return_inverse=True)
+
+        matches = []
+        for row in first_rows:
+            key = tuple(
+                _MISSING_KEY if pd.isna(uniques[codes[row]]) else uniques[codes[row]]
+                for codes, uniques in zip(col_codes, col_uniques)
+            )
+            matches.append(self.key_index.get(key, [-1]))
+
+        counts = np.array([len(m) for m in matches])
+        if (counts == 1).all():
+            return np.arange(n), np.array([m[0] for m in matches])[inverse]
+
+        # Master에 중복 키가 있으면 pd.merge와 동일하게 측정 행을 매칭 수만큼 반복
+        row_counts = counts[inverse]
+        row_take = np.repeat(np.arange(n), row_counts)
+        master_pos = np.concatenate([matches[u] for u in inverse])
+        return row_take, master_pos
+
+    def code_values(self, master_pos: np.ndarray) -> pd.Series:
+        """Master 행 위치 -> 관리번호 (매칭 없음은 결측치)"""
+        return self.codes.reindex(master_pos).reset_index(drop=True)
+
+
+# Master 파일 바이트에서 인덱스를 만들거나 캐시에서 가져오는 함수
+def get_master_index(master_bytes: bytes, master_hash: Optional[str] = None,
+                     engine: Optional[str] = None) -> MasterIndex:
+    master_hash = master_hash or hash_bytes(master_bytes)
+    index = _master_index_cache.get(master_hash)
+    if index is None:
+        with stage("master_index") as rec:
+            master_df = read_excel_sheet(master_bytes, "Master", engine)
+            index = MasterIndex(clean_master_specs(master_df), master_hash)
+            rec.set(rows_out=len(master_df))
+        _master_index_cache.put(master_hash, index)
+    return index
+
+
+def get_master_index_stats() -> Dict:
+    return _master_index_cache.stats()
+
+
+class SpecLimits(NamedTuple):
+    """관리번호 1개의 스펙 한계값 (값이 없으면 None)"""
+    USL: Optional[float] = None
+    LSL: Optional[float] = None
+    Target: Optional[float] = None
+    UCL: Optional[float] = None
+    LCL: Optional[float] = None
+
+
+class SpecIndex:
+    """
+    관리번호별 스펙 한계값 인덱스 (Master 버전별로 한 번 생성)
+
+    - table: SPEC_TABLE_COLUMNS 중 있는 컬럼 (Master 순서, 중복 행 제거)
+    - code_index: 관리번호 -> 스펙 행 위치 (관리번호가 중복되면 첫 번째 행)
+    - limits: USL/LSL/UCL/LCL 한계값 배열 (limit_check.limit_table, 마지막 행은 NaN)
+    - get(관리번호): SpecLimits를 dict에서 바로 조회
+    """
+
+    def __init__(self, spec_df: pd.DataFrame):
+        columns = [col for col in SPEC_TABLE_COLUMNS if col in spec_df.columns]
+        self.missing_columns = [col for col in SPEC_TABLE_COLUMNS if col not in spec_df.columns]
+        self.table = spec_df.loc[:, columns].drop_duplicates().reset_index(drop=True)
+
+        first = self.table.drop_duplicates(subset="관리번호")
+        self.code_index, self.limits = limit_table(first)
+        # 스펙 컬럼별 값 배열 (마지막에 NaN을 붙여 위치 -1이 NaN을 가리키도록 함)
+        self._columns = {
+            col: np.append(pd.to_numeric(first[col], errors="coerce").to_numpy(dtype=float), np.nan)
+            for col in SPEC_COLUMNS if col in first.columns
+        }
+        self._by_code: Dict[str, SpecLimits] = {
+            code: SpecLimits(**{col: (None if np.isnan(values[pos]) else float(values[pos]))
+                                for col, values in self._columns.items()})
+            for pos, code in enumerate(self.code_index)
+        }
+
+    def __len__(self) -> int:
+        return len(self._by_code)
+
+    def __contains__(self, code) -> bool:
+        return code in self._by_code
+
+    def get(self, code) -> SpecLimits:
+        """관리번호의 스펙 (없는 관리번호는 모든 값이 None)"""
+        return self._by_code.get(code, SpecLimits())
+
+    def positions(self, codes: pd.Series) -> np.ndarray:
+        """측정 행별 관리번호 -> 스펙 행 위치 (스펙 없음은 -1)"""
+        row_codes, uniques = pd.factorize(codes)
+        return code_positions(row_codes, uniques, self.code_index)
+
+    def column_values(self, column: str, positions: np.ndarray) -> Optional[np.ndarray]:
+        """스펙 행 위치별 스펙 값 (Master에 없는 컬럼이면 None)"""
+        values = self._columns.get(column)
+        return values[positions] if values is not None else None
+
+    def frame(self, codes=None) -> pd.DataFrame:
+        """스펙 표 (codes가 주어지면 해당 관리번호 행만)"""
+        if codes is None:
+            return self.table.copy()
+        return self.table[self.table["관리번호"].isin(codes)]
+
+
+# 스펙 표에서 SpecIndex를 만들거나 캐시에서 가져오는 함수
+# version(Master 파일 해시 등)이 같으면 모든 세션이 같은 인덱스를 공유한다.
+def get_spec_index(spec_df: pd.DataFrame, version: Optional[str] = None) -> SpecIndex:
+    if version is None:
+        return SpecIndex(spec_df)
+    index = _spec_index_cache.get(version)
+    if index is None:
+        with stage("spec_index") as rec:
+            index = SpecIndex(spec_df)
+            rec.set(rows_out=len(index))
+        _spec_index_cache.put(version, index)
+    return index
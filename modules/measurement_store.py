@@ -0,0 +1,270 @@
+"""
+측정 데이터 누적 저장소 (관리번호 / 월 단위 Parquet 파티션)
+
+변환 결과를 세션이 끝나도 남도록 로컬 디스크에 누적 저장한다.
+
+    <store_dir>/관리번호=<관리번호>/month=YYYY-MM.parquet
+    <store_dir>/_specs.parquet   (관리번호별 USL/LSL/Target/UCL/LCL)
+
+같은 (관리번호, 측정일자)의 데이터를 다시 저장하면 기존 행을 교체하므로
+같은 파일을 여러 번 저장해도 중복되지 않는다. 조회 시에는 필요한 관리번호/월 파일만 읽는다.
+저장 / 삭제는 저장소 잠금 파일(<store_dir>/_store.lock)을 잡고 실행하므로
+배치 CLI와 앱이 다른 프로세스에서 같은 파티션을 고쳐 써도 서로의 행을 잃지 않는다.
+"""
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from config import MEASUREMENT_STORE_CONFIG
+from .data_transformer import MEASUREMENT_COLUMNS, compact_dtypes
+from .master_index import SPEC_TABLE_COLUMNS
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SPEC_STORE_COLUMNS = SPEC_TABLE_COLUMNS
+STORE_COLUMNS = ["관리번호"] + MEASUREMENT_COLUMNS
+
+_CODE_PREFIX = "관리번호="
+_MONTH_PREFIX = "month="
+
+
+def _month_key(value) -> str:
+    return pd.Timestamp(value).strftime("%Y-%m")
+
+
+@contextmanager
+def _file_lock(path: str):
+    """프로세스 간 배타적 잠금 (잠금 파일 기준, 프로세스가 종료되면 OS가 해제)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                # LK_LOCK은 약 10초 동안 재시도한 뒤 OSError를 올리므로 잠길 때까지 반복
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class MeasurementStore:
+    """관리번호 / 월 단위로 파티션된 측정 데이터 저장소"""
+
+    def __init__(self, store_dir: str):
+        self.store_dir = store_dir if os.path.isabs(store_dir) else os.path.join(PROJECT_ROOT, store_dir)
+        self._lock = threading.Lock()
+        # 파티션 경로 -> (mtime_ns, 크기, 행 수) - stats()에서 바뀐 파티션의 메타데이터만 다시 읽음
+        self._row_counts: Dict[str, Tuple[int, int, int]] = {}
+
+    def _code_dir(self, code: str) -> str:
+        # 관리번호에 경로 구분자 등이 있어도 안전하도록 인코딩
+        return os.path.join(self.store_dir, _CODE_PREFIX + quote(str(code), safe=""))
+
+    def _partition_path(self, code: str, month: str) -> str:
+        return os.path.join(self._code_dir(code), f"{_MONTH_PREFIX}{month}.parquet")
+
+    @contextmanager
+    def _locked(self):
+        # 같은 프로세스의 스레드는 threading.Lock, 다른 프로세스(배치 CLI 등)는 잠금 파일로 직렬화
+        with self._lock, _file_lock(os.path.join(self.store_dir, "_store.lock")):
+            yield
+
+    @property
+    def _spec_path(self) -> str:
+        return os.path.join(self.store_dir, "_specs.parquet")
+
+    @staticmethod
+    def _write(df: pd.DataFrame, path: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 배치 CLI와 서버가 같은 파티션을 동시에 써도 겹치지 않도록 쓰기마다 고유한 임시 파일 사용
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), suffix=".tmp", delete=False) as tmp:
+            tmp_path = tmp.name
+        try:
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def append(self, df: pd.DataFrame, master_df: Optional[pd.DataFrame] = None) -> Dict[str, int]:
+        """
+        변환 결과를 저장소에 추가 (같은 관리번호·측정일자의 기존 행은 교체)
+
+        Args:
+            df (pd.DataFrame): transform_data 결과
+            master_df (pd.DataFrame, optional): Master 데이터 (주어지면 해당 관리번호의 스펙도 저장)
+
+        Returns:
+            dict: 저장 행 수, 교체된 기존 행 수, 갱신된 파티션 수, 관리번호 미매칭으로 제외된 행 수
+        """
+        summary = {'rows_written': 0, 'rows_replaced': 0, 'partitions': 0, 'rows_skipped': 0}
+        if df is None or df.empty:
+            return summary
+
+        data = df.loc[:, [c for c in STORE_COLUMNS if c in df.columns]]
+        matched = data["관리번호"].notna()
+        summary['rows_skipped'] = int((~matched).sum())
+        data = data[matched]
+        if data.empty:
+            return summary
+
+        # 파티션 파일마다 카테고리가 달라지지 않도록 문자열로 저장 (조회 시 category로 변환)
+        category_cols = data.select_dtypes("category").columns
+        data = data.astype({col: str for col in category_cols}) if len(category_cols) else data.copy()
+        data["관리번호"] = data["관리번호"].astype(str)
+        months = data["측정일자"].dt.strftime("%Y-%m")
+
+        with self._locked():
+            for (code, month), part in data.groupby([data["관리번호"], months], sort=False):
+                path = self._partition_path(code, month)
+                if os.path.exists(path):
+                    existing = pd.read_parquet(path)
+                    replaced = existing["측정일자"].isin(part["측정일자"].unique())
+                    summary['rows_replaced'] += int(replaced.sum())
+                    part = pd.concat([existing[~replaced], part], ignore_index=True)
+                part = part.sort_values("측정일자", kind="stable", ignore_index=True)
+                self._write(part, path)
+                summary['partitions'] += 1
+            summary['rows_written'] = len(data)
+
+            if master_df is not None and "관리번호" in master_df.columns:
+                self._append_specs(master_df, data["관리번호"].unique())
+        return summary
+
+    def _append_specs(self, master_df: pd.DataFrame, codes) -> None:
+        specs = master_df.reindex(columns=SPEC_STORE_COLUMNS)
+        specs = specs[specs["관리번호"].astype(str).isin(codes)].astype({"관리번호": str})
+        specs = specs.drop_duplicates("관리번호", keep="first")
+        if os.path.exists(self._spec_path):
+            existing = pd.read_parquet(self._spec_path)
+            specs = pd.concat([existing[~existing["관리번호"].isin(specs["관리번호"])], specs], ignore_index=True)
+        self._write(specs, self._spec_path)
+
+    def list_codes(self) -> List[str]:
+        """저장된 관리번호 목록"""
+        if not os.path.isdir(self.store_dir):
+            return []
+        return sorted(
+            unquote(name[len(_CODE_PREFIX):]) for name in os.listdir(self.store_dir)
+            if name.startswith(_CODE_PREFIX)
+        )
+
+    def list_months(self, code: str) -> List[str]:
+        """관리번호의 저장된 월(YYYY-MM) 목록"""
+        code_dir = self._code_dir(code)
+        if not os.path.isdir(code_dir):
+            return []
+        return sorted(
+            name[len(_MONTH_PREFIX):-len(".parquet")] for name in os.listdir(code_dir)
+            if name.startswith(_MONTH_PREFIX) and name.endswith(".parquet")
+        )
+
+    def read(self, code: str, start_date=None, end_date=None) -> pd.DataFrame:
+        """
+        관리번호 1개의 측정 데이터를 기간 내 월 파티션만 읽어 반환
+
+        Args:
+            code (str): 관리번호
+            start_date, end_date (optional): 조회 기간 (포함)
+
+        Returns:
+            pd.DataFrame: transform_data 결과와 같은 컬럼 구성 (측정일자 순)
+        """
+        months = self.list_months(code)
+        if start_date is not None:
+            months = [m for m in months if m >= _month_key(start_date)]
+        if end_date is not None:
+            months = [m for m in months if m <= _month_key(end_date)]
+        if not months:
+            return pd.DataFrame(columns=STORE_COLUMNS)
+
+        df = pd.concat([pd.read_parquet(self._partition_path(code, m)) for m in months], ignore_index=True)
+        if start_date is not None:
+            df = df[df["측정일자"] >= pd.Timestamp(start_date)]
+        if end_date is not None:
+            df = df[df["측정일자"] <= pd.Timestamp(end_date)]
+        return compact_dtypes(df.reset_index(drop=True))
+
+    def read_specs(self, codes: Optional[List[str]] = None) -> pd.DataFrame:
+        """저장된 관리번호별 스펙 (get_spec_from_master 결과와 같은 컬럼)"""
+        if not os.path.exists(self._spec_path):
+            return pd.DataFrame(columns=SPEC_STORE_COLUMNS)
+        specs = pd.read_parquet(self._spec_path)
+        if codes is not None:
+            specs = specs[specs["관리번호"].isin([str(c) for c in codes])]
+        return specs.reset_index(drop=True)
+
+    def clear(self) -> None:
+        """저장소 전체 삭제"""
+        if not os.path.isdir(self.store_dir):
+            return
+        with self._locked():
+            for root, dirs, files in os.walk(self.store_dir, topdown=False):
+                for name in files:
+                    if name.endswith((".parquet", ".tmp")):
+                        os.remove(os.path.join(root, name))
+                if root != self.store_dir and not os.listdir(root):
+                    os.rmdir(root)
+            self._row_counts.clear()
+
+    def stats(self) -> Dict:
+        """
+        관리번호 수, 파티션 수, 전체 행 수, 디스크 사용량
+
+        행 수는 파티션별로 보관해 두고, 수정 시각/크기가 바뀐 파티션(다른 프로세스가 쓴 경우 포함)만
+        Parquet 메타데이터를 다시 읽는다.
+        """
+        n_partitions, n_rows, n_bytes = 0, 0, 0
+        codes = self.list_codes()
+        row_counts = {}
+        for code in codes:
+            for month in self.list_months(code):
+                path = self._partition_path(code, month)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                cached = self._row_counts.get(path)
+                if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                    rows = cached[2]
+                else:
+                    rows = pq.read_metadata(path).num_rows
+                row_counts[path] = (stat.st_mtime_ns, stat.st_size, rows)
+                n_partitions += 1
+                n_bytes += stat.st_size
+                n_rows += rows
+        # 삭제된 파티션은 버림
+        self._row_counts = row_counts
+        return {
+            'codes': len(codes),
+            'partitions': n_partitions,
+            'rows': n_rows,
+            'size_mb': round(n_bytes / (1024 * 1024), 2)
+        }
+
+
+measurement_store = MeasurementStore(MEASUREMENT_STORE_CONFIG['store_dir'])
@@ -0,0 +1,264 @@
+"""
+변환 / 분석 단계별 실행 시간 측정 (profiling)
+
+    with stage("read_excel") as rec:
+        df = pd.read_excel(...)
+        rec.set(rows_out=len(df))
+
+    @profiled("create_imr_chart")
+    def create_imr_chart(...): ...
+
+단계마다 실행 시간, 입력/출력 행 수, 최대 메모리 증가량(tracemalloc)을 기록한다.
+tracemalloc의 peak는 프로세스 전체 값이므로 다른 스레드(백그라운드 변환 작업, Master 읽기 등)의 단계와
+겹쳐 실행된 단계의 peak_mb에는 그 스레드의 할당도 포함된다. 이런 단계는 peak_shared=True로 표시한다.
+비활성화(기본값) 상태에서는 플래그 확인 한 번만 하고 원래 코드를 그대로 실행한다.
+"""
+import functools
+import itertools
+import json
+import threading
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from config import PROFILE_CONFIG
+
+
+def _count_rows(value: Any) -> Optional[int]:
+    """DataFrame / 배열 / 리스트의 행 수 (tuple 반환값은 첫 번째 항목 기준)"""
+    if isinstance(value, tuple) and value:
+        value = value[0]
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray, list)):
+        return len(value)
+    return None
+
+
+class StageRecord:
+    """단계 1개의 측정 결과"""
+
+    __slots__ = ("name", "seq", "run_id", "depth", "thread", "started_at", "wall_s", "rows_in", "rows_out",
+                 "peak_mb", "extra", "_t0", "_mem0", "_peak", "_shared")
+
+    def __init__(self, name: str, seq: int, run_id: int, depth: int, rows_in: Optional[int], extra: Dict):
+        self.name = name
+        self.seq = seq
+        self.run_id = run_id
+        self.depth = depth
+        self.thread = threading.current_thread().name
+        self.started_at = datetime.now().isoformat(timespec="milliseconds")
+        self.wall_s = None
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.peak_mb = None
+        self.extra = extra
+        self._t0 = 0.0
+        self._mem0 = 0
+        self._peak = 0
+        self._shared = False
+
+    def set(self, rows_in: Optional[int] = None, rows_out: Optional[int] = None, **extra) -> None:
+        """단계 안에서 행 수나 추가 정보(cache_hit 등)를 기록"""
+        if rows_in is not None:
+            self.rows_in = rows_in
+        if rows_out is not None:
+            self.rows_out = rows_out
+        self.extra.update(extra)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "run_id": self.run_id,
+            "stage": self.name,
+            "depth": self.depth,
+            "thread": self.thread,
+            "started_at": self.started_at,
+            "wall_s": self.wall_s,
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "peak_mb": self.peak_mb,
+            **self.extra
+        }
+
+
+class _NullStage:
+    """비활성화 상태에서 쓰는 아무 일도 하지 않는 단계 (한 개를 공유)"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, *args, **kwargs) -> None:
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("_profiler", "_record")
+
+    def __init__(self, profiler: "Profiler", record: StageRecord):
+        self._profiler = profiler
+        self._record = record
+
+    def __enter__(self) -> StageRecord:
+        self._profiler._enter(self._record)
+        return self._record
+
+    def __exit__(self, exc_type, exc, tb):
+        self._profiler._exit(self._record, exc_type)
+        return False
+
+
+class Profiler:
+    """
+    단계별 측정 기록기
+
+    - 같은 스레드에서 중첩된 단계는 같은 run_id와 depth로 기록된다 (최상위 단계마다 run_id 증가).
+    - 최근 max_records개만 메모리에 보관하고, log_file이 지정되면 JSON lines로도 저장한다.
+    """
+
+    def __init__(self, enabled: bool = False, track_memory: bool = False, max_records: int = 1000,
+                 log_file: Optional[str] = None):
+        self.enabled = False
+        self.track_memory = track_memory
+        self.log_file = log_file
+        self._records: "deque[StageRecord]" = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._run_ids = itertools.count(1)
+        self._seq = itertools.count()
+        self._started_tracemalloc = False
+        # 실행 중인 단계 (스레드별 stack 전체) - 다른 스레드와 겹친 단계의 peak 표시용
+        self._active: Dict[int, List[StageRecord]] = {}
+        if enabled:
+            self.enable()
+
+    def enable(self, track_memory: Optional[bool] = None) -> None:
+        """측정 시작 (track_memory=True이면 tracemalloc도 시작, 변환이 수 배 느려질 수 있음)"""
+        if track_memory is not None:
+            self.track_memory = track_memory
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _stack(self) -> List[StageRecord]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def stage(self, name: str, rows_in: Optional[int] = None, **extra):
+        """단계 측정 context manager (비활성화 시 공유 no-op 객체 반환)"""
+        if not self.enabled:
+            return _NULL_STAGE
+        stack = self._stack()
+        run_id = stack[0].run_id if stack else next(self._run_ids)
+        return _Stage(self, StageRecord(name, next(self._seq), run_id, len(stack), rows_in, extra))
+
+    def profiled(self, name: Optional[str] = None) -> Callable:
+        """함수 전체를 한 단계로 측정하는 decorator (첫 번째 인자 / 반환값으로 행 수 기록)"""
+        def decorator(func: Callable) -> Callable:
+            stage_name = name or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.stage(stage_name, rows_in=_count_rows(args[0]) if args else None) as rec:
+                    result = func(*args, **kwargs)
+                    rec.set(rows_out=_count_rows(result))
+                return result
+            return wrapper
+        return decorator
+
+    def _enter(self, record: StageRecord) -> None:
+        stack = self._stack()
+        if self.track_memory and tracemalloc.is_tracing():
+            self._mark_shared(record, stack)
+            current, peak = tracemalloc.get_traced_memory()
+            # 하위 단계가 peak를 초기화하므로 상위 단계의 그때까지 peak를 보관
+            if stack:
+                stack[-1]._peak = max(stack[-1]._peak, peak)
+            tracemalloc.reset_peak()
+            record._mem0 = current
+        stack.append(record)
+        record._t0 = time.perf_counter()
+
+    def _mark_shared(self, record: StageRecord, stack: List[StageRecord]) -> None:
+        # tracemalloc peak는 프로세스 전체 값 - 다른 스레드에서 실행 중인 단계가 있으면 양쪽 모두 공유로 표시
+        with self._lock:
+            self._active[threading.get_ident()] = stack
+            others = [r for ident, active in self._active.items() if ident != threading.get_ident() for r in active]
+            if others:
+                record._shared = True
+                for r in others + stack:
+                    r._shared = True
+
+    def _exit(self, record: StageRecord, exc_type) -> None:
+        record.wall_s = round(time.perf_counter() - record._t0, 6)
+        stack = self._stack()
+        if stack and stack[-1] is record:
+            stack.pop()
+        if self.track_memory and tracemalloc.is_tracing():
+            peak = max(record._peak, tracemalloc.get_traced_memory()[1])
+            record.peak_mb = round(max(peak - record._mem0, 0) / (1024 * 1024), 3)
+            with self._lock:
+                if not stack:
+                    self._active.pop(threading.get_ident(), None)
+            if record._shared:
+                record.extra["peak_shared"] = True
+            if stack:
+                stack[-1]._peak = max(stack[-1]._peak, peak)
+        if exc_type is not None:
+            record.extra["error"] = exc_type.__name__
+
+        with self._lock:
+            self._records.append(record)
+            if self.log_file:
+                with open(self.log_file, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record.to_dict(), ensure_ascii=False, default=str) + "\n")
+
+    def records(self, last_runs: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        기록 목록 (run_id, 시작 순서대로)
+
+        Args:
+            last_runs (int, optional): 최근 실행(최상위 단계) 수만 반환
+        """
+        with self._lock:
+            items = list(self._records)
+        if last_runs is not None:
+            run_ids = sorted({r.run_id for r in items})[-last_runs:]
+            items = [r for r in items if r.run_id in set(run_ids)]
+        return [r.to_dict() for r in sorted(items, key=lambda r: (r.run_id, r.seq))]
+
+    def to_dataframe(self, last_runs: Optional[int] = None) -> pd.DataFrame:
+        return pd.DataFrame(self.records(last_runs))
+
+    def to_json(self, last_runs: Optional[int] = None) -> str:
+        return json.dumps(self.records(last_runs), ensure_ascii=False, indent=2, default=str)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+
+profiler = Profiler(**PROFILE_CONFIG)
+stage = profiler.stage
+profiled = profiler.profiled
@@ -0,0 +1,99 @@
+"""
+변환 결과 캐시 (Streamlit rerun 간 재사용)
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+import pandas as pd
+
+
+def hash_bytes(data: bytes) -> str:
+    """바이트 데이터의 SHA-256 해시 문자열을 반환"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def estimate_size(value: Any) -> int:
+    """
+    캐시 항목의 대략적인 메모리 크기(byte)를 계산
+
+    DataFrame은 memory_usage(deep=True), tuple/list/dict는 항목 합계로 계산한다.
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, (tuple, list)):
+        return sum(estimate_size(v) for v in value)
+    if isinstance(value, dict):
+        return sum(estimate_size(v) for v in value.values())
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    return 0
+
+
+class ResultCache:
+    """
+    크기 제한이 있는 LRU 캐시
+
+    항목 수(max_entries)와 전체 크기(max_bytes)를 모두 넘지 않도록
+    가장 오래 사용되지 않은 항목부터 제거한다. 여러 세션이 동시에 접근할 수 있으므로 lock으로 보호한다.
+    """
+
+    def __init__(self, max_entries: int = 8, max_bytes: int = 512 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._items: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            if key not in self._items:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return self._items[key][0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._items:
+                self.total_bytes -= self._items.pop(key)[1]
+
+            # 단일 항목이 전체 한도보다 크면 저장하지 않음
+            if size > self.max_bytes:
+                return
+
+            self._items[key] = (value, size)
+            self.total_bytes += size
+
+            while len(self._items) > self.max_entries or self.total_bytes > self.max_bytes:
+                _, (_, old_size) = self._items.popitem(last=False)
+                self.total_bytes -= old_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._items),
+                'size_mb': round(self.total_bytes / (1024 * 1024), 2),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+    def __len__(self) -> int:
+        return len(self._items)
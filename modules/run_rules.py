@@ -0,0 +1,150 @@
+"""
+관리도 판정 규칙 (Nelson / Western Electric rules)
+
+점마다 반복하지 않고, 규칙 조건을 만족하는 점을 bool 배열로 만든 뒤
+누적합(cumsum)으로 길이 k 창(window)의 개수를 한 번에 계산한다.
+groups를 주면 여러 관리번호의 전체 이력을 한 번에 판정하며, 창은 그룹 경계를 넘지 않는다.
+
+규칙 위반은 위반 패턴을 완성하는 마지막 점에 표시한다 (예: 규칙 2는 같은 쪽 9번째 점부터 표시).
+"""
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+# 규칙 번호 -> 설명 (zone A: 2~3σ, zone B: 1~2σ, zone C: 중심선~1σ)
+NELSON_RULES = {
+    1: "1 point beyond 3σ",
+    2: "9 points in a row on the same side of the center line",
+    3: "6 points in a row steadily increasing or decreasing",
+    4: "14 points in a row alternating up and down",
+    5: "2 out of 3 points beyond 2σ (zone A) on the same side",
+    6: "4 out of 5 points beyond 1σ (zone B) on the same side",
+    7: "15 points in a row within 1σ (zone C)",
+    8: "8 points in a row beyond 1σ on either side"
+}
+
+# I-MR 관리도의 d2 (n=2)
+_D2_MR = 1.128
+
+
+def _group_positions(n: int, groups: Optional[np.ndarray]) -> np.ndarray:
+    """각 점의 그룹 안 순번 (groups가 없으면 0..n-1, 그룹은 연속된 행이어야 함)"""
+    if groups is None:
+        return np.arange(n)
+    groups = np.asarray(groups)
+    starts = np.ones(n, dtype=bool)
+    starts[1:] = groups[1:] != groups[:-1]
+    start_idx = np.flatnonzero(starts)
+    return np.arange(n) - np.repeat(start_idx, np.diff(np.append(start_idx, n)))
+
+
+def _window_count(flags: np.ndarray, k: int) -> np.ndarray:
+    """각 점에서 끝나는 길이 k 창 안의 True 개수"""
+    cumsum = np.cumsum(flags, dtype=np.int64)
+    counts = cumsum.copy()
+    counts[k:] -= cumsum[:-k]
+    return counts
+
+
+def _window_rule(flags: np.ndarray, k: int, min_count: int, positions: np.ndarray) -> np.ndarray:
+    """길이 k 창(그룹 안) 안에 flags가 min_count개 이상인 창의 마지막 점"""
+    return (_window_count(flags, k) >= min_count) & (positions >= k - 1)
+
+
+def nelson_rules(
+        values,
+        center,
+        sigma,
+        rules: Iterable[int] = NELSON_RULES,
+        groups: Optional[np.ndarray] = None
+) -> Dict[int, np.ndarray]:
+    """
+    Nelson 규칙 위반 점 판정
+
+    Args:
+        values (array): 관리도 점 (개별값 또는 부분군 평균, 시간 순서)
+        center (float | array): 중심선 (그룹별로 다르면 점별 배열)
+        sigma (float | array): 점의 표준편차 (I-MR: MR-bar/d2, Xbar: 부분군 평균의 표준편차)
+        rules (iterable): 판정할 규칙 번호 (1~8)
+        groups (array, optional): 점별 그룹(관리번호), 같은 그룹은 연속된 행이어야 함
+
+    Returns:
+        dict: 규칙 번호 -> 위반 점 bool 배열 (결측 값 / sigma가 0 이하인 점은 위반 아님)
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    sigma = np.broadcast_to(np.asarray(sigma, dtype=float), (n,))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.where(sigma > 0, (values - center) / sigma, np.nan)
+    positions = _group_positions(n, groups)
+
+    # 직전 점과의 증감 (그룹 첫 점은 비교하지 않음)
+    diff = np.zeros(n)
+    diff[1:] = np.diff(values)
+    diff[positions == 0] = np.nan
+
+    masks = {}
+    for rule in rules:
+        if rule == 1:
+            mask = np.abs(z) > 3
+        elif rule == 2:
+            mask = _window_rule(z > 0, 9, 9, positions) | _window_rule(z < 0, 9, 9, positions)
+        elif rule == 3:
+            # 6점 연속 증가/감소 = 직전 대비 증감이 5번 연속
+            mask = _window_rule(diff > 0, 5, 5, positions - 1) | _window_rule(diff < 0, 5, 5, positions - 1)
+        elif rule == 4:
+            # 14점 교대 = 증감 부호가 12번 연속 바뀜
+            alternating = np.zeros(n, dtype=bool)
+            alternating[1:] = diff[1:] * diff[:-1] < 0
+            mask = _window_rule(alternating, 12, 12, positions - 2)
+        elif rule == 5:
+            mask = _window_rule(z > 2, 3, 2, positions) | _window_rule(z < -2, 3, 2, positions)
+        elif rule == 6:
+            mask = _window_rule(z > 1, 5, 4, positions) | _window_rule(z < -1, 5, 4, positions)
+        elif rule == 7:
+            mask = _window_rule(np.abs(z) < 1, 15, 15, positions)
+        elif rule == 8:
+            mask = _window_rule(np.abs(z) > 1, 8, 8, positions)
+        else:
+            raise ValueError(f"Unknown Nelson rule: {rule}")
+        masks[rule] = mask
+    return masks
+
+
+def nelson_rules_by_group(
+        df: pd.DataFrame,
+        value_col: str = "측정값",
+        group_col: str = "관리번호",
+        order_col: Optional[str] = "측정일자",
+        rules: Iterable[int] = NELSON_RULES
+) -> pd.DataFrame:
+    """
+    모든 관리번호의 I-MR 관리도 규칙 위반을 한 번에 판정
+
+    관리번호별 중심선(평균)과 sigma(MR-bar / d2)를 groupby로 계산한 뒤 nelson_rules를 한 번 호출한다.
+
+    Returns:
+        pd.DataFrame: df와 같은 index, 규칙별 위반 여부 컬럼 (rule_1 ...) - 결측 측정값 행은 제외하고 판정
+    """
+    data = df.loc[df[value_col].notna() & df[group_col].notna(), [group_col, value_col]
+                  + ([order_col] if order_col and order_col in df.columns else [])]
+    sort_cols = [group_col] + ([order_col] if order_col and order_col in data.columns else [])
+    data = data.sort_values(sort_cols, kind="stable")
+
+    groups = data[group_col].to_numpy()
+    values = data[value_col].to_numpy(dtype=float)
+    positions = _group_positions(len(values), groups)
+
+    # 관리번호별 평균 / 이동범위 평균 (그룹 첫 점의 이동범위는 제외)
+    moving_range = np.abs(np.diff(values, prepend=np.nan))
+    moving_range[positions == 0] = np.nan
+    grouped = pd.DataFrame({"g": groups, "x": values, "mr": moving_range}).groupby("g", sort=False)
+    center = grouped["x"].transform("mean").to_numpy()
+    sigma = grouped["mr"].transform("mean").to_numpy() / _D2_MR
+
+    masks = nelson_rules(values, center, sigma, rules, groups=groups)
+    result = pd.DataFrame(False, index=df.index, columns=[f"rule_{rule}" for rule in masks])
+    for rule, mask in masks.items():
+        result.loc[data.index[mask], f"rule_{rule}"] = True
+    return result
@@ -5,8 +5,10 @@ import pandas as pd
 import numpy as np
 import scipy.stats as stats
 import streamlit as st
+from .profiler import profiled
 
 
+@profiled()
 def basic_statistics(df: pd.DataFrame, columns: list = None) -> pd.DataFrame:
     """
     기본 통계 분석
@@ -30,6 +32,7 @@ def basic_statistics(df: pd.DataFrame, columns: list = None) -> pd.DataFrame:
     return stat_results
 
 
+@profiled()
 def normality_test(df: pd.DataFrame, columns: list = None, alpha: float = 0.05) -> pd.DataFrame:
     """
     정규성 검정
@@ -0,0 +1,258 @@
+"""
+실시간 I-MR 관리도 모니터 (측정 장비에서 들어오는 값을 바로 판정)
+
+관리번호마다 고정 크기 상태만 보관하고 이전 이력을 다시 읽지 않는다.
+    n, mean, m2   : Welford 누적 평균 / 편차 제곱합 (micro-batch는 Chan 병합식으로 합침)
+    last          : 마지막 측정값 (다음 이동범위 계산용)
+    mr_sum, mr_n  : 이동범위 합 / 개수 (MR-bar = mr_sum / mr_n)
+
+새 점은 그 점이 들어오기 직전까지의 상태로 만든 한계(평균 ± 3 * MR-bar / d2)로 판정한 뒤 상태에 반영한다.
+(create_imr_chart는 전체 데이터로 한계를 계산하므로, 같은 이력을 모두 넣은 뒤의 limits()가 create_imr_chart 한계와 같다)
+관리번호별 점이 min_points개 쌓이기 전에는 판정하지 않는다.
+
+    monitor = ImrMonitor.load()              # 체크포인트가 없으면 빈 모니터
+    violations = monitor.update(codes, values, timestamps)
+    monitor.save()
+"""
+import os
+import pickle
+import threading
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from config import STREAM_MONITOR_CONFIG
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# I-MR 관리도의 d2 (n=2)
+_D2 = 1.128
+
+# 관리번호별 상태 배열 이름
+_STATE_FIELDS = ("n", "mean", "m2", "last", "mr_sum", "mr_n")
+
+
+def _default_checkpoint_path() -> str:
+    path = STREAM_MONITOR_CONFIG['checkpoint_path']
+    return path if os.path.isabs(path) else os.path.join(PROJECT_ROOT, path)
+
+
+def _exclusive_cumsum(values: np.ndarray, start_idx: np.ndarray, group_sizes: np.ndarray) -> np.ndarray:
+    """그룹(연속된 행) 안에서 자기 앞 점들까지의 누적합"""
+    inclusive = np.cumsum(values)
+    before = inclusive - values
+    return before - np.repeat(before[start_idx], group_sizes)
+
+
+class ImrMonitor:
+    """
+    관리번호별 I-MR 한계를 온라인으로 갱신하며 새 측정값을 판정하는 모니터
+
+    상태는 관리번호 slot 위치의 numpy 배열로 보관하며 (관리번호 수에 비례, 측정 점 수와 무관)
+    update는 micro-batch 전체를 한 번에 처리한다.
+    """
+
+    def __init__(self, min_points: Optional[int] = None):
+        self.min_points = min_points if min_points is not None else STREAM_MONITOR_CONFIG['min_points']
+        self._codes = []
+        self._slots: Dict = {}
+        self._state = {name: np.zeros(0, dtype=np.int64 if name in ("n", "mr_n") else float)
+                       for name in _STATE_FIELDS}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __contains__(self, code) -> bool:
+        return code in self._slots
+
+    def _slot_array(self, uniques) -> np.ndarray:
+        # 관리번호 -> slot 위치 (처음 보는 관리번호는 slot 추가, 배열은 2배씩 확장)
+        slots = np.empty(len(uniques), dtype=np.int64)
+        for k, code in enumerate(uniques):
+            slot = self._slots.get(code)
+            if slot is None:
+                slot = self._slots[code] = len(self._codes)
+                self._codes.append(code)
+            slots[k] = slot
+        capacity = len(self._state["n"])
+        if len(self._codes) > capacity:
+            new_capacity = max(len(self._codes), 2 * capacity, 64)
+            for name, arr in self._state.items():
+                grown = np.zeros(new_capacity, dtype=arr.dtype)
+                grown[:capacity] = arr
+                if name == "last":
+                    grown[capacity:] = np.nan
+                self._state[name] = grown
+        return slots
+
+    def update(self, codes, values, timestamps=None) -> pd.DataFrame:
+        """
+        측정값 micro-batch 판정 후 상태 갱신
+
+        Args:
+            codes (array): 관리번호
+            values (array): 측정값 (결측 값 / 관리번호가 없는 점은 판정 / 상태 갱신 제외)
+            timestamps (array, optional): 측정일자 (위반 결과에 포함)
+
+        Returns:
+            pd.DataFrame: 위반 점 (입력 순서) - 관리번호, [측정일자], 측정값, CL, UCL, LCL, n
+            n은 판정에 사용한 이전 점 수
+        """
+        codes = np.asarray(codes, dtype=object)
+        values = np.asarray(values, dtype=float)
+        # 관리번호가 없는 점은 factorize 코드 -1이 되어 다른 관리번호 slot에 섞이므로 제외
+        valid = ~np.isnan(values) & pd.notna(codes)
+        if not valid.all():
+            codes, values = codes[valid], values[valid]
+            if timestamps is not None:
+                timestamps = np.asarray(timestamps)[valid]
+        columns = ["관리번호"] + (["측정일자"] if timestamps is not None else []) + ["측정값", "CL", "UCL", "LCL", "n"]
+        if len(values) == 0:
+            return pd.DataFrame(columns=columns)
+
+        with self._lock:
+            row_codes, uniques = pd.factorize(codes)
+            slots = self._slot_array(uniques)[row_codes]
+
+            # 관리번호별로 모으되 같은 관리번호 안에서는 입력 순서 유지
+            order = np.argsort(slots, kind="stable")
+            s, x = slots[order], values[order]
+            starts = np.ones(len(s), dtype=bool)
+            starts[1:] = s[1:] != s[:-1]
+            start_idx = np.flatnonzero(starts)
+            group_sizes = np.diff(np.append(start_idx, len(s)))
+            group_slots = s[start_idx]
+            position = np.arange(len(s)) - np.repeat(start_idx, group_sizes)
+
+            state = self._state
+            n0, mean0 = state["n"][s], state["mean"][s]
+
+            # 이동범위 (그룹 첫 점은 저장된 마지막 값과 비교)
+            prev = np.empty_like(x)
+            prev[1:] = x[:-1]
+            prev[start_idx] = state["last"][group_slots]
+            mr = np.abs(x - prev)
+            mr_valid = ~np.isnan(mr)
+            mr_filled = np.where(mr_valid, mr, 0.0)
+
+            # 각 점 직전까지의 평균 / MR-bar (이전 상태 + 같은 batch의 앞선 점)
+            n_prior = n0 + position
+            with np.errstate(divide="ignore", invalid="ignore"):
+                mean_prior = mean0 + _exclusive_cumsum(x - mean0, start_idx, group_sizes) / n_prior
+                mr_n_prior = state["mr_n"][s] + _exclusive_cumsum(mr_valid.astype(np.int64), start_idx, group_sizes)
+                mr_sum_prior = state["mr_sum"][s] + _exclusive_cumsum(mr_filled, start_idx, group_sizes)
+                sigma_prior = mr_sum_prior / mr_n_prior / _D2
+            ucl = mean_prior + 3 * sigma_prior
+            lcl = mean_prior - 3 * sigma_prior
+            judged = (n_prior >= max(self.min_points, 2)) & (mr_n_prior > 0)
+            violated = judged & ((x > ucl) | (x < lcl))
+
+            # 상태 갱신 (batch 평균 / 편차 제곱합을 Chan 병합식으로 합침)
+            group_ids = np.repeat(np.arange(len(start_idx)), group_sizes)
+            batch_mean = np.bincount(group_ids, weights=x) / group_sizes
+            batch_m2 = np.bincount(group_ids, weights=(x - batch_mean[group_ids]) ** 2)
+            old_n = state["n"][group_slots]
+            old_mean = state["mean"][group_slots]
+            new_n = old_n + group_sizes
+            delta = batch_mean - old_mean
+            state["mean"][group_slots] = old_mean + delta * group_sizes / new_n
+            state["m2"][group_slots] += batch_m2 + delta ** 2 * old_n * group_sizes / new_n
+            state["n"][group_slots] = new_n
+            state["last"][group_slots] = x[start_idx + group_sizes - 1]
+            state["mr_sum"][group_slots] += np.bincount(group_ids, weights=mr_filled)
+            state["mr_n"][group_slots] += np.bincount(group_ids, weights=mr_valid).astype(np.int64)
+
+        hits = np.flatnonzero(violated)
+        input_rows = order[hits]
+        result = {"관리번호": codes[input_rows]}
+        if timestamps is not None:
+            result["측정일자"] = np.asarray(timestamps)[input_rows]
+        result.update({"측정값": x[hits], "CL": mean_prior[hits], "UCL": ucl[hits], "LCL": lcl[hits],
+                       "n": n_prior[hits]})
+        return pd.DataFrame(result, columns=columns).iloc[np.argsort(input_rows, kind="stable")].reset_index(drop=True)
+
+    def add(self, code, value, timestamp=None) -> Optional[Dict]:
+        """
+        측정값 1개 판정 후 상태 갱신 (Welford 갱신, O(1), 측정값이나 관리번호가 없으면 무시)
+
+        Returns:
+            dict: 위반이면 update 결과와 같은 키의 dict, 아니면 None
+        """
+        if value is None or np.isnan(value) or pd.isna(code):
+            return None
+        value = float(value)
+        with self._lock:
+            slot = self._slots.get(code)
+            if slot is None:
+                slot = int(self._slot_array([code])[0])
+            state = self._state
+            n, mean, last = int(state["n"][slot]), state["mean"][slot], state["last"][slot]
+            mr_sum, mr_n = state["mr_sum"][slot], int(state["mr_n"][slot])
+
+            violation = None
+            if n >= max(self.min_points, 2) and mr_n > 0:
+                sigma = mr_sum / mr_n / _D2
+                ucl, lcl = mean + 3 * sigma, mean - 3 * sigma
+                if value > ucl or value < lcl:
+                    violation = {"관리번호": code, "측정값": value, "CL": mean, "UCL": ucl, "LCL": lcl, "n": n}
+                    if timestamp is not None:
+                        violation["측정일자"] = timestamp
+
+            n += 1
+            delta = value - mean
+            state["mean"][slot] = mean + delta / n
+            state["m2"][slot] += delta * (value - state["mean"][slot])
+            state["n"][slot] = n
+            if not np.isnan(last):
+                state["mr_sum"][slot] += abs(value - last)
+                state["mr_n"][slot] += 1
+            state["last"][slot] = value
+        return violation
+
+    def limits(self) -> pd.DataFrame:
+        """
+        관리번호별 현재 관리 한계
+
+        Returns:
+            pd.DataFrame: 관리번호, n, Mean, Std (전체 표준편차), MR-bar, Sigma, UCL, LCL
+        """
+        k = len(self._codes)
+        state = {name: arr[:k] for name, arr in self._state.items()}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mr_bar = state["mr_sum"] / state["mr_n"]
+            std = np.sqrt(state["m2"] / (state["n"] - 1))
+        sigma = mr_bar / _D2
+        return pd.DataFrame({
+            "관리번호": self._codes, "n": state["n"], "Mean": state["mean"], "Std": std, "MR-bar": mr_bar,
+            "Sigma": sigma, "UCL": state["mean"] + 3 * sigma, "LCL": state["mean"] - 3 * sigma
+        })
+
+    def save(self, path: Optional[str] = None) -> str:
+        """상태를 체크포인트 파일에 저장 (임시 파일에 쓴 뒤 교체)"""
+        path = path or _default_checkpoint_path()
+        with self._lock:
+            k = len(self._codes)
+            snapshot = {"min_points": self.min_points, "codes": list(self._codes),
+                        "state": {name: arr[:k].copy() for name, arr in self._state.items()}}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Optional[str] = None, min_points: Optional[int] = None) -> "ImrMonitor":
+        """체크포인트에서 모니터 복원 (파일이 없으면 빈 모니터)"""
+        path = path or _default_checkpoint_path()
+        if not os.path.exists(path):
+            return cls(min_points)
+        with open(path, "rb") as f:
+            snapshot = pickle.load(f)
+        monitor = cls(min_points if min_points is not None else snapshot["min_points"])
+        monitor._codes = list(snapshot["codes"])
+        monitor._slots = {code: slot for slot, code in enumerate(monitor._codes)}
+        monitor._state = {name: np.asarray(arr).copy() for name, arr in snapshot["state"].items()}
+        return monitor
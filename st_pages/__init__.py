@@ -3,4 +3,5 @@ from .data_upload import data_upload_page
 from .data_verification import data_verification_page
 from .quality_analysis import quality_analysis_page
 from .download_data import download_data_page
-from .settings import settings_page
\ No newline at end of file
+from .settings import settings_page
+from .profiling_panel import profiling_sidebar
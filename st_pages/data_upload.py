@@ -1,9 +1,16 @@
+import uuid
+
 import streamlit as st
 import pandas as pd
 from datetime import date, timedelta
 
 # 모듈 import
-from modules.data_transformer import transform_data
+from modules.data_transformer import memory_report
+from modules.conversion_jobs import job_manager, QUEUED, FAILED
+from modules.measurement_store import measurement_store
+from modules.data_utils import set_session_frame
+from modules.result_cache import hash_bytes
+from config import INCREMENTAL_CONFIG, MEASUREMENT_STORE_CONFIG, BACKGROUND_JOB_CONFIG
 
 
 def data_upload_page():
@@ -24,7 +31,8 @@ def data_upload_page():
 
     # 🔹 위젯으로부터 직접 읽어오기 (key 사용, 수동 할당 금지)
     with file_col1:
-        st.file_uploader("📄 Upload Measurement Excel File", type=["xlsx", "xls"], key="input_file")
+        st.file_uploader("📄 Upload Measurement File (Excel, or long-form CSV / Parquet)",
+                         type=["xlsx", "xls", "csv", "parquet"], key="input_file")
 
     with file_col2:
         st.file_uploader("📄 Upload Master Excel File", type=["xlsx"], key="master_file")
@@ -41,6 +49,9 @@ def data_upload_page():
     with date_col2:
         st.date_input("End Date", value=st.session_state.get("end_date", default_end), key="end_date")
 
+    st.checkbox("♻️ Incremental re-ingestion (convert only new/changed date columns)",
+                value=st.session_state.get("incremental", INCREMENTAL_CONFIG['enabled']), key="incremental")
+
     # 위젯 값들은 session_state에서 읽기
     input_file = st.session_state.get("input_file")
     master_file = st.session_state.get("master_file")
@@ -49,16 +60,56 @@ def data_upload_page():
 
     # 모든 입력이 있을 때 처리
     if input_file and master_file and start_date and end_date:
+        # 변환은 백그라운드 작업으로 실행 (같은 입력이면 rerun마다 새로 시작하지 않고 기존 작업을 사용)
+        job_key = job_manager.job_key(input_file.getvalue(), master_file.getvalue(), start_date, end_date,
+                                      incremental=st.session_state.get("incremental"))
+        subscriber = _job_subscriber()
+        previous_key = st.session_state.get("conversion_job_key")
+        if previous_key and previous_key != job_key:
+            # 입력이 바뀌면 이 세션은 이전 작업이 더 이상 필요 없음 (다른 세션이 기다리면 계속 실행)
+            job_manager.release(previous_key, subscriber)
+
+        if st.session_state.get("cancelled_job_key") == job_key:
+            st.warning("⏹️ Conversion cancelled.")
+            if st.button("🔁 Restart conversion"):
+                st.session_state.cancelled_job_key = None
+                st.rerun()
+            return
+
+        job = job_manager.submit(input_file.getvalue(), master_file.getvalue(), start_date, end_date,
+                                 incremental=st.session_state.get("incremental"), subscriber=subscriber)
+        st.session_state.conversion_job_key = job.key
+
+        if not job.finished:
+            _conversion_progress(job.key)
+            return
+
+        if job.status == FAILED:
+            st.error(f"❌ Error during data conversion: {job.error}")
+            return
+
+        result = job_manager.result(job.key)
+        if result is None:
+            # 결과가 변환 결과 캐시에서 밀려남 - 다시 실행하면 새 백그라운드 작업으로 변환
+            st.rerun()
 
         try:
-            transformed_df = transform_data(
-                input_file=input_file,
-                master_file=master_file,
-                start_date=start_date,
-                end_date=end_date
-            )
-
-            st.success("✅ Success!")
+            transformed_df, master_df = result
+            # 같은 작업 결과는 같은 버전으로 저장 (검증 결과 캐시 재사용)
+            set_session_frame("master_data", master_df, hash_bytes(master_file.getvalue()))
+            set_session_frame("transformed_data", transformed_df, job.key)
+
+            st.success(f"✅ Success! ({job.elapsed:.1f}s)")
+
+            # 누적 저장소에 저장 (rerun마다 다시 쓰지 않도록 같은 업로드/기간은 한 번만 저장)
+            if MEASUREMENT_STORE_CONFIG['enabled']:
+                store_key = (getattr(input_file, "file_id", input_file.name),
+                             getattr(master_file, "file_id", master_file.name), start_date, end_date)
+                if st.session_state.get("stored_upload_key") != store_key:
+                    store_summary = measurement_store.append(transformed_df, master_df)
+                    st.session_state.stored_upload_key = store_key
+                    st.info(f"🗄️ Saved {store_summary['rows_written']} rows to the measurement store "
+                            f"({store_summary['rows_replaced']} existing rows replaced)")
 
             # 데이터 미리보기
             st.subheader("📊 Preview converted data")
@@ -68,5 +119,31 @@ def data_upload_page():
             st.write(f"🔢 Total rows: {len(transformed_df)}")
             st.write(f"🔠 Total columns: {len(transformed_df.columns)}")
 
+            with st.expander("💾 Memory usage"):
+                st.dataframe(memory_report(transformed_df))
+
         except Exception as e:
-            st.error(f"❌ Error during data conversion: {e}")
\ No newline at end of file
+            st.error(f"❌ Error during data conversion: {e}")
+
+
+# 변환 작업 구독자 식별값 (세션마다 하나)
+def _job_subscriber() -> str:
+    if "conversion_subscriber" not in st.session_state:
+        st.session_state.conversion_subscriber = uuid.uuid4().hex
+    return st.session_state.conversion_subscriber
+
+
+# 진행 중인 변환 작업 표시 (이 부분만 주기적으로 다시 그려서 페이지의 다른 위젯은 그대로 사용 가능)
+@st.fragment(run_every=BACKGROUND_JOB_CONFIG['poll_interval_s'])
+def _conversion_progress(job_key: str):
+    job = job_manager.get(job_key)
+    if job is None or job.finished:
+        # 완료되면 전체 페이지를 다시 그려 결과 표시
+        st.rerun()
+
+    label = "⏳ Waiting for a free worker..." if job.status == QUEUED else f"🔄 Converting: {job.stage}"
+    st.progress(job.progress, text=f"{label} ({job.elapsed:.1f}s)")
+    if st.button("⏹️ Cancel conversion"):
+        job_manager.release(job_key, _job_subscriber())
+        st.session_state.cancelled_job_key = job_key
+        st.rerun()
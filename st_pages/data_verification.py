@@ -5,7 +5,7 @@ import numpy as np
 
 from modules import transform_data
 # 모듈 import
-from modules.data_utils import get_spec_from_master, verify_data, get_spec_for_measured_ctq
+from modules.data_utils import get_spec_from_master, verify_data, get_spec_for_measured_ctq, get_spec_verification
 
 def data_verification_page():
     """이상 데이터 검증 페이지 (Anomaly Data Verification Page)"""
@@ -27,7 +27,8 @@ def data_verification_page():
         st.info("Specification information not found.")
 
     # 이상치 탐지 옵션
-    verify_result_df, add_spec_over_df = verify_data()
+    # merged 데이터(전체 + 스펙 컬럼)는 다운로드할 때만 생성
+    verify_result_df, _ = verify_data(with_merged=False)
 
     st.subheader("📊 Over Specification Detection Results")
     st.write(f"Total number of data: {len(df)}")
@@ -37,6 +38,8 @@ def data_verification_page():
         return
 
     st.write(f"Number of data exceeded specification: {len(verify_result_df)}")
+    # verify_data와 같은 캐시된 검증 결과 (UCL/LCL 위반, 관리번호별 건수 포함)
+    verification = get_spec_verification()
 
     if verify_result_df.empty:
         st.success("✅ No over-spec data")
@@ -44,14 +47,23 @@ def data_verification_page():
         st.error("❗Exceeded Specification Data Exists.")
         st.dataframe(verify_result_df)
 
-        # 엑셀로 다운로드 버튼 추가
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-            add_spec_over_df.to_excel(writer, index=False, sheet_name='Spec Over Data')
+        # 엑셀로 다운로드 버튼 추가 (클릭 시 생성)
+        def spec_over_excel() -> bytes:
+            add_spec_over_df = verification.merged(df)
+            output = io.BytesIO()
+            with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+                add_spec_over_df.to_excel(writer, index=False, sheet_name='Spec Over Data')
+            return output.getvalue()
 
         st.download_button(
             label="📥 Download over-spec data Excel",
-            data=output.getvalue(),
+            data=spec_over_excel,
             file_name="spec_over_data.xlsx",
             mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
\ No newline at end of file
+        )
+
+    # 관리번호별 스펙(USL/LSL) / 관리 한계(UCL/LCL) 위반 건수
+    if verification is not None:
+        st.subheader("🚦 Limit violations by management number")
+        st.write(f"Number of data outside control limits (UCL/LCL): {int(verification.counts['Control NG'].sum())}")
+        st.dataframe(verification.counts, hide_index=True)
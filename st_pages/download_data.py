@@ -47,7 +47,7 @@ def download_data_page():
         return
 
     # 스펙 오버 데이타가 포함되어 있으면 다운로드 안되게...
-    verify_result_df, _ = verify_data()
+    verify_result_df, _ = verify_data(with_merged=False)
     if not verify_result_df.empty:
         st.warning("""
         You can't download it because it includes Spec over Data. Check the data.
@@ -57,8 +57,12 @@ def download_data_page():
         return
 
     df = st.session_state.transformed_data
-    df["2차업체명"] = df["2차업체명"].replace("nan", "")
-    df["Part No"] = df["Part No"].replace("nan", "")
+    # category 컬럼은 새 값("")으로 바로 replace할 수 없으므로 object로 바꿔 처리 후 다시 category로 변환
+    for col in ["2차업체명", "Part No"]:
+        is_category = isinstance(df[col].dtype, pd.CategoricalDtype)
+        df[col] = df[col].astype(object).replace("nan", "")
+        if is_category:
+            df[col] = df[col].astype('category')
 
     # 다운로드 옵션
     download_type = st.selectbox("Select data to download", [
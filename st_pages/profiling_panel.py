@@ -0,0 +1,36 @@
+import streamlit as st
+
+# 모듈 import
+from modules.profiler import profiler
+
+
+def profiling_sidebar():
+    """사이드바 단계별 실행 시간 패널 (Profiling Panel)"""
+    # 프로파일러(tracemalloc 포함)는 서버 프로세스 전체에 적용되므로 세션에서 켜고 끄지 않고
+    # 운영자가 config.PROFILE_CONFIG['enabled']로 켰을 때만 패널을 표시 (모든 세션의 기록을 함께 보여줌)
+    if not profiler.enabled:
+        return
+
+    with st.sidebar.expander("⏱️ Stage timings (all sessions)", expanded=False):
+        st.caption("Profiling is enabled for the whole server in PROFILE_CONFIG. "
+                   f"Peak memory tracking: {'on' if profiler.track_memory else 'off'} "
+                   "(peaks are process-wide; peak_shared marks stages that overlapped other threads)")
+
+        last_runs = st.number_input("Recent runs", min_value=1, max_value=50, value=5, key="profiling_last_runs")
+        records_df = profiler.to_dataframe(last_runs=int(last_runs))
+        if records_df.empty:
+            st.info("No stages recorded yet.")
+            return
+
+        # 단계 깊이만큼 들여쓰기해서 표시
+        records_df["stage"] = ["  " * depth + name for depth, name in zip(records_df["depth"], records_df["stage"])]
+        columns = [c for c in ["run_id", "stage", "wall_s", "rows_in", "rows_out", "peak_mb", "peak_shared"]
+                   if c in records_df.columns]
+        st.dataframe(records_df[columns], hide_index=True)
+
+        st.download_button(
+            label="📥 Export JSON",
+            data=profiler.to_json(last_runs=int(last_runs)),
+            file_name="profiling.json",
+            mime="application/json"
+        )
@@ -1,37 +1,125 @@
 import streamlit as st
 
-from modules.data_utils import get_spec_for_measured_ctq
+from modules.data_utils import get_master_spec_index, get_measured_codes, get_imr_overview, get_capability_report
+from modules.master_index import SpecIndex
 from modules.statistics_analyzer import basic_statistics, normality_test
-from modules.control_chart import create_imr_chart, create_xbar_r_chart
+from modules.control_chart import create_imr_chart, create_xbar_r_chart, create_xbar_s_chart, build_subgroups
+from modules.run_rules import NELSON_RULES
+from modules.chart_render import RENDER_MODES, figure_payload_size
 from modules.capability_analysis import process_capability_histogram
 from modules.boxplot_trend import create_boxplot, trend_analysis
+from modules.measurement_store import measurement_store
+import io
+
 import numpy as np
+import pandas as pd
+
+from config import ANALYSIS_OPTIONS
+
+
+# 가변 크기 부분군 기준 컬럼 후보 (측정 데이터에 있는 컬럼만 표시)
+SUBGROUP_KEYS = ['측정일자', '측정자', '측정장비', '모델명']
+
+
+# 관리도 렌더링 정보 표시 함수 (렌더링 모드, 그린 점 수, 브라우저로 보내는 JSON 크기)
+def _chart_render_caption(fig):
+    meta = fig.layout.meta or {}
+    st.caption(f"{meta.get('render_mode', 'standard')} rendering · "
+               f"{meta.get('points_drawn', 0):,} of {meta.get('points', 0):,} points drawn · "
+               f"payload {figure_payload_size(fig) / 1024:,.0f} KB")
+
+
+# 전체 관리번호 요약 표에서 행을 선택하면 상세 관리도의 관리번호를 바꾸는 함수
+def _select_overview_row():
+    rows = st.session_state.imr_overview_table.selection.rows
+    if rows:
+        st.session_state.selected_ctq = get_imr_overview()['관리번호'].iloc[rows[0]]
+
+
+# 전체 관리번호 공정능력 표 + 엑셀 다운로드 (업체 전체 등급 확인용)
+def _capability_report_section():
+    with st.expander("🏷️ Capability report (all management numbers)"):
+        report = get_capability_report()
+        if report.empty:
+            st.info("Master data is required to build the capability report.")
+            return
+        grades = report.loc[report['Grade'] != '', 'Grade'].value_counts().reindex(
+            list(ANALYSIS_OPTIONS['capability_grades']), fill_value=0)
+        st.caption(" · ".join(f"{grade}: {count:,}" for grade, count in grades.items())
+                   + f" · no spec: {int((report['Grade'] == '').sum()):,}")
+        st.dataframe(report, hide_index=True, use_container_width=True)
+
+        # 엑셀로 다운로드 (클릭 시 생성)
+        def capability_excel() -> bytes:
+            output = io.BytesIO()
+            with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+                report.to_excel(writer, index=False, sheet_name='Capability')
+            return output.getvalue()
+
+        st.download_button(
+            label="📥 Download capability report Excel",
+            data=capability_excel,
+            file_name="capability_report.xlsx",
+            mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        )
 
 
 def quality_analysis_page():
     """품질 분석 페이지 (Quality Analysis Page)"""
     st.header("📊 Quality Analysis")
 
-    if st.session_state.transformed_data is None or st.session_state.transformed_data.empty:
-        st.warning("Please upload and convert the data first.")
-        return
-
-    df = st.session_state.transformed_data
-
-    ctq_options = df['관리번호'].unique().tolist()
-    selected_ctq = st.selectbox("Select an management number to analyze", ctq_options)
-    filtered_df = df[df['관리번호'] == selected_ctq]
+    source = st.radio("Data source", ["Current upload", "Measurement store"], horizontal=True)
+
+    if source == "Measurement store":
+        # 누적 저장소에서는 선택한 관리번호·기간의 월 파티션만 읽음
+        store_codes = measurement_store.list_codes()
+        if not store_codes:
+            st.warning("The measurement store is empty. Please upload and convert the data first.")
+            return
+
+        selected_ctq = st.selectbox("Select an management number to analyze", store_codes)
+        date_col1, date_col2 = st.columns(2)
+        with date_col1:
+            store_start = st.date_input("Start Date", value=None, key="store_start_date")
+        with date_col2:
+            store_end = st.date_input("End Date", value=None, key="store_end_date")
+        filtered_df = measurement_store.read(selected_ctq, store_start, store_end)
+    else:
+        if st.session_state.transformed_data is None or st.session_state.transformed_data.empty:
+            st.warning("Please upload and convert the data first.")
+            return
+
+        df = st.session_state.transformed_data
+
+        # 전체 관리번호 I-MR 요약 (열 머리글로 정렬, 행을 선택하면 아래 상세 분석으로 이동)
+        with st.expander("📋 Control limit overview (all management numbers)"):
+            overview = get_imr_overview()
+            st.dataframe(overview, hide_index=True, key="imr_overview_table", on_select=_select_overview_row,
+                         selection_mode="single-row", use_container_width=True)
+            st.caption(f"{len(overview):,} management numbers · "
+                       f"{int((overview['Out of control'] > 0).sum()):,} with out-of-control points · "
+                       f"{int((overview['Rule violations'] > 0).sum()):,} with Nelson rule violations (rules 1-8)")
+
+        ctq_options = get_measured_codes().tolist()
+        if st.session_state.get("selected_ctq") not in ctq_options:
+            st.session_state.pop("selected_ctq", None)
+        selected_ctq = st.selectbox("Select an management number to analyze", ctq_options, key="selected_ctq")
+        filtered_df = df[df['관리번호'] == selected_ctq]
 
     if filtered_df.empty:
         st.info("There is no data for the selected management number.")
         return
 
-    filtered_spec = get_spec_for_measured_ctq()
-    selected_spec = filtered_spec[filtered_spec['관리번호'] == selected_ctq]
+    # 선택한 관리번호의 스펙 (업로드 데이터는 Master 버전별 스펙 인덱스에서 바로 조회)
+    if source == "Measurement store":
+        spec_index = SpecIndex(measurement_store.read_specs([selected_ctq]))
+    else:
+        spec_index = get_master_spec_index()
+    selected_spec = spec_index.get(selected_ctq) if spec_index is not None else None
 
-    usl = selected_spec['USL'].values[0] if 'USL' in selected_spec.columns and not selected_spec['USL'].isnull().all() else None
-    lsl = selected_spec['LSL'].values[0] if 'LSL' in selected_spec.columns and not selected_spec['LSL'].isnull().all() else None
-    target = selected_spec['Target'].values[0] if 'Target' in selected_spec.columns and not selected_spec['Target'].isnull().all() else None
+    usl = selected_spec.USL if selected_spec else None
+    lsl = selected_spec.LSL if selected_spec else None
+    target = selected_spec.Target if selected_spec else None
 
     st.write(f"🔍 Selected CTQ: **{selected_ctq}**")
     st.write(f"Number of data: {len(filtered_df)}")
@@ -53,21 +141,36 @@ def quality_analysis_page():
         st.dataframe(normal_df)
 
     with tab2:
+        selected_rules = st.multiselect(
+            "Nelson rules to highlight", list(NELSON_RULES), default=[],
+            format_func=lambda rule: f"Rule {rule}: {NELSON_RULES[rule]}"
+        )
+        render_mode = st.radio("Chart rendering", RENDER_MODES, horizontal=True,
+                               help="fast: WebGL + LTTB downsampling (outliers always kept), auto: fast for long series")
+
         st.subheader("📉 I-MR control chart")
-        imr_x = filtered_df['측정일자'].tolist() if '측정일자' in filtered_df.columns else list(range(len(filtered_df)))
-        fig, imr_summary = create_imr_chart(filtered_df['측정값'].to_numpy(), x=imr_x, return_summary=True, show_outliers=True)
+        # 결측 측정값은 전체 관리번호 요약(imr_summary_by_group)과 같이 제외하고 이동범위 계산 (두 표의 한계가 같도록)
+        imr_df = filtered_df[filtered_df['측정값'].notna()]
+        imr_x = imr_df['측정일자'].tolist() if '측정일자' in imr_df.columns else list(range(len(imr_df)))
+        fig, imr_summary = create_imr_chart(imr_df['측정값'].to_numpy(), x=imr_x, return_summary=True, show_outliers=True,
+                                            rules=selected_rules, render_mode=render_mode)
         st.plotly_chart(fig, use_container_width=True)
+        _chart_render_caption(fig)
         st.markdown("**Chart Summary Results**")
         st.dataframe(imr_summary)
 
-        st.subheader("📏 X-bar & R control chart")
-        group_size = st.number_input("샘플 크기 (X-bar 관리도용)", min_value=2, max_value=20, value=5)
-        values = filtered_df['측정값'].to_numpy()
-        num_groups = len(values) // group_size
-
-        if num_groups < 2:
-            st.warning("At least two sample groups are required to draw an X-bar chart.")
-        else:
+        # 부분군 관리도 종류 (Xbar-R: 부분군 크기 25까지, Xbar-S: 제한 없음)
+        subgroup_chart = st.radio("Subgroup chart", [c for c in ANALYSIS_OPTIONS['control_chart_types'] if c != 'i-MR'],
+                                  horizontal=True)
+        use_s_chart = subgroup_chart == 'Xbar-S'
+        st.subheader("📏 X-bar & S control chart" if use_s_chart else "📏 X-bar & R control chart")
+        # 부분군 구성: 측정일자 등 key 값이 같은 측정값끼리 (가변 크기) 또는 고정 크기로 순서대로 자름
+        subgroup_keys = [col for col in SUBGROUP_KEYS if col in filtered_df.columns]
+        subgroup_by = st.selectbox("Subgroup by", subgroup_keys + ["Fixed size"])
+        if subgroup_by == "Fixed size":
+            group_size = st.number_input("샘플 크기 (X-bar 관리도용)", min_value=2, max_value=100 if use_s_chart else 25, value=5)
+            values = filtered_df['측정값'].to_numpy()
+            num_groups = len(values) // group_size
             grouped_data = values[:num_groups * group_size].reshape(num_groups, group_size)
             group_dates = (
                 filtered_df['측정일자'].iloc[:num_groups * group_size]
@@ -75,15 +178,42 @@ def quality_analysis_page():
                 .first().tolist()
                 if '측정일자' in filtered_df.columns else list(range(num_groups))
             )
-            xbar_fig, r_fig, xbar_summary, r_summary = create_xbar_r_chart(grouped_data, group_size, x=group_dates, return_summary=True, show_outliers=True)
-            st.plotly_chart(xbar_fig, use_container_width=True)
-            st.markdown("**X-bar Summary Results**")
-            st.dataframe(xbar_summary)
-            st.plotly_chart(r_fig, use_container_width=True)
-            st.markdown("**R Summary Results**")
-            st.dataframe(r_summary)
+            # 고정 크기 부분군은 첫 측정일자(없으면 순번)를 x축으로 사용
+            group_axis_title = '측정일자' if '측정일자' in filtered_df.columns else '샘플 그룹'
+        else:
+            grouped_data = build_subgroups(filtered_df, key=subgroup_by)
+            # x축 제목은 부분군 기준 컬럼 (Subgroups.key)
+            group_size, group_dates, group_axis_title = None, None, None
+            num_groups = int((grouped_data.sizes >= 2).sum())
+            if num_groups:
+                st.caption(f"{num_groups:,} subgroups of size {grouped_data.sizes[grouped_data.sizes >= 2].min()}"
+                           f"-{grouped_data.sizes.max()} (single-measurement subgroups are excluded)")
+
+        if num_groups < 2:
+            st.warning("At least two sample groups are required to draw an X-bar chart.")
+        else:
+            create_chart = create_xbar_s_chart if use_s_chart else create_xbar_r_chart
+            try:
+                xbar_fig, r_fig, xbar_summary, r_summary = create_chart(grouped_data, group_size, x=group_dates, return_summary=True, show_outliers=True,
+                                                                        rules=selected_rules, render_mode=render_mode,
+                                                                        x_title=group_axis_title)
+            except ValueError as e:
+                # Xbar-R은 부분군 크기 25까지만 지원
+                st.warning(str(e))
+            else:
+                st.plotly_chart(xbar_fig, use_container_width=True)
+                _chart_render_caption(xbar_fig)
+                st.markdown("**X-bar Summary Results**")
+                st.dataframe(xbar_summary)
+                st.plotly_chart(r_fig, use_container_width=True)
+                _chart_render_caption(r_fig)
+                st.markdown("**S Summary Results**" if use_s_chart else "**R Summary Results**")
+                st.dataframe(r_summary)
 
     with tab3:
+        if source != "Measurement store":
+            _capability_report_section()
+
         st.subheader("🏭 Process capability analysis")
         if usl is not None and lsl is not None and target is not None:
             cap_fig, cap_indices = process_capability_histogram(filtered_df['측정값'].to_numpy(), usl, lsl)
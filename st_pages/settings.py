@@ -2,6 +2,10 @@ import streamlit as st
 
 # 모듈 import
 from modules.session_manager import reset_session_state
+from modules.data_transformer import get_transform_cache_stats, clear_transform_cache
+from modules.master_index import get_master_index_stats
+from modules.measurement_store import measurement_store
+from modules.conversion_jobs import job_manager
 
 def settings_page():
     """설정 페이지 (Settings Page)"""
@@ -10,4 +14,33 @@ def settings_page():
     # 세션 초기화 버튼
     if st.button("Initialize all session data", type="primary"):
         reset_session_state()
-        st.success("Session data initialized.")
\ No newline at end of file
+        st.success("Session data initialized.")
+
+    # 변환 결과 캐시 상태
+    st.subheader("Conversion cache")
+    st.json(get_transform_cache_stats())
+    st.caption("Master index cache")
+    st.json(get_master_index_stats())
+    st.caption("Background conversion jobs")
+    st.json(job_manager.stats())
+    if st.button("Clear conversion cache"):
+        clear_transform_cache()
+        st.success("Conversion cache cleared.")
+
+    # 측정 데이터 누적 저장소 상태
+    st.subheader("Measurement store")
+    st.caption(measurement_store.store_dir)
+    st.json(measurement_store.stats())
+    # 저장소는 모든 사용자가 공유하므로 확인 체크 후에만 삭제
+    confirm_clear = st.checkbox("I understand this deletes the stored history for every user",
+                                key="confirm_clear_store")
+    st.button("Clear measurement store", disabled=not confirm_clear, on_click=_clear_measurement_store)
+    if st.session_state.pop("measurement_store_cleared", False):
+        st.success("Measurement store cleared.")
+
+
+# 저장소 삭제 후 확인 체크 해제 (위젯 값은 다음 실행 전에 callback에서만 변경 가능)
+def _clear_measurement_store():
+    measurement_store.clear()
+    st.session_state.confirm_clear_store = False
+    st.session_state.measurement_store_cleared = True
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 프로젝트 루트(config.py, modules/)를 import 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
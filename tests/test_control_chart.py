@@ -0,0 +1,58 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.control_chart import (build_subgroups, create_xbar_r_chart, create_xbar_s_chart, xbar_r_constants,
+                                   xbar_s_constants)
+
+
+@pytest.mark.parametrize("n, c4, a3, b3, b4", [
+    (2, 0.7979, 2.659, 0.0, 3.267),
+    (5, 0.9400, 1.427, 0.0, 2.089),
+    (10, 0.9727, 0.975, 0.284, 1.716),
+    (25, 0.9896, 0.606, 0.565, 1.435)
+])
+def test_xbar_s_constants_match_table(n, c4, a3, b3, b4):
+    assert xbar_s_constants(n) == pytest.approx((c4, a3, b3, b4), abs=1e-3)
+
+
+@pytest.mark.parametrize("n, a2, d3, d4", [
+    (2, 1.880, 0.0, 3.267),
+    (5, 0.577, 0.0, 2.114),
+    (10, 0.308, 0.223, 1.777),
+    (25, 0.153, 0.459, 1.541)
+])
+def test_xbar_r_constants_match_table(n, a2, d3, d4):
+    assert xbar_r_constants(n) == pytest.approx((a2, d3, d4), abs=2e-3)
+
+
+def test_xbar_s_constants_large_subgroup():
+    c4, a3, _, _ = xbar_s_constants(500)
+    assert c4 == pytest.approx(1 - 1 / (4 * 499), abs=1e-5)
+    assert a3 == pytest.approx(3 / (c4 * math.sqrt(500)))
+
+
+@pytest.mark.parametrize("n", [1, 26])
+def test_xbar_r_constants_reject_unsupported_size(n):
+    with pytest.raises(ValueError):
+        xbar_r_constants(n)
+
+
+@pytest.mark.parametrize("create_chart", [create_xbar_r_chart, create_xbar_s_chart])
+@pytest.mark.parametrize("key", ["측정자", "측정일자"])
+def test_subgroup_axis_title_follows_key(create_chart, key):
+    df = pd.DataFrame({
+        "측정자": list("aabbccdd") * 2,
+        "측정일자": pd.to_datetime(["2024-04-01", "2024-04-02"] * 8),
+        "측정값": np.arange(16.0)
+    })
+    xbar_fig, range_fig = create_chart(build_subgroups(df, key=key))
+    assert xbar_fig.layout.xaxis.title.text == key
+    assert range_fig.layout.xaxis.title.text == key
+
+
+def test_subgroup_axis_title_argument_overrides_default():
+    xbar_fig, r_fig = create_xbar_r_chart(np.arange(20.0).reshape(5, 4), x=list(range(5)), x_title="샘플 그룹")
+    assert xbar_fig.layout.xaxis.title.text == r_fig.layout.xaxis.title.text == "샘플 그룹"
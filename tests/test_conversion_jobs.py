@@ -0,0 +1,53 @@
+import time
+
+import pytest
+
+from benchmarks.workbook_generator import generate_workbook_pair
+from modules.conversion_jobs import ConversionJob, ConversionJobManager, ConversionCancelled, DONE
+from modules.data_transformer import clear_transform_cache
+
+
+@pytest.fixture(scope="module")
+def workbook_bytes(tmp_path_factory):
+    input_path, master_path = generate_workbook_pair(str(tmp_path_factory.mktemp("jobs")), n_ctq=3, n_dates=10)
+    with open(input_path, "rb") as f_in, open(master_path, "rb") as f_master:
+        return f_in.read(), f_master.read()
+
+
+def _wait(job: ConversionJob, timeout: float = 60.0) -> None:
+    deadline = time.time() + timeout
+    while not job.finished and time.time() < deadline:
+        time.sleep(0.02)
+    assert job.finished
+
+
+def test_cancel_after_final_report_is_ignored():
+    job = ConversionJob("key")
+    job._cancel_event.set()
+    with pytest.raises(ConversionCancelled):
+        job._on_progress("filter_sort", 0.92)
+    job._on_progress("done", 1.0)
+
+
+def test_release_cancels_only_without_subscribers(workbook_bytes):
+    manager = ConversionJobManager(max_workers=1)
+    job = manager.submit(*workbook_bytes, subscriber="a")
+    assert manager.submit(*workbook_bytes, subscriber="b") is job
+    assert manager.release(job.key, "a") is False
+    _wait(job)
+    assert job.status == DONE
+
+
+def test_evicted_result_is_converted_again_in_background(workbook_bytes):
+    manager = ConversionJobManager(max_workers=1)
+    job = manager.submit(*workbook_bytes)
+    _wait(job)
+    transformed_df, master_df = manager.result(job.key)
+    assert len(transformed_df) > 0 and len(master_df) > 0
+
+    clear_transform_cache()
+    assert manager.result(job.key) is None
+    new_job = manager.submit(*workbook_bytes)
+    assert new_job is not job
+    _wait(new_job)
+    assert manager.result(new_job.key)[0].equals(transformed_df)
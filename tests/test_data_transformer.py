@@ -0,0 +1,144 @@
+import re
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.workbook_generator import generate_data_sheet, DEFAULT_INFO
+from modules.data_transformer import (
+    detect_date_header, extract_measurement_data, extract_measurement_data_streaming, get_date_mapping,
+    MEASUREMENT_COLUMNS
+)
+
+
+# 벡터화 이전(기준) 구현 - 결과가 같아야 함
+def _baseline_find_date_start_col(df, sample_row_count=10):
+    date_pattern = re.compile(r'^\d{1,4}[/.-]\d{1,2}([/.-]\d{2,4})?$')
+
+    def is_date(x):
+        if not isinstance(x, str):
+            return False
+        x = x.strip()
+        if date_pattern.match(x):
+            return True
+        try:
+            return pd.notna(pd.to_datetime(x, errors='coerce'))
+        except Exception:
+            return False
+
+    date_counts = [sum(df.iloc[:sample_row_count, col].astype(str).apply(is_date)) for col in range(df.shape[1])]
+    best_col = date_counts.index(max(date_counts))
+    if date_counts[best_col] == 0:
+        raise ValueError("No date column found")
+    return best_col
+
+
+def _baseline_find_date_row(df, date_start_col, min_date_count=1, max_row_check=20):
+    def is_date(x):
+        if isinstance(x, (pd.Timestamp, datetime)):
+            return True
+        if isinstance(x, str):
+            try:
+                pd.to_datetime(x)
+                return True
+            except Exception:
+                return False
+        return False
+
+    for i in range(min(max_row_check, len(df))):
+        if df.iloc[i, date_start_col:].apply(is_date).sum() >= min_date_count:
+            return i
+    raise ValueError("No date row found")
+
+
+def _baseline_extract(df, info_dict, date_mapping, date_row_index, search_cols=list(range(0, 11))):
+    results = []
+    search_cols = [col for col in search_cols if col < df.shape[1]]
+    point_indices = []
+    for i in range(date_row_index, len(df)):
+        for col in search_cols:
+            cell_value = df.iloc[i, col]
+            if "POINT" in str(cell_value).strip().upper():
+                if col + 1 < df.shape[1]:
+                    ctq_name = df.iloc[i, col + 1].replace('-', ' ').strip()
+                    if pd.notna(ctq_name):
+                        point_indices.append((i, ctq_name))
+                break
+
+    for idx, (start_idx, ctq_name) in enumerate(point_indices):
+        if idx + 1 < len(point_indices):
+            end_idx = point_indices[idx + 1][0]
+        else:
+            end_idx = start_idx + 1
+            while end_idx < len(df) and df.iloc[end_idx, min(date_mapping.keys()):].notna().sum() > 0:
+                end_idx += 1
+
+        for i in range(start_idx, end_idx):
+            for col in date_mapping:
+                raw_value = df.iloc[i, col]
+                if pd.notna(raw_value):
+                    value = str(raw_value).strip().replace("\xa0", "")
+                    try:
+                        value = float(value)
+                    except ValueError:
+                        value = None
+                    results.append({
+                        **{key: str(info_dict.get(key, "")).strip()
+                           for key in ['1차 업체명', '지역명', '2차업체명', '모델명', '측정자', '측정장비', '부품명']},
+                        'CTQ/P 관리항목명': str(ctq_name).strip(),
+                        '측정일자': date_mapping[col],
+                        '측정값': value,
+                        'Part No': str(info_dict.get("Part No", "")).strip()
+                    })
+    return pd.DataFrame(results)
+
+
+def _normalize(df):
+    df = df.reindex(columns=MEASUREMENT_COLUMNS).astype({col: object for col in MEASUREMENT_COLUMNS if col != '측정일자'})
+    df['측정값'] = pd.to_numeric(df['측정값'], errors='coerce').astype(float)
+    df['측정일자'] = pd.to_datetime(df['측정일자'])
+    return df.sort_values(['CTQ/P 관리항목명', '측정일자', '측정값'], kind='stable').reset_index(drop=True)
+
+
+@pytest.fixture(scope="module")
+def data_sheet():
+    df = generate_data_sheet(n_points=6, rows_per_point=3, n_dates=15, seed=3)
+    # 공백 / 특수공백 / 숫자가 아닌 값 / 하이픈이 있는 CTQ 명
+    point_col = next(col for col in range(df.shape[1]) if df.iloc[:, col].astype(str).str.upper().str.contains("POINT").any())
+    rows = df.index[df.iloc[:, point_col].astype(str).str.upper().str.contains("POINT")]
+    df.iat[rows[0], point_col + 1] = "CTQ-A-1"
+    first_date_col = detect_date_header(df)[1]
+    df.iat[rows[0] + 1, first_date_col] = " 12.5\xa0"
+    df.iat[rows[1] + 1, first_date_col + 1] = "N/A"
+    return df
+
+
+def test_detect_date_header_matches_baseline(data_sheet):
+    date_start_col = _baseline_find_date_start_col(data_sheet)
+    expected = (_baseline_find_date_row(data_sheet, date_start_col), date_start_col)
+    assert detect_date_header(data_sheet) == expected
+
+
+def test_extract_measurement_data_matches_baseline(data_sheet):
+    date_row_idx, date_start_col = detect_date_header(data_sheet)
+    date_map = get_date_mapping(data_sheet, date_row_idx, date_start_col)
+
+    expected = _baseline_extract(data_sheet, DEFAULT_INFO, date_map, date_row_idx)
+    actual = extract_measurement_data(data_sheet, DEFAULT_INFO, date_map, date_row_idx)
+
+    assert len(actual) == len(expected) > 0
+    pd.testing.assert_frame_equal(_normalize(actual), _normalize(expected))
+
+
+def test_streaming_reader_matches_dataframe_reader(data_sheet, tmp_path):
+    path = tmp_path / "data.xlsx"
+    with pd.ExcelWriter(path) as writer:
+        data_sheet.to_excel(writer, sheet_name="Data", header=False, index=False)
+    sheet = pd.read_excel(path, sheet_name="Data", header=None)
+    date_row_idx, date_start_col = detect_date_header(sheet)
+    date_map = get_date_mapping(sheet, date_row_idx, date_start_col)
+
+    expected = extract_measurement_data(sheet, DEFAULT_INFO, date_map, date_row_idx)
+    actual = extract_measurement_data_streaming(str(path), "Data", DEFAULT_INFO)
+    pd.testing.assert_frame_equal(_normalize(actual), _normalize(expected))
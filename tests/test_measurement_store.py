@@ -0,0 +1,41 @@
+import multiprocessing
+
+import pandas as pd
+
+from modules.measurement_store import MeasurementStore
+
+
+def _frame(code: str, dates, value: float) -> pd.DataFrame:
+    return pd.DataFrame({"관리번호": code, "측정일자": pd.to_datetime(dates), "측정값": value})
+
+
+def _append_days(store_dir: str, start_day: int) -> None:
+    store = MeasurementStore(store_dir)
+    for day in range(start_day, 28, 2):
+        store.append(_frame("K1", [f"2024-04-{day:02d}"], float(day)))
+
+
+def test_append_replaces_same_dates(tmp_path):
+    store = MeasurementStore(str(tmp_path))
+    store.append(_frame("K1", ["2024-04-01", "2024-04-02"], 1.0))
+    summary = store.append(_frame("K1", ["2024-04-02", "2024-04-03"], 2.0))
+
+    assert summary["rows_replaced"] == 1
+    df = store.read("K1")
+    assert df["측정일자"].dt.day.tolist() == [1, 2, 3]
+    assert df["측정값"].tolist() == [1.0, 2.0, 2.0]
+    assert store.stats()["rows"] == 3
+
+
+def test_concurrent_processes_keep_all_rows(tmp_path):
+    # 두 프로세스가 같은 파티션(K1, 2024-04)을 번갈아 고쳐 써도 행을 잃지 않아야 함
+    ctx = multiprocessing.get_context("spawn")
+    workers = [ctx.Process(target=_append_days, args=(str(tmp_path), start)) for start in (1, 2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(120)
+        assert worker.exitcode == 0
+
+    df = MeasurementStore(str(tmp_path)).read("K1")
+    assert df["측정일자"].dt.day.tolist() == list(range(1, 28))
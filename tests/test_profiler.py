@@ -0,0 +1,39 @@
+import threading
+
+from modules.profiler import Profiler
+
+
+def test_single_thread_peaks_are_not_shared():
+    profiler = Profiler(enabled=True, track_memory=True)
+    try:
+        with profiler.stage("outer"):
+            with profiler.stage("inner"):
+                data = [0] * 100_000
+        del data
+    finally:
+        profiler.disable()
+    records = profiler.records()
+    assert [r["stage"] for r in records] == ["outer", "inner"]
+    assert all(r["peak_mb"] is not None and "peak_shared" not in r for r in records)
+
+
+def test_overlapping_threads_mark_peaks_shared():
+    profiler = Profiler(enabled=True, track_memory=True)
+    started, release = threading.Event(), threading.Event()
+
+    def worker():
+        with profiler.stage("worker"):
+            started.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=worker)
+    try:
+        thread.start()
+        started.wait(5)
+        with profiler.stage("main"):
+            pass
+        release.set()
+        thread.join()
+    finally:
+        profiler.disable()
+    assert {r["stage"]: r.get("peak_shared") for r in profiler.records()} == {"worker": True, "main": True}
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from modules.run_rules import nelson_rules
+
+
+def _flagged(values, rule, groups=None):
+    return list(np.flatnonzero(nelson_rules(values, 0.0, 1.0, [rule], groups)[rule]))
+
+
+def test_rule_1_flags_single_point_beyond_3_sigma():
+    assert _flagged([0.0, 3.0, 3.1, -3.5, 0.0], 1) == [2, 3]
+
+
+def test_rule_2_flags_from_ninth_point_on_same_side():
+    assert _flagged([0.5] * 8 + [-0.5], 2) == []
+    assert _flagged([0.5] * 10, 2) == [8, 9]
+    assert _flagged([-0.5] * 9, 2) == [8]
+
+
+def test_rule_3_flags_sixth_increasing_point():
+    assert _flagged([0.1, 0.2, 0.3, 0.4, 0.5], 3) == []
+    assert _flagged([0.1, 0.2, 0.3, 0.4, 0.5, 0.6], 3) == [5]
+    assert _flagged([0.6, 0.5, 0.4, 0.4, 0.3, 0.2], 3) == []
+
+
+def test_rule_4_flags_fourteenth_alternating_point():
+    values = [0.5 if i % 2 else -0.5 for i in range(14)]
+    assert _flagged(values[:13], 4) == []
+    assert _flagged(values, 4) == [13]
+
+
+def test_rule_5_and_6_count_points_in_window():
+    assert _flagged([2.5, 0.0, 2.5], 5) == [2]
+    assert _flagged([2.5, 0.0, 0.0, 2.5], 5) == []
+    assert _flagged([2.5, 0.0, -2.5], 5) == []
+    assert _flagged([1.5, 1.5, 0.0, 1.5, 1.5], 6) == [4]
+    assert _flagged([1.5, 1.5, 0.0, 0.0, 1.5], 6) == []
+
+
+def test_rule_7_flags_fifteenth_point_within_1_sigma():
+    values = [0.5 if i % 2 else -0.5 for i in range(15)]
+    assert _flagged(values[:14], 7) == []
+    assert _flagged(values, 7) == [14]
+
+
+def test_rule_8_flags_eighth_point_beyond_1_sigma():
+    values = [1.5 if i % 2 else -1.5 for i in range(8)]
+    assert _flagged(values[:7], 8) == []
+    assert _flagged(values, 8) == [7]
+
+
+@pytest.mark.parametrize("rule, run", [(2, [0.5] * 9), (3, [0.1 * i for i in range(6)]), (8, [1.5] * 8)])
+def test_windows_do_not_cross_groups(rule, run):
+    values = np.array(run, dtype=float)
+    split = len(values) // 2
+    groups = np.array(["A"] * split + ["B"] * (len(values) - split))
+    assert _flagged(values, rule) == [len(values) - 1]
+    assert _flagged(values, rule, groups) == []
+
+
+def test_zero_sigma_flags_nothing():
+    masks = nelson_rules(np.ones(20), 1.0, 0.0)
+    assert not any(mask.any() for mask in masks.values())
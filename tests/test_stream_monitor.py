@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+from modules.control_chart import create_imr_chart, imr_summary_by_group
+from modules.stream_monitor import ImrMonitor
+
+
+def _history(seed=0):
+    rng = np.random.default_rng(seed)
+    codes = rng.choice(["P1", "P2", "P3"], size=300)
+    return pd.DataFrame({"관리번호": codes, "측정값": rng.normal(10.0, 0.5, size=300)})
+
+
+def _batch_limits(df):
+    rows = []
+    for code, values in df.groupby("관리번호", sort=True)["측정값"]:
+        _, summary = create_imr_chart(values.to_numpy(), return_summary=True)
+        rows.append({"관리번호": code, "Mean": summary["Mean"][0], "UCL": summary["UCL"][0],
+                     "LCL": summary["LCL"][0]})
+    return pd.DataFrame(rows)
+
+
+def test_micro_batch_limits_match_batch_imr_chart():
+    df = _history()
+    monitor = ImrMonitor(min_points=5)
+    for start in range(0, len(df), 37):
+        chunk = df.iloc[start:start + 37]
+        monitor.update(chunk["관리번호"].to_numpy(), chunk["측정값"].to_numpy())
+
+    limits = monitor.limits().sort_values("관리번호", ignore_index=True)
+    expected = _batch_limits(df)
+    for col in ["Mean", "UCL", "LCL"]:
+        np.testing.assert_allclose(limits[col], expected[col], rtol=1e-12)
+
+    summary = imr_summary_by_group(df).sort_values("관리번호", ignore_index=True)
+    for col in ["n", "Mean", "MR-bar", "Sigma"]:
+        np.testing.assert_allclose(limits[col], summary[col], rtol=1e-12)
+    np.testing.assert_allclose(limits["Std"], df.groupby("관리번호", sort=True)["측정값"].std(), rtol=1e-12)
+
+
+def test_add_matches_update():
+    df = _history(seed=1)
+    batched, single = ImrMonitor(min_points=5), ImrMonitor(min_points=5)
+    batched.update(df["관리번호"].to_numpy(), df["측정값"].to_numpy())
+    for code, value in zip(df["관리번호"], df["측정값"]):
+        single.add(code, value)
+    pd.testing.assert_frame_equal(single.limits(), batched.limits(), rtol=1e-12)
+
+
+def test_update_ignores_missing_codes():
+    monitor = ImrMonitor(min_points=2)
+    monitor.update(["A", "B"], [1.0, 2.0])
+    monitor.update([None, np.nan, "B"], [1000.0, 3.0, 4.0])
+
+    limits = monitor.limits().set_index("관리번호")
+    assert list(limits.index) == ["A", "B"]
+    assert limits.loc["A", "n"] == 1 and limits.loc["A", "Mean"] == 1.0
+    assert limits.loc["B", "n"] == 2 and limits.loc["B", "Mean"] == 3.0
+    assert limits.loc["B", "MR-bar"] == 2.0
+
+
+def test_add_ignores_missing_code():
+    monitor = ImrMonitor(min_points=2)
+    assert monitor.add(None, 5.0) is None
+    assert monitor.add(np.nan, 5.0) is None
+    assert len(monitor) == 0